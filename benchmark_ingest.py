@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Ombaa ingest pipelines on synthetic Apify datasets.
+Every process_* pipeline (the five solar park scripts and the sheep farm
+driver for each country) runs in a fresh subprocess on a dataset from
+synthetic_dataset, which is generated once and cached. Each run reports
+records/sec and the peak RSS of the pipeline process and of its workers.
+Results can be saved as JSON and compared against a saved baseline, failing
+when a pipeline got slower or bigger than the tolerance allows.
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import ingest_engine
+import process_sheep_farms
+import run_report
+import synthetic_dataset
+
+# Default directory for the generated datasets, which are reused between runs
+DATA_DIR = os.path.join(tempfile.gettempdir(), "ombaa-benchmark")
+
+# Allowed slowdown (records/sec) and growth (peak RSS) against a baseline
+TOLERANCE = 0.10
+
+
+def pipelines(countries):
+    """(name, kind, country_code) of every process_* pipeline for the given countries."""
+    runs = []
+    for country_code in countries:
+        runs.append((ingest_engine.COUNTRY_PLUGINS[country_code], "solar_parks", country_code))
+    for country_code in countries:
+        runs.append(("process_sheep_farms", "sheep_farms", country_code))
+    return runs
+
+
+def run_pipeline(kind, country_code, input_file, output_file, workers):
+    """Run one pipeline in this process; returns items read, records written and seconds taken."""
+    start = time.perf_counter()
+    if kind == "solar_parks":
+        summary = ingest_engine.process_countries([(country_code, input_file, output_file)], workers)[output_file]
+    else:
+        summary = process_sheep_farms.process_sheep_farms([(country_code, input_file, output_file)],
+                                                          workers=workers)[output_file]
+    elapsed = time.perf_counter() - start
+
+    with open(run_report.report_path(output_file), 'r', encoding='utf-8') as f:
+        items = json.load(f)["items"]["in"]
+    return items, summary["count"], elapsed
+
+
+def _peak_rss_mb(who):
+    # ru_maxrss is in kilobytes on Linux (bytes on macOS)
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(who).ru_maxrss * scale / (1 << 20)
+
+
+def measure(kind, country_code, input_file, workers):
+    """Run one pipeline in a fresh interpreter, so the peak RSS is its own; returns the measurement."""
+    with tempfile.TemporaryDirectory(prefix="ombaa-benchmark-") as directory:
+        output_file = os.path.join(directory, "output.json")
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--run-one", kind, country_code, input_file, output_file,
+             str(workers)],
+            check=True, capture_output=True, text=True)
+    return json.loads(completed.stdout.splitlines()[-1])
+
+
+def _run_one(kind, country_code, input_file, output_file, workers):
+    items, records, elapsed = run_pipeline(kind, country_code, input_file, output_file, workers)
+    print(json.dumps({
+        "items": items,
+        "records": records,
+        "seconds": round(elapsed, 3),
+        "items_per_second": round(items / elapsed if elapsed else 0, 1),
+        "peak_rss_mb": round(_peak_rss_mb(resource.RUSAGE_SELF), 1),
+        "worker_peak_rss_mb": round(_peak_rss_mb(resource.RUSAGE_CHILDREN), 1)
+    }))
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """Regression messages for results that are slower or use more memory than the baseline."""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        if result["items_per_second"] < before["items_per_second"] * (1 - tolerance):
+            regressions.append(f"{name}: {result['items_per_second']:,.0f} items/s, "
+                               f"was {before['items_per_second']:,.0f}")
+        if result["peak_rss_mb"] > before["peak_rss_mb"] * (1 + tolerance):
+            regressions.append(f"{name}: peak RSS {result['peak_rss_mb']:.0f} MB, was {before['peak_rss_mb']:.0f} MB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the ingest pipelines on synthetic Apify datasets.")
+    parser.add_argument("countries", nargs="*", default=list(ingest_engine.COUNTRY_PLUGINS),
+                        help="country codes to benchmark (default: all of %(default)s)")
+    parser.add_argument("--scale", choices=list(synthetic_dataset.SCALES), default="10k",
+                        help="items per dataset (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes per pipeline (default: %(default)s)")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="generated datasets (default: %(default)s)")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="results JSON of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="allowed relative slowdown or RSS growth (default: %(default)s)")
+    parser.add_argument("--run-one", nargs=5, metavar=("KIND", "CODE", "INPUT", "OUTPUT", "WORKERS"),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_one:
+        kind, country_code, input_file, output_file, workers = args.run_one
+        _run_one(kind, country_code, input_file, output_file, int(workers))
+        return
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    results = {}
+    print(f"{'pipeline':<40}{'items':>10}{'items/s':>12}{'peak RSS':>12}{'workers RSS':>14}")
+    for name, kind, country_code in pipelines(args.countries):
+        input_file = synthetic_dataset.dataset_path(args.data_dir, kind, country_code, args.scale)
+        if not os.path.exists(input_file):
+            synthetic_dataset.write_dataset(input_file, kind, country_code, synthetic_dataset.SCALES[args.scale])
+
+        result = measure(kind, country_code, input_file, args.workers)
+        key = f"{name} {country_code}"
+        results[key] = result
+        print(f"{key:<40}{result['items']:>10,}{result['items_per_second']:>12,.0f}"
+              f"{result['peak_rss_mb']:>9.0f} MB{result['worker_peak_rss_mb']:>11.0f} MB")
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({"scale": args.scale, "workers": args.workers, "results": results}, f, indent=2)
+        print(f"Results saved to {args.save}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline["results"], args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark park-farm proximity matching for the Ombaa directory.
+Compares the old full scan (every park measured against every farm) with the
+engines of the integrate_directory matcher, grid-indexed (spatial_index) and
+block-vectorised (distance_engine), on synthetic parks and farms clustered
+around the cities of synthetic_dataset. Checks that all of them find exactly
+the same matches, and prints parks/sec and park-farm pairs/sec for each.
+With --top-k the nearest-farms mode is timed too, against the first k
+matches of every park, and with --workers the numpy engine on that many
+processes.
+"""
+
+import argparse
+import functools
+import random
+import time
+
+import integrate_directory
+import synthetic_dataset
+
+
+def legacy_match_points(park_points, farm_points, max_distance):
+    """Matching the way integrate_directory did it before the spatial index."""
+    farms = [(index, point) for index, point in enumerate(farm_points) if point is not None]
+
+    for park_index, park_point in enumerate(park_points):
+        if park_point is None:
+            continue
+
+        park_matches = []
+        for farm_index, farm_point in farms:
+            distance = integrate_directory.calculate_distance(park_point[0], park_point[1], farm_point[0], farm_point[1])
+            if distance <= max_distance:
+                park_matches.append((farm_index, round(distance, 1)))
+
+        if park_matches:
+            park_matches.sort(key=lambda m: m[1])
+            yield park_index, park_matches
+
+
+def make_points(count, seed):
+    """Points spread around the synthetic cities, a tenth anywhere in Europe and one in fifty without a location."""
+    rng = random.Random(seed)
+    cities = [(latitude, longitude) for profile in synthetic_dataset.COUNTRY_PROFILES.values()
+              for _, _, latitude, longitude in profile["cities"]]
+    points = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.02:
+            points.append(None)
+        elif roll < 0.12:
+            points.append((round(rng.uniform(42.0, 58.0), 7), round(rng.uniform(-8.0, 15.0), 7)))
+        else:
+            latitude, longitude = rng.choice(cities)
+            points.append((round(rng.gauss(latitude, 0.4), 7), round(rng.gauss(longitude, 0.6), 7)))
+    return points
+
+
+def time_matching(func, park_points, farm_points, max_distance):
+    start = time.perf_counter()
+    matches = list(func(park_points, farm_points, max_distance))
+    return matches, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--parks", type=int, default=2000, help="solar parks (default: %(default)s)")
+    parser.add_argument("--farms", type=int, default=5000, help="sheep farms (default: %(default)s)")
+    parser.add_argument("--radius", type=float, default=50, help="match radius in km (default: %(default)s)")
+    parser.add_argument("--memory-budget", type=int, default=integrate_directory.distance_engine.MEMORY_BUDGET,
+                        help="bytes of temporaries per block of the numpy engine (default: %(default)s)")
+    parser.add_argument("--top-k", type=int, help="also time the K nearest farms mode")
+    parser.add_argument("--workers", type=int, default=1, help="also time the numpy engine on N processes")
+    parser.add_argument("--skip-legacy", action="store_true", help="only time the engines of the matcher")
+    args = parser.parse_args()
+
+    park_points = make_points(args.parks, seed=1)
+    farm_points = make_points(args.farms, seed=2)
+
+    matchers = {
+        "numpy": functools.partial(integrate_directory._match_points, engine="numpy",
+                                   memory_budget=args.memory_budget),
+        "grid": functools.partial(integrate_directory._match_points, engine="grid"),
+    }
+    if args.workers > 1:
+        matchers[f"numpy x{args.workers}"] = functools.partial(integrate_directory._match_points, engine="numpy",
+                                                               memory_budget=args.memory_budget, workers=args.workers)
+    if args.top_k:
+        matchers[f"top-{args.top_k}"] = functools.partial(integrate_directory._match_points, top_k=args.top_k)
+    if not args.skip_legacy:
+        matchers["full scan"] = legacy_match_points
+
+    results = {name: time_matching(func, park_points, farm_points, args.radius) for name, func in matchers.items()}
+    matches, fastest = results["numpy"]
+    pairs = sum(len(park_matches) for _, park_matches in matches)
+    print(f"{args.parks:,} parks x {args.farms:,} farms within {args.radius:g} km: "
+          f"{len(matches):,} parks matched, {pairs:,} pairs")
+    # Pairs/s counts every park-farm pair a full scan would measure
+    print(f"{'matcher':<12}{'seconds':>10}{'parks/s':>12}{'pairs/s':>16}{'speedup':>10}")
+    slowest = max(elapsed for _, elapsed in results.values())
+    for name, (_, elapsed) in results.items():
+        print(f"{name:<12}{elapsed:>10.2f}{args.parks / elapsed:>12,.0f}"
+              f"{args.parks * args.farms / elapsed:>16,.0f}{slowest / elapsed:>9.1f}x")
+
+    top_k = [(park, park_matches[:args.top_k]) for park, park_matches in matches]
+    different = [name for name, (other, _) in results.items()
+                 if other != (top_k if name == f"top-{args.top_k}" else matches)]
+    print(f"Matches {'DIFFERENT for ' + ', '.join(different) if different else 'identical'}")
+    if different:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
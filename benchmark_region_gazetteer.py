@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark region extraction for the Ombaa ingest scripts.
+Compares the old per-call approach (rebuild the keyword dict, then a nested
+for region / for keyword / in search_text scan) with the precompiled
+region_gazetteer, and prints records/sec for each country.
+"""
+
+import argparse
+import random
+import time
+
+import region_gazetteer
+import text_fold
+
+STREETS = ["Hoofdstraat 12", "12 Rue de la Gare", "Hauptstraße 5", "1 Church Lane", "Kerkstraat 3"]
+FILLER = ["Nederland", "France", "Deutschland", "United Kingdom", "België", "Industriegebiet Nord", "Zone Artisanale"]
+
+
+def legacy_match_region(country_code, address, city, record_type="solar_parks"):
+    """Region lookup the way the process_* scripts did it before the gazetteer.
+
+    Only the text is folded (text_fold) rather than lowercased, as the tables are now.
+    """
+    country_regions, country_cities = region_gazetteer.RECORD_TYPE_TABLES[record_type]
+    # The old scripts built their keyword tables inside the function on every call
+    regions = {region: list(keywords) for region, keywords in country_regions.get(country_code, {}).items()}
+    cities = dict(country_cities.get(country_code, {}))
+
+    if not address and not city:
+        return ""
+
+    search_text = text_fold.fold(address) + " " + text_fold.fold(city)
+
+    for region, keywords in regions.items():
+        for keyword in keywords:
+            if keyword in search_text:
+                return region
+
+    if cities and city:
+        return cities.get(text_fold.fold(city), "")
+
+    return ""
+
+
+def make_addresses(country_code, count, seed=42):
+    """Generate (address, city) pairs; roughly a third name no region at all."""
+    rng = random.Random(seed)
+    keywords = [kw for kws in region_gazetteer.COUNTRY_REGIONS[country_code].values() for kw in kws]
+    records = []
+    for _ in range(count):
+        street = rng.choice(STREETS)
+        if rng.random() < 0.33:
+            place = rng.choice(FILLER)
+        else:
+            place = rng.choice(keywords).title()
+        records.append((f"{street}, {rng.randint(1000, 99999)} {place}, {rng.choice(FILLER)}", place))
+    return records
+
+
+def time_records_per_second(func, country_code, records, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for address, city in records:
+            func(country_code, address, city)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(records) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=20000, help="addresses per country")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement, best is kept")
+    args = parser.parse_args()
+
+    print(f"{'country':<8}{'before (rec/s)':>18}{'after (rec/s)':>18}{'speedup':>10}")
+    for country_code in ("NL", "FR", "DE", "UK", "BE"):
+        records = make_addresses(country_code, args.records)
+        before = time_records_per_second(legacy_match_region, country_code, records, args.repeat)
+        after = time_records_per_second(region_gazetteer.match_region, country_code, records, args.repeat)
+        print(f"{country_code:<8}{before:>18,.0f}{after:>18,.0f}{after / before:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Checkpoints for long Ombaa ingestion runs.
+Every CHECKPOINT_INTERVAL input items an ingestion job makes its outputs
+durable and records in a checkpoint file next to its output how far it got:
+the number of input items consumed, the byte offset and record count of each
+output stream, and the run report counts so far. A run with resume=True picks
+each job up from its checkpoint: its outputs are truncated back to the
+recorded offsets, the input items before the recorded position are parsed
+but skipped, and the job carries on as if it had never stopped, so the
+outputs end up identical to those of an uninterrupted run. A finished job
+leaves a final checkpoint holding its summary, so a resumed run skips it;
+all checkpoints of a run are removed once every job has finished.
+"""
+
+import gzip
+import io
+import json
+import os
+
+# Input items between two checkpoints of a job; 0 disables checkpointing
+CHECKPOINT_INTERVAL = 50000
+
+
+def checkpoint_path(output_file):
+    """Checkpoint file kept next to an output file."""
+    name = output_file[:-3] if output_file.endswith('.gz') else output_file
+    return os.path.splitext(name)[0] + ".checkpoint.json"
+
+
+def input_fingerprint(input_file):
+    """Identifies the input a checkpoint was taken on; a changed file cannot be resumed."""
+    stat = os.stat(input_file)
+    return {"input": os.path.abspath(input_file), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+class OutputStream:
+    """A text file, gzip-compressed if its name ends in .gz, that sync() makes durable at a checkpoint.
+
+    Opened with the offset of such a checkpoint, it drops whatever was written
+    after it and carries on from there. Gzip output ends a member at every sync
+    so that it can be reopened there; the members read back as one stream.
+    """
+
+    def __init__(self, path, offset=None):
+        self.path = path
+        self._gzip = path.endswith('.gz')
+        if offset is None:
+            self._raw = open(path, 'wb')
+        else:
+            self._raw = open(path, 'r+b')
+            self._raw.truncate(offset)
+            self._raw.seek(offset)
+        self._open()
+
+    def _open(self):
+        binary = self._raw
+        if self._gzip:
+            # A fixed mtime keeps the member headers, and so resumed output, byte-identical
+            binary = gzip.GzipFile(fileobj=self._raw, mode='wb', mtime=0)
+        self._text = io.TextIOWrapper(binary, encoding='utf-8')
+        self.write = self._text.write
+
+    def sync(self):
+        """Flush everything written so far to disk and return the byte offset to resume at."""
+        if self._gzip:
+            # Closing the member writes its trailer; the raw file stays open for the next one
+            self._text.detach().close()
+        else:
+            self._text.flush()
+        self._raw.flush()
+        os.fsync(self._raw.fileno())
+        # Taken before the next member writes its header, which a resumed stream writes again
+        offset = self._raw.tell()
+        if self._gzip:
+            self._open()
+        return offset
+
+    def close(self):
+        self._text.close()
+        self._raw.close()
+
+
+class Checkpoint:
+    """The checkpoint of one job: state is what it last recorded, or None when it starts afresh."""
+
+    def __init__(self, output_file, fingerprint, resume=False):
+        self.path = checkpoint_path(output_file)
+        self.fingerprint = fingerprint
+        self.state = None
+        if not os.path.exists(self.path):
+            return
+        if resume:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            # A checkpoint of other input or settings is overwritten by the fresh run
+            if data.get("fingerprint") == fingerprint:
+                self.state = data["state"]
+        else:
+            os.remove(self.path)
+
+    def save(self, state):
+        temp_file = self.path + ".tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump({"fingerprint": self.fingerprint, "state": state}, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, self.path)
+        self.state = state
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
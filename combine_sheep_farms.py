@@ -4,8 +4,8 @@ Combine processed sheep farm data from all countries into a single dataset
 for the Ombaa directory.
 """
 
-import json
-import os
+import combine_stream
+import schema_validation
 
 def combine_sheep_farms():
     """Combine sheep farm data from all countries into a single dataset."""
@@ -19,26 +19,20 @@ def combine_sheep_farms():
     }
     
     output_file = "/home/ubuntu/processed_sheep_farms_combined.json"
+    ndjson_file = "/home/ubuntu/processed_sheep_farms_combined.ndjson.gz"
     
-    # Load and combine data
-    combined_data = []
-    country_counts = {}
+    # Stream and merge every country file; farms already listed by an earlier
+    # country's scrape are dropped, and the counts are tallied while writing
+    total, counts, _ = combine_stream.combine(list(input_files.values()), [output_file, ndjson_file],
+                                              validator=schema_validation.SHEEP_FARMS)
+    country_counts = {country: counts.get(country, 0) for country in input_files}
     
-    for country, file_path in input_files.items():
-        with open(file_path, 'r', encoding='utf-8') as f:
-            country_data = json.load(f)
-            combined_data.extend(country_data)
-            country_counts[country] = len(country_data)
-    
-    # Write combined data to output file
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(combined_data, f, indent=2, ensure_ascii=False)
-    
-    return len(combined_data), country_counts
+    return total, country_counts
 
 if __name__ == "__main__":
     total_count, country_counts = combine_sheep_farms()
-    print(f"Combined {total_count} sheep farms from all countries. Output saved to /home/ubuntu/processed_sheep_farms_combined.json")
+    print(f"Combined {total_count} sheep farms from all countries. Output saved to /home/ubuntu/processed_sheep_farms_combined.json "
+          f"and /home/ubuntu/processed_sheep_farms_combined.ndjson.gz")
     print("Country breakdown:")
     for country, count in country_counts.items():
         print(f"  - {country}: {count} sheep farms")
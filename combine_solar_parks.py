@@ -4,24 +4,21 @@ Combine all processed solar park data into a single file for the Ombaa directory
 This script merges data from the Netherlands, France, and UK into one comprehensive dataset.
 """
 
-import json
-import os
+import combine_stream
+import schema_validation
 
-def combine_solar_parks(input_files, output_file):
-    """Combine multiple solar park data files into one."""
-    combined_data = []
+def combine_solar_parks(input_files, output_file, ndjson_file=None):
+    """Combine multiple solar park data files into one, dropping parks found by more than one scrape.
     
-    for input_file in input_files:
-        if os.path.exists(input_file):
-            with open(input_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                combined_data.extend(data)
-    
-    # Write combined data to output file
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(combined_data, f, indent=2, ensure_ascii=False)
-    
-    return len(combined_data)
+    Inputs are streamed and merged in sorted runs, so memory stays flat; the
+    output is ordered by country and name. ndjson_file, if given, receives the
+    same records as newline-delimited JSON (gzip-compressed if it ends in .gz).
+    Records that fail schema validation, such as parks without coordinates,
+    are left out and listed in a .quarantine.jsonl file next to output_file.
+    """
+    output_files = [output_file] + ([ndjson_file] if ndjson_file else [])
+    count, _, _ = combine_stream.combine(input_files, output_files, validator=schema_validation.SOLAR_PARKS)
+    return count
 
 if __name__ == "__main__":
     input_files = [
@@ -30,6 +27,7 @@ if __name__ == "__main__":
         "/home/ubuntu/processed_solar_parks_uk.json"      # UK
     ]
     output_file = "/home/ubuntu/processed_solar_parks_combined.json"
+    ndjson_file = "/home/ubuntu/processed_solar_parks_combined.ndjson.gz"
     
-    count = combine_solar_parks(input_files, output_file)
-    print(f"Combined {count} solar parks from all countries. Output saved to {output_file}")
+    count = combine_solar_parks(input_files, output_file, ndjson_file)
+    print(f"Combined {count} solar parks from all countries. Output saved to {output_file} and {ndjson_file}")
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Streaming combine step for the Ombaa datasets.
+Each processed country file is read one record at a time, deduplicated, cut
+into sorted runs that are spilled to temporary files, and the runs are k-way
+merged with heapq.merge into the combined output, so the records held in
+memory are bounded by the run size however large the inputs are. The
+deduplicator is not: it remembers every kept place (see dedup.Deduplicator),
+so with deduplication memory grows with the number of unique records, about
+0.5 KB each. Records come out ordered by
+country, then name, then place ID, and the per-country counts are tallied as
+they are written. Every combined record carries its stable ID (see dedup).
+
+Outputs named *.ndjson or *.jsonl are newline-delimited JSON, *.json is a JSON
+array formatted like json.dump(..., indent=2) for the web app; add .gz to
+compress either. A run report with the time per stage and the deduplication
+counts is saved next to the first output, and records failing the optional
+schema validator are listed in a quarantine file next to it. The record
+validators require coordinates, so records without them are quarantined and
+left out of the combined output; the run report counts them.
+"""
+
+import heapq
+import os
+import tempfile
+from collections import Counter
+
+import dedup
+import ingest_engine
+import run_report
+import schema_validation
+
+# Records sorted in memory before a run is spilled to disk
+RUN_SIZE = 50000
+
+
+def merge_key(record):
+    """Stable sort key of a combined record: country, name, place ID, address."""
+    return (record.get('country') or "", record.get('name') or "", record.get('place_id') or "",
+            record.get('location') or "")
+
+
+def _write_run(records, directory):
+    records.sort(key=merge_key)
+    fd, path = tempfile.mkstemp(suffix=".ndjson", dir=directory)
+    os.close(fd)
+    with ingest_engine.NdjsonWriter(path) as writer:
+        for record in records:
+            writer.write(record)
+    return path
+
+
+def combine(input_files, output_files, deduplicate=True, run_size=RUN_SIZE, validator=None):
+    """Merge processed files into one or more combined outputs; returns (total, counts per country, duplicates).
+
+    Input files that do not exist are skipped. With deduplicate=True places already
+    seen in an earlier input file are dropped, so input order decides which
+    country keeps a border park; the deduplicator holds every kept place, so
+    memory is O(unique records). With a schema_validation.Validator, invalid
+    records (e.g. without coordinates) are quarantined rather than combined.
+    """
+    deduplicator = dedup.Deduplicator() if deduplicate else None
+    quarantine = schema_validation.Quarantine(output_files[0])
+    counts = Counter()
+    report = run_report.RunReport("combine")
+    timer = report.timer()
+    inputs = {}
+    without_coordinates = 0
+
+    with tempfile.TemporaryDirectory(prefix="ombaa-combine-") as directory:
+        runs = []
+        records = []
+        for input_file in input_files:
+            if not os.path.exists(input_file):
+                report.count("inputs", "missing")
+                continue
+            report.count("inputs", "read")
+            read = 0
+            timer.reset()
+            for index, record in enumerate(ingest_engine.iter_records(input_file)):
+                timer.lap("read")
+                read += 1
+                if validator is not None:
+                    reasons = validator.errors(record)
+                    timer.lap("validate")
+                    if reasons:
+                        report.count("validation", "quarantined")
+                        if any(reason.startswith("coordinates") for reason in reasons):
+                            without_coordinates += 1
+                        quarantine.add(input_file, index, reasons, record)
+                        continue
+                    report.count("validation", "valid")
+                if deduplicator is not None:
+                    kept = deduplicator.add(record)
+                    timer.lap("dedup")
+                    if not kept:
+                        continue
+                # Records processed before IDs were introduced get theirs here
+                records.append(dedup.with_record_id(record))
+                if len(records) >= run_size:
+                    runs.append(_write_run(records, directory))
+                    records = []
+                    timer.lap("spill_runs")
+            inputs[input_file] = read
+            report.items["in"] += read
+
+        # The last run stays in memory; a single run needs no temporary file at all
+        records.sort(key=merge_key)
+        streams = [ingest_engine.iter_ndjson(path) for path in runs] + [iter(records)]
+        timer.lap("sort")
+
+        writers = [ingest_engine.record_writer(output_file) for output_file in output_files]
+        try:
+            for record in heapq.merge(*streams, key=merge_key):
+                counts[record.get('country')] += 1
+                for writer in writers:
+                    writer.write(record)
+        finally:
+            for writer in writers:
+                writer.close()
+        timer.lap("merge_write")
+
+    duplicates = 0
+    if deduplicator is not None:
+        duplicates = deduplicator.stats["place_id"] + deduplicator.stats["near"]
+        for outcome, n in deduplicator.stats.items():
+            report.count("dedup", outcome, n)
+    quarantine.close()
+    report.items["out"] = sum(counts.values())
+    report.summary = {"inputs": inputs, "runs": len(runs), "countries": dict(counts), "duplicates": duplicates,
+                      "quarantined": quarantine.count,
+                      # Part of the quarantined records, so also left out of the combined output
+                      "quarantined_without_coordinates": without_coordinates}
+    report.save(output_files[0])
+    return sum(counts.values()), dict(counts), duplicates
+
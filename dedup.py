@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Cross-source deduplication for the combined Ombaa datasets.
+Records sharing a Google place ID collapse at once. Other records are bucketed
+by geohash cell and only compared with the records already kept in their own
+and the eight neighbouring cells, so the stage stays close to linear; they are
+duplicates when their normalised names are equal or similar enough and they
+lie close together. Cells are keyed by their (row, column) on the geohash grid
+rather than the base-32 string, so the neighbours are one step away.
+
+Every record also carries a stable ID derived from its content: a hash of the
+place ID, or of the normalised name and coordinates for a place without one.
+The ID does not change when other records are scraped, so matches and the web
+app refer to records by ID rather than by list position.
+"""
+
+import hashlib
+import math
+import re
+from difflib import SequenceMatcher
+
+import text_fold
+
+# Geohash cells of about 0.6 x 1.2 km; the 3 x 3 neighbourhood covers MAX_DUPLICATE_DISTANCE_KM
+GEOHASH_PRECISION = 6
+MAX_DUPLICATE_DISTANCE_KM = 0.25
+
+# Minimum SequenceMatcher ratio for two normalised names to count as the same place
+NAME_SIMILARITY = 0.85
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+_DIGITS = re.compile(r'\d+')
+
+
+def geohash_cell(latitude, longitude, precision=GEOHASH_PRECISION):
+    """(row, column) of the geohash cell containing a point; the geohash string spells these bits out."""
+    lat_bits = 5 * precision // 2
+    lng_bits = (5 * precision + 1) // 2
+    row = min(int((latitude + 90.0) / 180.0 * (1 << lat_bits)), (1 << lat_bits) - 1)
+    column = min(int((longitude + 180.0) / 360.0 * (1 << lng_bits)), (1 << lng_bits) - 1)
+    return row, column
+
+
+def normalise_name(name):
+    """Lowercase, strip accents and punctuation, and collapse whitespace."""
+    return _NON_ALNUM.sub(' ', text_fold.fold(name)).strip()
+
+
+def record_id(place_id, name, latitude, longitude):
+    """Stable ID of a park or farm: 16 hex digits hashed from its place ID, or else its name and coordinates."""
+    if place_id:
+        key = "place:" + place_id
+    else:
+        # Rounded to about 10 cm, so float noise from a re-scrape does not change the ID
+        point = ",".join("" if value is None else f"{value:.6f}" for value in (latitude, longitude))
+        key = f"point:{normalise_name(name or '')}@{point}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+
+def with_record_id(record):
+    """The record with an "id" first, derived as record_id() if it has none yet."""
+    if record.get('id'):
+        return record
+    coordinates = record.get('coordinates') or {}
+    return {"id": record_id(record.get('place_id'), record.get('name'),
+                            coordinates.get('latitude'), coordinates.get('longitude')), **record}
+
+
+def _distance_km(lat1, lng1, lat2, lng2):
+    # Equirectangular approximation, plenty for distances under a kilometre
+    x = math.radians(lng2 - lng1) * math.cos(math.radians((lat1 + lat2) / 2))
+    y = math.radians(lat2 - lat1)
+    return 6371 * math.hypot(x, y)
+
+
+def similar_names(a, b, threshold=NAME_SIMILARITY):
+    """Whether two normalised names denote the same place."""
+    if a == b:
+        return True
+    # "Zonnepark Phase 1" and "Zonnepark Phase 2" are different parks
+    if _DIGITS.findall(a) != _DIGITS.findall(b):
+        return False
+    matcher = SequenceMatcher(None, a, b)
+    return (matcher.real_quick_ratio() >= threshold and matcher.quick_ratio() >= threshold
+            and matcher.ratio() >= threshold)
+
+
+class Deduplicator:
+    """Streaming deduplicator: feed records in priority order, the first of each place is kept.
+
+    Every kept record's place ID, name and coordinates stay in memory, so a run
+    needs memory in proportion to the unique records, about 0.5 KB each.
+    """
+
+    def __init__(self, precision=GEOHASH_PRECISION):
+        self.precision = precision
+        self.place_ids = set()
+        self.cells = {}          # geohash cell -> [(place ID, normalised name, latitude, longitude)] of kept records
+        self.unlocated = set()   # (normalised name, normalised location) of kept records without coordinates
+        self.stats = {"kept": 0, "place_id": 0, "near": 0}
+
+    def add(self, record):
+        """Return True if the record is new (and remember it), False if it duplicates a kept record."""
+        place_id = record.get('place_id')
+        if place_id and place_id in self.place_ids:
+            self.stats["place_id"] += 1
+            return False
+
+        name = normalise_name(record.get('name'))
+        coordinates = record.get('coordinates') or {}
+        latitude, longitude = coordinates.get('latitude'), coordinates.get('longitude')
+
+        if latitude is None or longitude is None:
+            key = (name, normalise_name(record.get('location')))
+            if key in self.unlocated:
+                self.stats["near"] += 1
+                return False
+            self.unlocated.add(key)
+        else:
+            row, column = geohash_cell(latitude, longitude, self.precision)
+            for cell in ((row + dy, column + dx) for dy in (-1, 0, 1) for dx in (-1, 0, 1)):
+                for kept_id, kept_name, kept_lat, kept_lng in self.cells.get(cell, ()):
+                    # Two different place IDs are two places, however alike their names
+                    if place_id and kept_id and place_id != kept_id:
+                        continue
+                    if (_distance_km(latitude, longitude, kept_lat, kept_lng) <= MAX_DUPLICATE_DISTANCE_KM
+                            and similar_names(name, kept_name)):
+                        self.stats["near"] += 1
+                        return False
+            self.cells.setdefault((row, column), []).append((place_id, name, latitude, longitude))
+
+        if place_id:
+            self.place_ids.add(place_id)
+        self.stats["kept"] += 1
+        return True
+
+
+def deduplicate(records):
+    """Return (kept records in input order, stats) for a list of records."""
+    deduplicator = Deduplicator()
+    kept = [record for record in records if deduplicator.add(record)]
+    return kept, deduplicator.stats
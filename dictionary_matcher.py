@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Word-bounded dictionary matching for the Ombaa text extractors.
+A DictionaryMatcher is compiled once from one or more dictionaries (breed,
+grazing type, vegetation, ...), each mapping terms to labels with the most
+specific terms first. match() folds the text with text_fold, splits it into
+words and walks them once, looking each word up as the first word of a term.
+Terms therefore only match whole words ("bio" no longer matches inside
+"biodiversity", nor "ras" inside "gras"), every dictionary is labelled in the
+same pass, and the cost is linear in the length of the text. Per dictionary
+the earliest-listed term found wins, and between two occurrences of the same
+term the first one.
+
+Dutch and German glue words together and inflect them, so dictionaries named
+in compounds also match their single-word terms of at least MIN_AFFIX letters
+inside a word: at its start ("gras" in "grasflache", "biologisch" in
+"biologische") and at its end, followed by at most an inflection ending
+("wiese" in "krauterwiesen").
+"""
+
+import re
+from collections import namedtuple
+
+import text_fold
+
+_WORD = re.compile(r"\w+")
+
+# Shortest term matched inside a word; shorter ones ("bio", "ras") only match whole words
+MIN_AFFIX = 4
+
+# Endings a term at the end of a compound may carry (plural, case, adjective)
+INFLECTIONS = ("e", "n", "s", "en", "er", "es")
+
+# label: what the dictionary maps the term to; term: the folded term as matched;
+# position: index of the term's first word among the words of the folded text
+Hit = namedtuple("Hit", ["label", "term", "position"])
+
+
+class DictionaryMatcher:
+    """Named term -> label dictionaries, matched on whole words in one pass over a text.
+
+    The dictionaries named in compounds also match inside compound and inflected words.
+    """
+
+    def __init__(self, dictionaries, compounds=()):
+        self.names = list(dictionaries)
+        # first word -> [(words, dictionary, rank, term, label)], longest terms first
+        self._terms = {}
+        # single-word term of a compounds dictionary -> [(dictionary, rank, label)]
+        self._affixes = {}
+        for name, dictionary in dictionaries.items():
+            for rank, (term, label) in enumerate(dictionary.items()):
+                words = tuple(_WORD.findall(text_fold.fold(term)))
+                self._terms.setdefault(words[0], []).append((words, name, rank, " ".join(words), label))
+                if name in compounds and len(words) == 1 and len(words[0]) >= MIN_AFFIX:
+                    self._affixes.setdefault(words[0], []).append((name, rank, label))
+        for candidates in self._terms.values():
+            candidates.sort(key=lambda candidate: -len(candidate[0]))
+        # The first MIN_AFFIX letters of every affix term, so most word ends are ruled out with one lookup
+        self._affix_starts = {term[:MIN_AFFIX] for term in self._affixes}
+        self._longest_affix = max(map(len, self._affixes), default=0)
+
+    def _affix_terms(self, word):
+        """Yield the affix terms found inside word, but not the whole word itself."""
+        affixes = self._affixes
+        starts = self._affix_starts
+        size = len(word)
+        # Word start: the term is the first part of a compound or carries an inflection
+        if word[:MIN_AFFIX] in starts:
+            for end in range(MIN_AFFIX, min(size, self._longest_affix + 1)):
+                if word[:end] in affixes:
+                    yield word[:end]
+        # Word end: the term is the last part of a compound, maybe inflected
+        for start in range(1, size - MIN_AFFIX + 1):
+            if word[start:start + MIN_AFFIX] not in starts:
+                continue
+            tail = word[start:]
+            if tail in affixes:
+                yield tail
+            for ending in INFLECTIONS:
+                if tail.endswith(ending) and tail[:-len(ending)] in affixes:
+                    yield tail[:-len(ending)]
+
+    def match(self, text):
+        """The best Hit per dictionary with a term in text; dictionaries without one are left out."""
+        if not text:
+            return {}
+        words = _WORD.findall(text_fold.fold(text))
+        terms = self._terms
+        best = {}  # dictionary -> (rank, Hit)
+        affixes = self._affixes
+        for position, word in enumerate(words):
+            for term_words, name, rank, term, label in terms.get(word, ()):
+                size = len(term_words)
+                if size > 1 and tuple(words[position:position + size]) != term_words:
+                    continue
+                current = best.get(name)
+                if current is None or rank < current[0]:
+                    best[name] = (rank, Hit(label, term, position))
+            if not affixes or len(word) <= MIN_AFFIX:
+                continue
+            for term in self._affix_terms(word):
+                for name, rank, label in affixes[term]:
+                    current = best.get(name)
+                    if current is None or rank < current[0]:
+                        best[name] = (rank, Hit(label, term, position))
+        return {name: hit for name, (_, hit) in best.items()}
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Block-vectorised haversine matching for the Ombaa directory.
+Parks and farms are sorted by latitude. Parks are taken a tile at a time,
+and each tile is only compared with the band of farms whose latitude lies
+within the match radius of the tile, in blocks sized so that the float64
+temporaries of one park x farm block stay within a memory budget. A block
+is tested on the haversine term a = sin^2(dlat/2) + cos cos sin^2(dlng/2)
+against sin^2 of half the radius angle, which needs no square roots or
+arctangents. Only the pairs that pass get a distance in kilometres.
+
+The distances are meant to match integrate_directory.calculate_distance
+rounded to 0.1 km. NumPy's vectorised sin and cos may differ from libm in
+the last bit. Pairs within a hair of the radius, or of a rounding boundary,
+are therefore measured again with the exact scalar function, so the pairs,
+distances and order equal those of the scalar matcher.
+
+match_points_parallel() copies the coordinate arrays into one shared memory
+block, and worker processes match contiguous runs of tiles straight from it.
+Only the block's name and layout go to the workers, and only the matches of
+their parks come back, so the output equals that of match_points().
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Same Earth radius as integrate_directory.calculate_distance
+EARTH_RADIUS_KM = 6371
+
+# Bytes of float64 temporaries per park x farm pair of a block
+BYTES_PER_PAIR = 24
+
+# Default memory for the temporaries of one block
+MEMORY_BUDGET = 32 << 20
+
+# Parks per tile; a smaller tile keeps the latitude band of farms narrower
+PARKS_PER_TILE = 256
+
+# Relative slack on the haversine test, far above the error of NumPy's sin and cos
+_SLACK = 1e-9
+
+# Distances within this many km of the radius or a rounding boundary are measured again
+_RECHECK_KM = 1e-7
+
+# Partitions of parks per worker process; more than one evens out dense and sparse latitude bands
+PARTITIONS_PER_WORKER = 4
+
+
+def _located(points):
+    """(positions, degrees) of the points with a location, sorted by latitude; degrees are (latitude, longitude) rows."""
+    positions = np.fromiter((i for i, point in enumerate(points) if point is not None), dtype=np.int64)
+    coordinates = np.array([points[i] for i in positions.tolist()], dtype=np.float64).reshape(-1, 2)
+    order = np.argsort(coordinates[:, 0], kind='stable')
+    return positions[order], coordinates[order]
+
+
+def _arrays(park_points, farm_points):
+    """The arrays matching reads, by name: positions, degrees, and latitude, longitude and its cosine in radians."""
+    arrays = {}
+    for prefix, points in (("park", park_points), ("farm", farm_points)):
+        positions, degrees = _located(points)
+        radians = np.radians(degrees)
+        arrays[prefix + "_positions"] = positions
+        arrays[prefix + "_degrees"] = degrees
+        arrays[prefix + "_lat"] = radians[:, 0].copy()
+        arrays[prefix + "_lng"] = radians[:, 1].copy()
+        arrays[prefix + "_cos"] = np.cos(arrays[prefix + "_lat"])
+    return arrays
+
+
+def _haversine_km(lat1, lng1, lat2, lng2):
+    """integrate_directory.calculate_distance on arrays of radians."""
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return EARTH_RADIUS_KM * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def _block_pairs(lat1, lng1, cos1, lat2, lng2, cos2, limit, buffers):
+    """(row, column) of the pairs of a parks x farms block whose haversine term is within limit."""
+    rows, columns = len(lat1), len(lat2)
+    term, other = (buffer[:rows * columns].reshape(rows, columns) for buffer in buffers)
+    np.subtract(lat2[None, :], lat1[:, None], out=term)
+    term *= 0.5
+    np.sin(term, out=term)
+    np.square(term, out=term)
+    np.subtract(lng2[None, :], lng1[:, None], out=other)
+    other *= 0.5
+    np.sin(other, out=other)
+    np.square(other, out=other)
+    other *= cos1[:, None]
+    other *= cos2[None, :]
+    term += other
+    return np.nonzero(term <= limit)
+
+
+def _tile_size(memory_budget):
+    """(parks per tile, farms per block) of a memory budget."""
+    pairs_per_block = max(1, memory_budget // BYTES_PER_PAIR)
+    parks_per_tile = min(PARKS_PER_TILE, pairs_per_block)
+    return parks_per_tile, max(1, pairs_per_block // parks_per_tile)
+
+
+def _match_range(arrays, first_park, last_park, farm_count, max_distance, exact_distance, memory_budget):
+    """Yield the matches of the latitude-sorted parks first_park:last_park, a tile at a time.
+
+    Each tile gives (park index, farm index, distance rounded to 0.1) arrays, ordered
+    by park, distance and farm index; farm_count is the length of the farm list.
+    """
+    park_positions, park_degrees = arrays["park_positions"], arrays["park_degrees"]
+    park_lat, park_lng, park_cos = arrays["park_lat"], arrays["park_lng"], arrays["park_cos"]
+    farm_positions, farm_degrees = arrays["farm_positions"], arrays["farm_degrees"]
+    farm_lat, farm_lng, farm_cos = arrays["farm_lat"], arrays["farm_lng"], arrays["farm_cos"]
+
+    angle = max_distance / EARTH_RADIUS_KM
+    # d <= max_distance exactly when a <= sin^2(angle / 2), up to half way round the globe
+    limit = math.sin(min(angle, math.pi) / 2) ** 2 * (1 + _SLACK) + _SLACK
+    # Latitudes alone put every farm outside this band out of range
+    band = min(angle, math.pi) * (1 + _SLACK) + _SLACK
+    # Rounded distances in tenths of a km lie in range(tenths_range)
+    tenths_range = math.floor(min(max_distance, math.pi * EARTH_RADIUS_KM) * 10) + 2
+
+    parks_per_tile, farms_per_block = _tile_size(memory_budget)
+    buffers = [np.empty(parks_per_tile * farms_per_block) for _ in range(2)]
+
+    for start in range(first_park, last_park, parks_per_tile):
+        tile = slice(start, min(last_park, start + parks_per_tile))
+        lat1, lng1, cos1 = park_lat[tile], park_lng[tile], park_cos[tile]
+        low = np.searchsorted(farm_lat, lat1[0] - band, side='left')
+        high = np.searchsorted(farm_lat, lat1[-1] + band, side='right')
+
+        park_rows, farm_rows = [], []
+        for first in range(low, high, farms_per_block):
+            block = slice(first, min(high, first + farms_per_block))
+            rows, columns = _block_pairs(lat1, lng1, cos1, farm_lat[block], farm_lng[block], farm_cos[block],
+                                         limit, buffers)
+            park_rows.append(rows + start)
+            farm_rows.append(columns + first)
+        if not park_rows:
+            continue
+        park_rows = np.concatenate(park_rows)
+        farm_rows = np.concatenate(farm_rows)
+
+        distances = _haversine_km(park_lat[park_rows], park_lng[park_rows], farm_lat[farm_rows], farm_lng[farm_rows])
+        rounded = np.round(distances, 1)
+        # Too close to the radius or to half a tenth of a kilometre to trust the last bit of NumPy
+        tenths = distances * 10
+        doubtful = ((np.abs(distances - max_distance) <= _RECHECK_KM)
+                    | (np.abs(tenths - np.floor(tenths) - 0.5) <= _RECHECK_KM * 10))
+        for i in np.flatnonzero(doubtful).tolist():
+            park = park_degrees[park_rows[i]].tolist()
+            farm = farm_degrees[farm_rows[i]].tolist()
+            distances[i] = exact_distance(park[0], park[1], farm[0], farm[1])
+            rounded[i] = round(float(distances[i]), 1)
+        keep = distances <= max_distance
+
+        park_rows = park_rows[keep]
+        farm_index = farm_positions[farm_rows[keep]]
+        rounded = rounded[keep]
+        if not len(park_rows):
+            continue
+        # By park, then distance, equal distances in farm order, as one integer key per pair
+        key = (park_rows - start) * tenths_range + np.rint(rounded * 10).astype(np.int64)
+        key *= farm_count
+        key += farm_index
+        order = np.argsort(key)
+        yield park_positions[park_rows[order]], farm_index[order], rounded[order]
+
+
+def _collect(matches, park_index, farm_index, rounded):
+    """Add the matches of one tile to park index -> [(farm index, distance)]."""
+    pairs = list(zip(farm_index.tolist(), rounded.tolist()))
+    # Every park belongs to one tile, so its matches are one run of pairs
+    starts = np.flatnonzero(np.diff(park_index)) + 1
+    for first, last in zip([0, *starts.tolist()], [*starts.tolist(), len(pairs)]):
+        matches[int(park_index[first])] = pairs[first:last]
+
+
+def match_points(park_points, farm_points, max_distance, exact_distance, memory_budget=MEMORY_BUDGET):
+    """Yield (park index, [(farm index, distance in km rounded to 0.1)]) for every park with a farm in range.
+
+    Points are (latitude, longitude) in degrees or None; exact_distance is the
+    scalar distance function whose rounded results the matches must equal.
+    """
+    arrays = _arrays(park_points, farm_points)
+    if not len(arrays["park_positions"]) or not len(arrays["farm_positions"]):
+        return
+
+    matches = {}
+    for tile in _match_range(arrays, 0, len(arrays["park_positions"]), len(farm_points),
+                             max_distance, exact_distance, memory_budget):
+        _collect(matches, *tile)
+
+    for park in sorted(matches):
+        yield park, matches[park]
+
+
+# Arrays of the shared memory block a worker process attached to, by name
+_shared = {}
+
+
+def _attach(name, layout):
+    """Worker initializer: view the arrays in the shared memory block without copying them."""
+    block = shared_memory.SharedMemory(name=name)
+    # The block must outlive the views on it
+    _shared["block"] = block
+    _shared["arrays"] = {array: np.ndarray(shape, dtype=dtype, buffer=block.buf, offset=offset)
+                         for array, (dtype, shape, offset) in layout.items()}
+
+
+def _match_partition(first_park, last_park, farm_count, max_distance, exact_distance, memory_budget):
+    """Worker entry point: the matches of a run of parks as three arrays, ordered as _match_range orders them."""
+    tiles = list(_match_range(_shared["arrays"], first_park, last_park, farm_count,
+                              max_distance, exact_distance, memory_budget))
+    if not tiles:
+        return None
+    return tuple(np.concatenate(column) for column in zip(*tiles))
+
+
+def match_points_parallel(park_points, farm_points, max_distance, exact_distance, workers,
+                          memory_budget=MEMORY_BUDGET):
+    """match_points() fanned out to worker processes over partitions of the parks, with the same output.
+
+    exact_distance must be picklable (a module-level function). Each worker
+    uses up to memory_budget bytes for its blocks.
+    """
+    arrays = _arrays(park_points, farm_points)
+    park_count = len(arrays["park_positions"])
+    if not park_count or not len(arrays["farm_positions"]):
+        return
+
+    # One block holding every array, each at an 8-byte aligned offset
+    layout = {}
+    size = 0
+    for name, array in arrays.items():
+        layout[name] = (array.dtype.str, array.shape, size)
+        size += -(-array.nbytes // 8) * 8
+    block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    try:
+        for name, array in arrays.items():
+            dtype, shape, offset = layout[name]
+            np.ndarray(shape, dtype=dtype, buffer=block.buf, offset=offset)[...] = array
+        del arrays
+
+        # Partitions are whole tiles, consecutive in latitude
+        parks_per_tile, _ = _tile_size(memory_budget)
+        tiles = -(-park_count // parks_per_tile)
+        tiles_per_partition = max(1, -(-tiles // (workers * PARTITIONS_PER_WORKER)))
+        bounds = list(range(0, park_count, tiles_per_partition * parks_per_tile)) + [park_count]
+
+        matches = {}
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=(block.name, layout)) as pool:
+            count = len(bounds) - 1
+            results = pool.map(_match_partition, bounds[:-1], bounds[1:], [len(farm_points)] * count,
+                               [max_distance] * count, [exact_distance] * count, [memory_budget] * count)
+            for result in results:
+                if result is not None:
+                    _collect(matches, *result)
+    finally:
+        block.close()
+        block.unlink()
+
+    for park in sorted(matches):
+        yield park, matches[park]
@@ -0,0 +1,734 @@
+#!/usr/bin/env python3
+"""
+Streaming ingestion engine for Apify-scraped solar park data.
+The per-country process_solar_parks*.py scripts describe their keywords, region
+rules and default park size as a plugin dict; this module parses the Google Places
+dump one item at a time and writes the processed records as it goes, so memory
+use stays flat no matter how large the dump is.
+
+Other record types run through the same engine with plugins of their own: a
+plugin may replace the solar park extraction with "record_type",
+"compact_item", "process_item" and "fingerprint_keys" (see
+process_sheep_farms), and process_countries takes the function that loads it.
+"""
+
+import argparse
+import gzip
+import hashlib
+import importlib
+import itertools
+import json
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import checkpoint
+import dedup
+import numeric_extractor
+import region_boundaries
+import review_digest
+import run_report
+import schema_validation
+import solar_classifier
+
+# Characters read from the input file per refill
+READ_CHUNK_SIZE = 1 << 20
+
+# Items handed to a worker process at a time in parallel mode
+ITEMS_PER_CHUNK = 256
+
+# Country plugins: country code -> script defining PLUGIN, INPUT_FILE and OUTPUT_FILE
+COUNTRY_PLUGINS = {
+    "NL": "process_solar_parks",
+    "FR": "process_solar_parks_france",
+    "DE": "process_solar_parks_germany",
+    "UK": "process_solar_parks_uk",
+    "BE": "process_solar_parks_belgium"
+}
+
+# What every country's extract_vegetation returns when no keyword matches
+DEFAULT_VEGETATION = "Mixed grass"
+
+_WHITESPACE = re.compile(r'\s*')
+
+# Collects the counts of process_item calls made without a report
+_DISCARDED_REPORT = run_report.RunReport("discarded")
+
+# Queued between chunks when a job is due for a checkpoint
+_CHECKPOINT = "checkpoint"
+
+
+def open_text(path, mode='r', encoding='utf-8'):
+    """Open a text file for reading ('r') or writing ('w'), gzip-compressed if the name ends in .gz."""
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding=encoding)
+    return open(path, mode, encoding=encoding)
+
+
+def is_ndjson(path):
+    """Whether a file name denotes newline-delimited JSON (.ndjson or .jsonl, optionally .gz)."""
+    name = path[:-3] if path.endswith('.gz') else path
+    return name.endswith(('.ndjson', '.jsonl'))
+
+
+def iter_json_array(input_file, chunk_size=READ_CHUNK_SIZE):
+    """Yield the items of a top-level JSON array one at a time without loading the whole file."""
+    decoder = json.JSONDecoder()
+
+    with open_text(input_file, 'r', encoding='utf-8-sig') as f:
+        buffer = ""
+        pos = 0
+        eof = False
+        state = "start"
+
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+
+            # Refill when the buffer is exhausted; a value ending exactly at the end
+            # of the buffer may be cut short (e.g. a number), so read on in that case too
+            if pos >= len(buffer) and not eof:
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                continue
+            if pos >= len(buffer):
+                raise ValueError(f"Unexpected end of JSON array in {input_file}")
+
+            char = buffer[pos]
+
+            if state == "start":
+                if char != '[':
+                    raise ValueError(f"Expected a JSON array in {input_file}")
+                pos += 1
+                state = "first"
+            elif state in ("first", "separator") and char == ']':
+                return
+            elif state == "separator":
+                if char != ',':
+                    raise ValueError(f"Expected ',' or ']' at character {pos} of the buffer in {input_file}")
+                pos += 1
+                state = "value"
+            else:
+                try:
+                    item, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    end = None
+
+                if end is None or (end == len(buffer) and not eof):
+                    # Item is not complete yet; grow the read so large items stay linear
+                    chunk = f.read(max(chunk_size, len(buffer) - pos))
+                    eof = not chunk
+                    buffer = buffer[pos:] + chunk
+                    pos = 0
+                    continue
+
+                pos = end
+                state = "separator"
+                yield item
+
+
+class JsonArrayWriter:
+    """Write a JSON array one item at a time, formatted like json.dump(..., indent=2).
+
+    resume is the state returned by sync() at a checkpoint; the writer then
+    continues the file from there.
+    """
+
+    def __init__(self, output_file, resume=None):
+        self.output_file = output_file
+        self.count = resume["count"] if resume else 0
+        self._file = checkpoint.OutputStream(output_file, resume["offset"] if resume else None)
+
+    def write(self, item):
+        text = json.dumps(item, indent=2, ensure_ascii=False)
+        self._file.write(('[\n  ' if self.count == 0 else ',\n  ') + text.replace('\n', '\n  '))
+        self.count += 1
+
+    def sync(self):
+        """Make the items written so far durable; returns the state to resume from."""
+        return {"count": self.count, "offset": self._file.sync()}
+
+    def close(self):
+        self._file.write('\n]' if self.count else '[]')
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def iter_ndjson(input_file):
+    """Yield the records of a newline-delimited JSON file one at a time."""
+    with open_text(input_file, 'r', encoding='utf-8-sig') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class NdjsonWriter:
+    """Write one compact JSON record per line; resume as for JsonArrayWriter."""
+
+    def __init__(self, output_file, resume=None):
+        self.output_file = output_file
+        self.count = resume["count"] if resume else 0
+        self._file = checkpoint.OutputStream(output_file, resume["offset"] if resume else None)
+
+    def write(self, item):
+        self._file.write(json.dumps(item, ensure_ascii=False) + "\n")
+        self.count += 1
+
+    def sync(self):
+        """Make the records written so far durable; returns the state to resume from."""
+        return {"count": self.count, "offset": self._file.sync()}
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def iter_records(input_file):
+    """Yield the records of a JSON array or newline-delimited JSON file, chosen by file name."""
+    return iter_ndjson(input_file) if is_ndjson(input_file) else iter_json_array(input_file)
+
+
+def record_writer(output_file):
+    """A writer for newline-delimited JSON or a JSON array, chosen by file name."""
+    return NdjsonWriter(output_file) if is_ndjson(output_file) else JsonArrayWriter(output_file)
+
+
+def process_item(item, plugin, report=None):
+    """Convert one compacted Google Places item into an Ombaa solar park record, or None if it is not a park.
+
+    With a RunReport the time of each extraction stage and the outcome of each
+    extractor are recorded in it.
+    """
+    if report is None:
+        report = _DISCARDED_REPORT
+    timer = report.timer()
+
+    classification = solar_classifier.classifier_for(plugin).classify(item.get('title'), item.get('categories'))
+    timer.lap("classify")
+    report.count("classifier", classification.rule)
+    if not classification.accepted:
+        return None
+
+    # The most informative review text serves as description
+    review_texts = item['review_texts']
+    description = review_texts[0] if review_texts else ""
+
+    # Extract hectares (ha, hectares, Hektar, acres) from the kept reviews, then the item description
+    hectares = None
+    hectares_source = "review"
+    for text in review_texts:
+        hectares = numeric_extractor.extract_hectares(text)
+        if hectares:
+            break
+    if not hectares and item.get('description'):
+        hectares = numeric_extractor.extract_hectares(item['description'])
+        hectares_source = "description"
+
+    # Solar parks are often named with their capacity
+    if not hectares:
+        mw = numeric_extractor.extract_capacity_mw(item.get('title'))
+        if mw:
+            # Rough estimate: 1 MW ≈ 1-2 hectares
+            hectares = mw * 1.5
+            hectares_source = "capacity"
+
+    # If still no hectares, fall back to the country's average size
+    if not hectares:
+        hectares = plugin["default_hectares"]
+        hectares_source = "default"
+    timer.lap("extract_hectares")
+    report.count("hectares", hectares_source)
+
+    # Region from the admin boundaries when the item has coordinates, else from the address text
+    location = item.get('location') or {}
+    region = region_boundaries.region_at(location.get('lat'), location.get('lng'), plugin["code"])
+    region_source = "boundaries"
+    if not region:
+        address, city = item.get('address', ''), item.get('city', '')
+        region = plugin["extract_region"](address, city)
+        region_source = "address"
+        # A country default only stands in for an address that names no known region
+        if not region and (address or city) and plugin.get("default_region"):
+            region = plugin["default_region"]
+            region_source = "default"
+        elif not region:
+            region_source = "missing"
+    timer.lap("extract_region")
+    report.count("region", region_source)
+
+    vegetation = plugin["extract_vegetation"](description)
+    timer.lap("extract_vegetation")
+    report.count("vegetation", "default" if vegetation == DEFAULT_VEGETATION else "keyword")
+
+    return {
+        "id": dedup.record_id(item.get('place_id'), item.get('title', ''), location.get('lat'), location.get('lng')),
+        "name": item.get('title', ''),
+        "location": item.get('address', ''),
+        "country": plugin["country"],
+        "region": region,
+        "total_hectares": hectares,
+        "vegetation_type": vegetation,
+        "contact_email": "",  # Not available in the data
+        "contact_phone": item.get('phone', ''),
+        "website": item.get('website', ''),
+        "coordinates": {
+            "latitude": location.get('lat'),
+            "longitude": location.get('lng')
+        },
+        "place_id": item.get('place_id')
+    }
+
+
+def load_plugin(country_code):
+    """Return the PLUGIN dict of a country script."""
+    return importlib.import_module(COUNTRY_PLUGINS[country_code]).PLUGIN
+
+
+def _extract(item, plugin, report):
+    return plugin.get("process_item", process_item)(item, plugin, report)
+
+
+def _compact_item(item):
+    """Keep only the fields process_item reads, with the reviews reduced to a small digest.
+
+    Called right after each item is parsed, so the full review arrays are dropped
+    before they reach the extractors, the manifest hash or a worker process.
+    """
+    return {
+        "place_id": item.get('placeId'),
+        "title": item.get('title', ''),
+        "categories": item.get('categories'),
+        "review_texts": review_digest.digest_reviews(item.get('reviews')),
+        "description": item.get('description'),
+        "address": item.get('address', ''),
+        "city": item.get('city', ''),
+        "phone": item.get('phone', ''),
+        "website": item.get('website', ''),
+        "location": item.get('location')
+    }
+
+
+# Bump when extraction logic changes, so incremental runs do not reuse stale records
+EXTRACTOR_VERSION = 11
+
+
+def manifest_path(output_file):
+    """Manifest kept next to a processed output file for incremental runs."""
+    return os.path.splitext(output_file)[0] + ".manifest.json"
+
+
+def extractor_fingerprint(plugin):
+    """What the records of a country depend on besides its input; a change invalidates manifests and checkpoints."""
+    fingerprint = {
+        "extractor_version": EXTRACTOR_VERSION,
+        "code": plugin["code"],
+        "boundaries": region_boundaries.boundaries_fingerprint()
+    }
+    for key in plugin.get("fingerprint_keys", ("solar_keywords", "park_keywords", "default_hectares")):
+        fingerprint[key] = plugin[key]
+    return fingerprint
+
+
+class IngestManifest:
+    """Place ID -> content hash and processed record, as of the previous run of one country."""
+
+    def __init__(self, path, plugin):
+        self.path = path
+        self.fingerprint = extractor_fingerprint(plugin)
+        self.previous = {}
+        self.current = {}
+        self.stats = {"added": 0, "changed": 0, "unchanged": 0, "removed": 0}
+        self._journal = None
+
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            # A different plugin configuration invalidates every cached record
+            if data.get("fingerprint") == self.fingerprint:
+                self.previous = data["items"]
+
+    def lookup(self, item, compact):
+        """Return (key, digest, cached) for an item; cached is None when it must be (re)processed."""
+        # Only hash the fields the extractors read, so volatile scrape metadata is not churn
+        digest = hashlib.sha1(json.dumps(compact, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+        key = item.get('placeId') or item.get('cid') or digest
+
+        cached = self.previous.get(key)
+        if cached is None:
+            self.stats["added"] += 1
+        elif cached["hash"] != digest:
+            self.stats["changed"] += 1
+            cached = None
+        else:
+            self.stats["unchanged"] += 1
+        return key, digest, cached
+
+    def store(self, key, digest, record):
+        entry = self.current[key] = {"hash": digest, "record": record}
+        if self._journal is not None:
+            self._journal.write(json.dumps([key, entry], ensure_ascii=False) + "\n")
+
+    def open_journal(self, resume=None):
+        """Also log every stored entry to a journal, so that a checkpoint covers the current items.
+
+        resume is the state returned by sync() at a checkpoint; the entries and
+        stats recorded up to it are restored first.
+        """
+        path = os.path.splitext(self.path)[0] + ".journal.jsonl"
+        if resume:
+            with open(path, 'rb') as f:
+                for line in f.read(resume["offset"]).decode('utf-8').splitlines():
+                    key, entry = json.loads(line)
+                    self.current[key] = entry
+            self.stats = dict(resume["stats"])
+        self._journal = checkpoint.OutputStream(path, resume["offset"] if resume else None)
+
+    def sync(self):
+        """Make the journal durable; returns the state to resume from."""
+        return {"offset": self._journal.sync(), "stats": dict(self.stats)}
+
+    def save(self):
+        self.stats["removed"] = sum(1 for key in self.previous if key not in self.current)
+        temp_file = self.path + ".tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump({"fingerprint": self.fingerprint, "items": self.current}, f, ensure_ascii=False)
+        os.replace(temp_file, self.path)
+        if self._journal is not None:
+            self._journal.close()
+            os.remove(self._journal.path)
+            self._journal = None
+
+
+def _iter_slots(input_file, manifest, report, quarantine, skip=0, compact_item=_compact_item):
+    """Yield [key, digest, cached, compact_item] per valid input item, looked up in the manifest if any.
+
+    Items that fail RAW_ITEM_SCHEMA go to the quarantine instead. The first
+    skip items, handled before a checkpoint, are only parsed.
+    """
+    items = itertools.islice(iter_json_array(input_file), skip, None)
+    validate = schema_validation.RAW_ITEMS.errors
+    timer = report.timer()
+    for index, item in enumerate(items, skip):
+        timer.lap("parse")
+        reasons = validate(item)
+        timer.lap("validate")
+        if reasons:
+            report.items["in"] += 1
+            report.count("validation", "quarantined")
+            quarantine.add(input_file, index, reasons, item)
+            timer.reset()
+            continue
+        report.count("validation", "valid")
+        compact = compact_item(item)
+        timer.lap("compact")
+        report.items["in"] += 1
+        if manifest is None:
+            slot = [None, None, None, compact]
+        else:
+            slot = [*manifest.lookup(item, compact), compact]
+            timer.lap("manifest")
+        yield slot
+        # Time spent by the consumer between items belongs to its own stages
+        timer.reset()
+
+
+def _process_chunk(load, country_code, items):
+    """Worker entry point: process one chunk of items for a country, with the plugin load returns for it.
+
+    Returns one result (or None) per item and the chunk's report counts.
+    """
+    plugin = load(country_code)
+    report = run_report.RunReport(country_code)
+    results = [_extract(item, plugin, report) for item in items]
+    return results, report.to_dict()
+
+
+def _write_slot(writer, manifest, slot, entry):
+    if manifest is not None:
+        manifest.store(slot[0], slot[1], entry)
+    if entry is not None:
+        writer.write(entry)
+
+
+def _summary(writer, manifest, report, quarantine):
+    quarantine.close()
+    fingerprint = region_boundaries.boundaries_fingerprint()
+    # None when no boundary file was loaded and every region came from the address
+    summary = {"count": writer.count, "items": report.items["in"], "quarantined": quarantine.count,
+               "boundaries_file": fingerprint[0] if fingerprint else None}
+    if manifest is not None:
+        manifest.save()
+        summary.update(manifest.stats)
+        report.count("manifest", "cached", manifest.stats["unchanged"])
+        report.count("manifest", "extracted", manifest.stats["added"] + manifest.stats["changed"])
+    report.items["out"] = writer.count
+    report.summary = dict(summary)
+    summary["report"] = report.save(writer.output_file)
+    return summary
+
+
+class _Job:
+    """Writer, manifest, report, quarantine and checkpoint of one (plugin, input_file, output_file) job.
+
+    With resume=True the job continues from its checkpoint, if it has one; summary
+    is already set when the checkpoint says the job finished.
+    """
+
+    def __init__(self, plugin, input_file, output_file, incremental=False, resume=False,
+                 checkpoint_interval=checkpoint.CHECKPOINT_INTERVAL):
+        self.plugin = plugin
+        self.input_file = input_file
+        self.output_file = output_file
+        self.incremental = incremental
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoint = None
+        self.summary = None
+        state = {}
+        if checkpoint_interval:
+            fingerprint = dict(extractor_fingerprint(plugin), incremental=incremental,
+                               **checkpoint.input_fingerprint(input_file))
+            self.checkpoint = checkpoint.Checkpoint(output_file, fingerprint, resume)
+            state = self.checkpoint.state or {}
+            self.summary = state.get("summary")
+        self._state = state
+        self.resumed_from = self.position = state.get("position", 0)
+
+    def open(self):
+        """Open the outputs, continuing them from the checkpoint if resuming."""
+        state = self._state
+        self.manifest = IngestManifest(manifest_path(self.output_file), self.plugin) if self.incremental else None
+        if self.manifest is not None and self.checkpoint is not None:
+            self.manifest.open_journal(state.get("manifest"))
+        self.report = run_report.RunReport(f"{self.plugin.get('record_type', 'solar_parks')} {self.plugin['code']}")
+        if state:
+            self.report.merge(state["report"])
+        self.quarantine = schema_validation.Quarantine(self.output_file, state.get("quarantine"))
+        self.writer = JsonArrayWriter(self.output_file, state.get("output"))
+
+    def slots(self):
+        return _iter_slots(self.input_file, self.manifest, self.report, self.quarantine, skip=self.position,
+                           compact_item=self.plugin.get("compact_item", _compact_item))
+
+    def checkpoint_due(self):
+        return self.checkpoint is not None and self.report.items["in"] - self.position >= self.checkpoint_interval
+
+    def save_checkpoint(self):
+        """Record that every item read so far has been written; only valid when none is in flight."""
+        self.position = self.report.items["in"]
+        state = {
+            "position": self.position,
+            "output": self.writer.sync(),
+            "quarantine": self.quarantine.sync(),
+            "report": self.report.to_dict()
+        }
+        if self.manifest is not None:
+            state["manifest"] = self.manifest.sync()
+        self.checkpoint.save(state)
+
+    def finish(self):
+        self.writer.close()
+        self.summary = _summary(self.writer, self.manifest, self.report, self.quarantine)
+        self.summary["resumed_from"] = self.resumed_from
+        if self.checkpoint is not None:
+            self.checkpoint.save({"summary": self.summary})
+        return self.summary
+
+
+def process_countries(jobs, workers=1, chunk_size=ITEMS_PER_CHUNK, incremental=False, resume=False,
+                      checkpoint_interval=checkpoint.CHECKPOINT_INTERVAL, load=load_plugin):
+    """Process several (country_code, input_file, output_file) jobs and return a summary per output file.
+
+    load returns the plugin of a country code; it is called in the worker
+    processes as well, so it has to be a module-level function.
+
+    With workers > 1 the items of all jobs are cut into chunks and fanned out to a
+    process pool. Results are consumed strictly in submission order, so every output
+    file is identical to the serial run, while the pool keeps working across the
+    boundary between one country and the next.
+
+    With incremental=True a manifest next to each output remembers every item's
+    place ID, content hash and processed record; only new or changed items are
+    extracted again and items missing from the new scrape drop out of the output.
+
+    Every checkpoint_interval input items a job takes a checkpoint (see
+    checkpoint); with resume=True a run that crashed continues from there, and
+    jobs that had finished are skipped.
+
+    Every output gets a run report next to it (see run_report) with the time
+    spent per stage and the outcome counts of each extractor. Items failing
+    schema validation are skipped and listed in a quarantine file next to it.
+    """
+    jobs = [_Job(load(country_code), input_file, output_file, incremental, resume, checkpoint_interval)
+            for country_code, input_file, output_file in jobs]
+
+    if workers <= 1:
+        for job in jobs:
+            if job.summary is None:
+                _process_serial(job)
+    else:
+        _process_parallel(jobs, workers, chunk_size, load)
+
+    # Every job finished, so nothing is left to resume
+    for job in jobs:
+        if job.checkpoint is not None:
+            job.checkpoint.remove()
+    return {job.output_file: job.summary for job in jobs}
+
+
+def _process_parallel(jobs, workers, chunk_size, load):
+    pending = deque()
+    # Bound the chunks in flight so memory stays flat however large the inputs are
+    max_pending = workers * 4
+
+    def tasks():
+        for job in jobs:
+            if job.summary is not None:
+                continue
+            job.open()
+            slots = []
+            todo = 0
+            for slot in job.slots():
+                slots.append(slot)
+                todo += slot[2] is None
+                # Cached slots are cheap, but still cap them so the chunk stays small
+                if todo >= chunk_size or len(slots) >= chunk_size * 8:
+                    yield job, slots
+                    slots = []
+                    todo = 0
+                    if job.checkpoint_due():
+                        yield job, _CHECKPOINT
+            if slots:
+                yield job, slots
+            # Marks the end of this job's chunks
+            yield job, None
+
+    def drain_one():
+        job, slots, future = pending.popleft()
+        if slots is None:
+            job.finish()
+            return
+
+        report = job.report
+        results = ()
+        if future is not None:
+            results, counts = future.result()
+            report.merge(counts)
+        results = iter(results)
+        timer = report.timer()
+        for slot in slots:
+            entry = slot[2]["record"] if slot[2] is not None else next(results)
+            _write_slot(job.writer, job.manifest, slot, entry)
+        timer.lap("write")
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for job, slots in tasks():
+            if slots is _CHECKPOINT:
+                # The reader is paused right after the last chunk, so once every chunk
+                # is written the checkpoint covers exactly the items read
+                while pending:
+                    drain_one()
+                timer = job.report.timer()
+                job.save_checkpoint()
+                timer.lap("checkpoint")
+                continue
+            future = None
+            if slots is not None:
+                todo = [slot[3] for slot in slots if slot[2] is None]
+                if todo:
+                    future = pool.submit(_process_chunk, load, job.plugin["code"], todo)
+            pending.append((job, slots, future))
+            while len(pending) > max_pending:
+                drain_one()
+        while pending:
+            drain_one()
+
+
+def _process_serial(job):
+    job.open()
+    report = job.report
+    timer = report.timer()
+
+    for slot in job.slots():
+        entry = slot[2]["record"] if slot[2] is not None else _extract(slot[3], job.plugin, report)
+        timer.reset()
+        _write_slot(job.writer, job.manifest, slot, entry)
+        timer.lap("write")
+        if job.checkpoint_due():
+            job.save_checkpoint()
+            timer.lap("checkpoint")
+
+    return job.finish()
+
+
+def process_solar_parks(input_file, output_file, plugin, workers=1, incremental=False, resume=False):
+    """Stream solar park data from an Apify dump into an Ombaa-format JSON file."""
+    if workers > 1:
+        summary = process_countries([(plugin["code"], input_file, output_file)], workers,
+                                    incremental=incremental, resume=resume)[output_file]
+    else:
+        job = _Job(plugin, input_file, output_file, incremental, resume)
+        summary = job.summary or _process_serial(job)
+        if job.checkpoint is not None:
+            job.checkpoint.remove()
+    return summary["count"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Process the Apify solar park datasets of several countries.")
+    parser.add_argument("countries", nargs="*", default=list(COUNTRY_PLUGINS),
+                        help="country codes to process (default: all of %(default)s)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes; 1 runs serially (default: %(default)s)")
+    parser.add_argument("--chunk-size", type=int, default=ITEMS_PER_CHUNK,
+                        help="items per chunk sent to a worker (default: %(default)s)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only re-extract items that are new or changed since the last run")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue an interrupted run from the checkpoints it left")
+    parser.add_argument("--checkpoint-interval", type=int, default=checkpoint.CHECKPOINT_INTERVAL,
+                        help="input items between checkpoints; 0 disables them (default: %(default)s)")
+    args = parser.parse_args()
+
+    jobs = []
+    for country_code in args.countries:
+        module = importlib.import_module(COUNTRY_PLUGINS[country_code])
+        jobs.append((country_code, module.INPUT_FILE, module.OUTPUT_FILE))
+
+    print(region_boundaries.describe_boundaries())
+    start = time.perf_counter()
+    summaries = process_countries(jobs, args.workers, args.chunk_size, args.incremental, args.resume,
+                                  args.checkpoint_interval)
+    elapsed = time.perf_counter() - start
+
+    for country_code, _, output_file in jobs:
+        summary = summaries[output_file]
+        print(f"{country_code}: processed {summary['count']} solar parks. Output saved to {output_file}")
+        if summary['resumed_from']:
+            print(f"  Resumed from the checkpoint after {summary['resumed_from']} items")
+        if args.incremental:
+            print(f"  {summary['added']} added, {summary['changed']} changed, "
+                  f"{summary['unchanged']} unchanged, {summary['removed']} removed")
+        if summary['quarantined']:
+            print(f"  {summary['quarantined']} invalid items quarantined in "
+                  f"{schema_validation.quarantine_path(output_file)}")
+        print(f"  Run report saved to {summary['report']}")
+    print(f"Finished in {elapsed:.1f}s with {args.workers} worker(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,11 +5,22 @@ This script combines the processed solar park and sheep farm data
 and creates the necessary JavaScript files for the directory interface.
 """
 
+import argparse
+import heapq
 import json
 import os
 import math
+import re
 from datetime import datetime
 
+import dedup
+import distance_engine
+import snapshot
+import spatial_index
+
+# Grid cell size in km for the top-k walk; small, so the walk around a park in a dense region stays short
+NEAREST_CELL_KM = 5
+
 def calculate_distance(lat1, lon1, lat2, lon2):
     """Calculate distance between two points in kilometers using the Haversine formula."""
     # Convert latitude and longitude from degrees to radians
@@ -32,59 +43,217 @@ def calculate_distance(lat1, lon1, lat2, lon2):
     
     return distance
 
-def find_potential_matches(solar_parks, sheep_farms, max_distance=50):
-    """Find potential matches between solar parks and sheep farms based on proximity."""
-    matches = []
+def _valid_point(latitude, longitude):
+    """(latitude, longitude), or None when either is missing (None, NaN or 0)."""
+    if not latitude or not longitude or latitude != latitude or longitude != longitude:
+        return None
+    return latitude, longitude
+
+def _match_points(park_points, farm_points, max_distance, engine="numpy", memory_budget=distance_engine.MEMORY_BUDGET,
+                  top_k=None, workers=1):
+    """Yield (park index, [(farm index, distance in km rounded to 0.1)]) for every park with a farm in range.
     
-    for park in solar_parks:
-        park_matches = []
-        park_lat = park.get('coordinates', {}).get('latitude')
-        park_lng = park.get('coordinates', {}).get('longitude')
-        
-        if not park_lat or not park_lng:
+    The "numpy" engine measures blocks of parks x farms at once within memory_budget
+    bytes (see distance_engine); the "grid" engine measures one pair at a time, only
+    for the farms in the grid cells around each park (see spatial_index). Both
+    find the matches of measuring every park against every farm with calculate_distance.
+    With top_k, only the first top_k matches of every park are kept: the grid walk
+    of _nearest_points finds them whatever the engine, in one process.
+    The "numpy" engine spreads the parks over workers processes when workers > 1.
+    """
+    if top_k is not None:
+        # Checked here, since _nearest_points only runs once its matches are read
+        if top_k < 1:
+            raise ValueError(f"top_k must be at least 1, got {top_k}")
+        if workers > 1:
+            raise ValueError("top_k matching runs in one process; it cannot be combined with workers > 1")
+        return _nearest_points(park_points, farm_points, max_distance, top_k)
+    if engine == "numpy" and workers > 1:
+        return distance_engine.match_points_parallel(park_points, farm_points, max_distance, calculate_distance,
+                                                     workers, memory_budget)
+    if engine == "numpy":
+        return distance_engine.match_points(park_points, farm_points, max_distance, calculate_distance, memory_budget)
+    return _grid_match_points(park_points, farm_points, max_distance)
+
+def _grid_match_points(park_points, farm_points, max_distance):
+    # Cells about one radius across keep the lookups to a few cells per park
+    index = spatial_index.GridIndex(farm_points, max(max_distance, 1))
+    
+    for park_index, park_point in enumerate(park_points):
+        if park_point is None:
             continue
         
-        for farm in sheep_farms:
-            farm_lat = farm.get('coordinates', {}).get('latitude')
-            farm_lng = farm.get('coordinates', {}).get('longitude')
-            
-            if not farm_lat or not farm_lng:
-                continue
-            
-            distance = calculate_distance(park_lat, park_lng, farm_lat, farm_lng)
-            
+        park_matches = []
+        for farm_index in index.candidates(park_point[0], park_point[1], max_distance):
+            farm_point = farm_points[farm_index]
+            distance = calculate_distance(park_point[0], park_point[1], farm_point[0], farm_point[1])
             if distance <= max_distance:
-                park_matches.append({
-                    "sheep_farm_id": sheep_farms.index(farm),
-                    "sheep_farm_name": farm.get('name'),
-                    "distance_km": round(distance, 1)
-                })
+                park_matches.append((farm_index, round(distance, 1)))
         
         if park_matches:
-            # Sort matches by distance
-            park_matches.sort(key=lambda x: x['distance_km'])
-            
-            matches.append({
-                "solar_park_id": solar_parks.index(park),
-                "solar_park_name": park.get('name'),
-                "country": park.get('country'),
-                "region": park.get('region'),
-                "potential_matches": park_matches
-            })
+            # Sort matches by distance, equal distances in farm order
+            park_matches.sort(key=lambda m: (m[1], m[0]))
+            yield park_index, park_matches
+
+def _nearest_points(park_points, farm_points, max_distance, top_k):
+    """_match_points limited to the top_k nearest farms in range of every park, in the same order.
+    
+    Each park walks the grid within a search radius that starts at one cell and
+    doubles up to max_distance, keeping its top_k nearest farms in a bounded heap,
+    until the worst of a full heap lies well within the radius: every farm not
+    yet visited is further away. Memory and output stay O(parks x top_k).
+    """
+    cell_km = min(max(max_distance, 1), NEAREST_CELL_KM)
+    index = spatial_index.GridIndex(farm_points, cell_km)
+    
+    for park_index, park_point in enumerate(park_points):
+        if park_point is None:
+            continue
+        
+        radius = cell_km
+        while True:
+            radius = min(radius, max_distance)
+            # (-distance, -farm index) of the best farms so far, so the worst is on top
+            heap = []
+            for farm_index in index.candidates(park_point[0], park_point[1], radius):
+                farm_point = farm_points[farm_index]
+                distance = calculate_distance(park_point[0], park_point[1], farm_point[0], farm_point[1])
+                if distance <= max_distance:
+                    item = (-round(distance, 1), -farm_index)
+                    if len(heap) < top_k:
+                        heapq.heappush(heap, item)
+                    elif item > heap[0]:
+                        heapq.heapreplace(heap, item)
+            # A farm further than radius rounds to more than the worst kept one
+            if radius >= max_distance or (len(heap) == top_k and -heap[0][0] + 0.1 <= radius):
+                break
+            radius *= 2
+        
+        if heap:
+            yield park_index, [(-farm, -distance) for distance, farm in sorted(heap, reverse=True)]
+
+def _format_matches(point_matches, park_ids, park_names, park_countries, park_regions, farm_ids, farm_names):
+    # Matches refer to parks and farms by their stable IDs (see dedup.record_id), not list positions
+    return [{
+        "solar_park_id": park_ids[park_index],
+        "solar_park_name": park_names[park_index],
+        "country": park_countries[park_index],
+        "region": park_regions[park_index],
+        "potential_matches": [{
+            "sheep_farm_id": farm_ids[farm_index],
+            "sheep_farm_name": farm_names[farm_index],
+            "distance_km": distance
+        } for farm_index, distance in park_matches]
+    } for park_index, park_matches in point_matches]
+
+def find_potential_matches(solar_parks, sheep_farms, max_distance=50, engine="numpy", top_k=None, workers=1):
+    """Find potential matches between solar parks and sheep farms based on proximity.
+    
+    With top_k, every park keeps only its top_k nearest farms within max_distance;
+    engine is not used then, and workers must be 1 (see _match_points).
+    """
+    def points(records):
+        return [_valid_point((r.get('coordinates') or {}).get('latitude'),
+                             (r.get('coordinates') or {}).get('longitude')) for r in records]
+    
+    point_matches = _match_points(points(solar_parks), points(sheep_farms), max_distance, engine,
+                                  top_k=top_k, workers=workers)
+    return _format_matches(point_matches,
+                           [dedup.with_record_id(park)['id'] for park in solar_parks],
+                           [park.get('name') for park in solar_parks],
+                           [park.get('country') for park in solar_parks],
+                           [park.get('region') for park in solar_parks],
+                           [dedup.with_record_id(farm)['id'] for farm in sheep_farms],
+                           [farm.get('name') for farm in sheep_farms])
+
+def find_snapshot_matches(snap, max_distance=50, engine="numpy", top_k=None, workers=1):
+    """find_potential_matches over a mapped snapshot, reading the coordinate columns in place."""
+    parks = snap["solar_parks"]
+    farms = snap["sheep_farms"]
+    
+    def points(table):
+        return [_valid_point(lat, lng) for lat, lng in zip(table["latitude"].tolist(), table["longitude"].tolist())]
+    
+    countries = snap.countries
+    point_matches = _match_points(points(parks), points(farms), max_distance, engine, top_k=top_k, workers=workers)
+    return _format_matches(point_matches,
+                           parks.strings("id"),
+                           parks.strings("name"),
+                           [countries[code] for code in parks["country"].tolist()],
+                           parks.strings("region"),
+                           farms.strings("id"),
+                           farms.strings("name"))
+
+def read_matches_js(path):
+    """(match table revision, matches) of a matches-data.js, or (None, None) if it is missing or has no revision."""
+    if not os.path.exists(path):
+        return None, None
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    revision = re.search(r"^// Match table revision: (\w+)$", text, re.MULTILINE)
+    start = text.find("const matchesData = ")
+    end = text.rfind(";\n\nexport")
+    if revision is None or start < 0 or end < start:
+        return None, None
+    return revision.group(1), json.loads(text[start + len("const matchesData = "):end])
+
+def apply_match_delta(matches, delta, solar_parks):
+    """The matches with a match_table delta ({"upserted", "removed"}) applied, in the order of solar_parks."""
+    by_park = {entry["solar_park_id"]: entry for entry in matches}
+    for park_id in delta["removed"]:
+        by_park.pop(park_id, None)
+    for entry in delta["upserted"]:
+        by_park[entry["solar_park_id"]] = entry
+    position = {park['id']: index for index, park in enumerate(solar_parks)}
+    return sorted(by_park.values(), key=lambda entry: position[entry["solar_park_id"]])
+
+def _matches_from_delta(delta_file, matches_file, solar_parks, max_distance, top_k):
+    """(matches or None, revision or None, why the matches have to be found from scratch) for a delta file.
     
-    return matches
+    A delta only applies to a matches_file at the revision it starts from. Matching
+    from scratch with the table's radius gives the table's matches, so the result
+    still gets the delta's revision and the next delta applies to it.
+    """
+    with open(delta_file, 'r', encoding='utf-8') as f:
+        delta = json.load(f)
+    if top_k is not None:
+        return None, None, "the match table keeps every farm in range, not the top_k nearest"
+    if delta["max_distance"] != max_distance:
+        return None, None, f"the match table was matched within {delta['max_distance']} km, not {max_distance} km"
+    if delta["rebuilt"]:
+        return delta["matches"]["upserted"], delta["revision"], None
+    revision, matches = read_matches_js(matches_file)
+    if revision != delta["base_revision"]:
+        return None, delta["revision"], f"{matches_file} is not at revision {delta['base_revision']} the delta starts from"
+    return apply_match_delta(matches, delta["matches"], solar_parks), delta["revision"], None
 
-def create_integrated_directory_js():
-    """Create JavaScript files for the integrated directory."""
-    # Load solar park and sheep farm data
+def create_integrated_directory_js(max_distance=50, top_k=None, workers=1, delta_file=None):
+    """Create JavaScript files for the integrated directory.
+    
+    Solar parks are matched with the sheep farms within max_distance km using up
+    to workers processes, or only with the top_k nearest of them in one process. With delta_file
+    (written by match_table.py) the delta is applied to the matches of the previous
+    run instead, where it can be (see _matches_from_delta).
+    """
+    # Load solar park and sheep farm data, giving records combined before IDs existed the snapshot's IDs
     with open('/home/ubuntu/processed_solar_parks_combined.json', 'r', encoding='utf-8') as f:
-        solar_parks = json.load(f)
+        solar_parks = [dedup.with_record_id(park) for park in json.load(f)]
     
     with open('/home/ubuntu/processed_sheep_farms_combined.json', 'r', encoding='utf-8') as f:
-        sheep_farms = json.load(f)
+        sheep_farms = [dedup.with_record_id(farm) for farm in json.load(f)]
+    
+    matches_file = '/home/ubuntu/ombaa/src/static/js/matches-data.js'
+    matches = revision = None
+    if delta_file is not None:
+        matches, revision, reason = _matches_from_delta(delta_file, matches_file, solar_parks, max_distance, top_k)
+        if matches is None:
+            print(f"Matching from scratch: {reason}")
     
-    # Find potential matches
-    matches = find_potential_matches(solar_parks, sheep_farms)
+    if matches is None:
+        # Find potential matches on the columnar snapshot of the same files (rebuilt if stale)
+        snap = snapshot.load_or_build('/home/ubuntu/processed_solar_parks_combined.json',
+                                      '/home/ubuntu/processed_sheep_farms_combined.json')
+        matches = find_snapshot_matches(snap, max_distance, top_k=top_k, workers=workers)
     
     # Create statistics
     stats = {
@@ -137,9 +306,12 @@ def create_integrated_directory_js():
         f.write("export { sheepFarmsData };\n")
     
     # 3. Matches Data
-    with open('/home/ubuntu/ombaa/src/static/js/matches-data.js', 'w', encoding='utf-8') as f:
+    with open(matches_file, 'w', encoding='utf-8') as f:
         f.write("// Potential Matches Data for Ombaa Directory\n")
-        f.write("// Generated: " + stats['timestamp'] + "\n\n")
+        f.write("// Generated: " + stats['timestamp'] + "\n")
+        if revision is not None:
+            f.write("// Match table revision: " + revision + "\n")
+        f.write("\n")
         f.write("const matchesData = ")
         json.dump(matches, f, indent=2, ensure_ascii=False)
         f.write(";\n\n")
@@ -157,6 +329,22 @@ import {{ matchesData }} from './matches-data.js';
 // Directory Statistics
 const directoryStats = {stats};
 
+// Parks, farms and matches by stable ID
+const solarParksById = new Map(solarParksData.map(park => [park.id, park]));
+const sheepFarmsById = new Map(sheepFarmsData.map(farm => [farm.id, farm]));
+const matchesByParkId = new Map(matchesData.map(match => [match.solar_park_id, match]));
+
+// Per sheep farm, the matches of the solar parks near it, narrowed to that farm
+const matchesByFarmId = new Map();
+matchesData.forEach(match => {{
+  match.potential_matches.forEach(potentialMatch => {{
+    if (!matchesByFarmId.has(potentialMatch.sheep_farm_id)) {{
+      matchesByFarmId.set(potentialMatch.sheep_farm_id, []);
+    }}
+    matchesByFarmId.get(potentialMatch.sheep_farm_id).push({{ ...match, potential_matches: [potentialMatch] }});
+  }});
+}});
+
 // Initialize Directory
 function initDirectory() {{
   // Populate country filters
@@ -255,8 +443,8 @@ function loadSolarParks() {{
   const container = document.getElementById('solar-parks-container');
   container.innerHTML = '';
   
-  solarParksData.forEach((park, index) => {{
-    const card = createSolarParkCard(park, index);
+  solarParksData.forEach(park => {{
+    const card = createSolarParkCard(park);
     container.appendChild(card);
   }});
   
@@ -265,15 +453,15 @@ function loadSolarParks() {{
 }}
 
 // Create solar park card
-function createSolarParkCard(park, index) {{
+function createSolarParkCard(park) {{
   const card = document.createElement('div');
   card.className = 'bg-white rounded-lg shadow-md overflow-hidden mb-4';
-  card.setAttribute('data-id', index);
+  card.setAttribute('data-id', park.id);
   card.setAttribute('data-country', park.country);
   card.setAttribute('data-region', park.region || '');
   
   // Find potential matches
-  const parkMatches = matchesData.find(m => m.solar_park_id === index);
+  const parkMatches = matchesByParkId.get(park.id);
   const matchCount = parkMatches ? parkMatches.potential_matches.length : 0;
   
   card.innerHTML = `
@@ -293,7 +481,7 @@ function createSolarParkCard(park, index) {{
           <span class="text-sm text-gray-500">${{matchCount}} potential shepherd matches</span>
         </div>
         <button class="view-matches-btn text-white bg-green-600 hover:bg-green-700 font-medium rounded-lg text-sm px-4 py-2" 
-                data-id="${{index}}" onclick="viewSolarParkMatches(${{index}})">
+                data-id="${{park.id}}" onclick="viewSolarParkMatches('${{park.id}}')">
           View Matches
         </button>
       </div>
@@ -308,8 +496,8 @@ function loadSheepFarms() {{
   const container = document.getElementById('sheep-farms-container');
   container.innerHTML = '';
   
-  sheepFarmsData.forEach((farm, index) => {{
-    const card = createSheepFarmCard(farm, index);
+  sheepFarmsData.forEach(farm => {{
+    const card = createSheepFarmCard(farm);
     container.appendChild(card);
   }});
   
@@ -318,17 +506,15 @@ function loadSheepFarms() {{
 }}
 
 // Create sheep farm card
-function createSheepFarmCard(farm, index) {{
+function createSheepFarmCard(farm) {{
   const card = document.createElement('div');
   card.className = 'bg-white rounded-lg shadow-md overflow-hidden mb-4';
-  card.setAttribute('data-id', index);
+  card.setAttribute('data-id', farm.id);
   card.setAttribute('data-country', farm.country);
   card.setAttribute('data-region', farm.region || '');
   
   // Count solar parks that match with this farm
-  const matchCount = matchesData.filter(m => 
-    m.potential_matches.some(pm => pm.sheep_farm_id === index)
-  ).length;
+  const matchCount = (matchesByFarmId.get(farm.id) || []).length;
   
   card.innerHTML = `
     <div class="p-4">
@@ -348,7 +534,7 @@ function createSheepFarmCard(farm, index) {{
           <span class="text-sm text-gray-500">${{matchCount}} potential solar park matches</span>
         </div>
         <button class="view-matches-btn text-white bg-green-600 hover:bg-green-700 font-medium rounded-lg text-sm px-4 py-2" 
-                data-id="${{index}}" onclick="viewSheepFarmMatches(${{index}})">
+                data-id="${{farm.id}}" onclick="viewSheepFarmMatches('${{farm.id}}')">
           View Matches
         </button>
       </div>
@@ -379,11 +565,11 @@ function createMatchCard(match) {{
   const card = document.createElement('div');
   card.className = 'bg-white rounded-lg shadow-md overflow-hidden mb-4';
   
-  const solarPark = solarParksData[match.solar_park_id];
+  const solarPark = solarParksById.get(match.solar_park_id);
   
   let matchesHtml = '';
   match.potential_matches.forEach(potentialMatch => {{
-    const sheepFarm = sheepFarmsData[potentialMatch.sheep_farm_id];
+    const sheepFarm = sheepFarmsById.get(potentialMatch.sheep_farm_id);
     matchesHtml += `
       <div class="border-t border-gray-200 p-4">
         <div class="flex justify-between items-start">
@@ -398,7 +584,7 @@ function createMatchCard(match) {{
           <div class="text-right">
             <span class="bg-green-100 text-green-800 text-xs font-medium px-2.5 py-0.5 rounded">${{potentialMatch.distance_km}} km</span>
             <button class="mt-2 text-white bg-green-600 hover:bg-green-700 font-medium rounded-lg text-xs px-3 py-1.5" 
-                    onclick="initiateContact(${{match.solar_park_id}}, ${{potentialMatch.sheep_farm_id}})">
+                    onclick="initiateContact('${{match.solar_park_id}}', '${{potentialMatch.sheep_farm_id}}')">
               Contact
             </button>
           </div>
@@ -408,5 +594,143 @@ function createMatchCard(match) {{
   }});
   
   card.innerHTML = `
-    <div class="p-4
-(Content truncated due to size limit. Use line ranges to read in chunks)
+    <div class="p-4">
+      <div class="flex justify-between items-start">
+        <div>
+          <h3 class="text-xl font-bold mb-1">${{match.solar_park_name}}</h3>
+          <p class="text-sm text-gray-600">${{match.region || 'Region not specified'}}, ${{match.country}}</p>
+        </div>
+        <span class="bg-blue-100 text-blue-800 text-xs font-medium px-2.5 py-0.5 rounded">${{solarPark.total_hectares || '?'}} hectares</span>
+      </div>
+      <p class="text-sm text-gray-500 mt-2">${{match.potential_matches.length}} shepherds within reach</p>
+    </div>
+    ${{matchesHtml}}
+  `;
+  
+  return card;
+}}
+
+// Show the matches of one solar park
+function viewSolarParkMatches(parkId) {{
+  showTab('matches');
+  const container = document.getElementById('matches-container');
+  container.innerHTML = '';
+  
+  const match = matchesByParkId.get(parkId);
+  if (!match) {{
+    container.innerHTML = '<p class="text-center text-gray-500 my-8">No shepherds found near this solar park.</p>';
+    return;
+  }}
+  container.appendChild(createMatchCard(match));
+}}
+
+// Show the solar parks matched with one sheep farm
+function viewSheepFarmMatches(farmId) {{
+  showTab('matches');
+  const container = document.getElementById('matches-container');
+  container.innerHTML = '';
+  
+  const farmMatches = matchesByFarmId.get(farmId) || [];
+  
+  if (farmMatches.length === 0) {{
+    container.innerHTML = '<p class="text-center text-gray-500 my-8">No solar parks found near this sheep farm.</p>';
+    return;
+  }}
+  farmMatches.forEach(match => container.appendChild(createMatchCard(match)));
+}}
+
+// Filter cards by country, region and search text
+function filterCards(prefix) {{
+  const country = document.getElementById(`${{prefix}}-country-filter`).value;
+  const region = document.getElementById(`${{prefix}}-region-filter`).value;
+  const search = document.getElementById(`${{prefix}}-search`).value.toLowerCase();
+  
+  document.querySelectorAll(`#${{prefix}}s-container > div`).forEach(card => {{
+    const visible = (!country || card.getAttribute('data-country') === country)
+      && (!region || card.getAttribute('data-region') === region)
+      && (!search || card.textContent.toLowerCase().includes(search));
+    card.classList.toggle('hidden', !visible);
+  }});
+}}
+
+function filterSolarParks() {{
+  updateRegionFilter('solar-park');
+  filterCards('solar-park');
+}}
+
+function filterSheepFarms() {{
+  updateRegionFilter('sheep-farm');
+  filterCards('sheep-farm');
+}}
+
+// Fill the region filter with the regions of the selected country
+function updateRegionFilter(prefix) {{
+  const data = prefix === 'solar-park' ? solarParksData : sheepFarmsData;
+  const country = document.getElementById(`${{prefix}}-country-filter`).value;
+  const regionFilter = document.getElementById(`${{prefix}}-region-filter`);
+  const selected = regionFilter.value;
+  
+  const regions = [...new Set(data
+    .filter(item => !country || item.country === country)
+    .map(item => item.region)
+    .filter(Boolean))].sort();
+  
+  regionFilter.innerHTML = '<option value="">All regions</option>';
+  regions.forEach(region => {{
+    const option = document.createElement('option');
+    option.value = region;
+    option.textContent = region;
+    regionFilter.appendChild(option);
+  }});
+  regionFilter.value = regions.includes(selected) ? selected : '';
+}}
+
+// Open the matches tab
+function showMatchFinder() {{
+  showTab('matches');
+}}
+
+// Start contact between a solar park and a shepherd
+function initiateContact(parkId, farmId) {{
+  const park = solarParksById.get(parkId);
+  const farm = sheepFarmsById.get(farmId);
+  const subject = encodeURIComponent(`Grazing partnership: ${{park.name}}`);
+  const body = encodeURIComponent(
+    `Hello ${{farm.name}},\n\nWe would like to discuss sheep grazing at ${{park.name}} (${{park.location}}).\n`
+  );
+  window.location.href = `/contact?subject=${{subject}}&body=${{body}}`;
+}}
+
+// Display statistics
+function displayStatistics() {{
+  document.getElementById('solar-parks-count').textContent = directoryStats.solar_parks_count;
+  document.getElementById('sheep-farms-count').textContent = directoryStats.sheep_farms_count;
+  document.getElementById('matches-count').textContent = directoryStats.matches_count;
+}}
+
+// Handlers referenced from inline onclick attributes must be global
+window.viewSolarParkMatches = viewSolarParkMatches;
+window.viewSheepFarmMatches = viewSheepFarmMatches;
+window.initiateContact = initiateContact;
+
+document.addEventListener('DOMContentLoaded', initDirectory);
+""".format(timestamp=stats['timestamp'], stats=json.dumps(stats, indent=2, ensure_ascii=False)))
+    
+    return stats
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create the JavaScript files of the Ombaa directory.")
+    parser.add_argument("--radius", type=float, default=50, help="match radius in km (default: %(default)s)")
+    parser.add_argument("--top-k", type=int, help="keep only the K nearest sheep farms per solar park")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="matching processes; not with --top-k, which runs in one (default: %(default)s)")
+    parser.add_argument("--delta", help="match_table.py delta to apply to the previous matches-data.js")
+    args = parser.parse_args()
+    if args.top_k is not None and args.top_k < 1:
+        parser.error("--top-k must be at least 1")
+    if args.top_k is not None and args.workers > 1:
+        parser.error("--top-k cannot be combined with --workers above 1")
+    
+    stats = create_integrated_directory_js(args.radius, args.top_k, args.workers, args.delta)
+    print(f"Integrated directory created with {stats['solar_parks_count']} solar parks, "
+          f"{stats['sheep_farms_count']} sheep farms and {stats['matches_count']} solar parks with matches")
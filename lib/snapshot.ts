@@ -0,0 +1,165 @@
+import fs from 'fs';
+import path from 'path';
+
+// Columnar snapshot written by snapshot.py: see that module for the layout
+const MAGIC = 'OMBAASNP';
+const FORMAT_VERSION = 3;
+const ALIGNMENT = 8;
+
+export const SNAPSHOT_FILE = 'ombaa_snapshot.bin';
+
+interface ColumnEntry {
+  dtype: '<f8' | '<i4' | 'u1';
+  offset: number;
+}
+
+interface StringEntry {
+  offsets: number;
+  data: number;
+  size: number;
+}
+
+interface TableEntry {
+  count: number;
+  columns: Record<string, ColumnEntry>;
+  strings: Record<string, StringEntry>;
+}
+
+// Combined file a table was built from: [path, size in bytes, mtime in nanoseconds as a decimal string]
+type SourceFingerprint = [string, number, string];
+
+interface SnapshotHeader {
+  version: number;
+  countries: string[];
+  tables: Record<string, TableEntry>;
+  sources: Record<string, SourceFingerprint>;
+}
+
+export type Column = Float64Array | Int32Array | Uint8Array;
+
+export interface SnapshotTable {
+  count: number;
+  columns: Record<string, Column>;
+  string(name: string, index: number): string;
+  strings(name: string): string[];
+}
+
+export interface Snapshot {
+  countries: string[];
+  tables: Record<string, SnapshotTable>;
+  sources: Record<string, SourceFingerprint>;
+}
+
+const decoder = new TextDecoder('utf-8');
+
+// Decoded snapshots by file path, with the size and mtime of the file they were read from
+const cache = new Map<string, { size: bigint; mtimeNs: bigint; snapshot: Snapshot }>();
+
+function view(buffer: ArrayBuffer, entry: ColumnEntry, offset: number, count: number): Column {
+  if (entry.dtype === '<f8') return new Float64Array(buffer, offset, count);
+  if (entry.dtype === '<i4') return new Int32Array(buffer, offset, count);
+  return new Uint8Array(buffer, offset, count);
+}
+
+function readTable(buffer: ArrayBuffer, base: number, entry: TableEntry): SnapshotTable {
+  const columns: Record<string, Column> = {};
+  for (const [name, column] of Object.entries(entry.columns)) {
+    columns[name] = view(buffer, column, base + column.offset, entry.count);
+  }
+
+  const stringTables: Record<string, { offsets: Uint32Array; data: Uint8Array }> = {};
+  for (const [name, column] of Object.entries(entry.strings)) {
+    stringTables[name] = {
+      offsets: new Uint32Array(buffer, base + column.offsets, entry.count + 1),
+      data: new Uint8Array(buffer, base + column.data, column.size),
+    };
+  }
+
+  return {
+    count: entry.count,
+    columns,
+    string(name: string, index: number): string {
+      const { offsets, data } = stringTables[name];
+      return decoder.decode(data.subarray(offsets[index], offsets[index + 1]));
+    },
+    strings(name: string): string[] {
+      const { offsets, data } = stringTables[name];
+      const result: string[] = [];
+      for (let i = 0; i < entry.count; i++) {
+        result.push(decoder.decode(data.subarray(offsets[i], offsets[i + 1])));
+      }
+      return result;
+    },
+  };
+}
+
+/**
+ * Read the snapshot in the project root, or null if there is none (server-side only).
+ * The file is read once and every column is a typed-array view into that buffer.
+ * The decoded snapshot is kept until the file's size or mtime changes.
+ */
+export function readSnapshot(fileName: string = SNAPSHOT_FILE): Snapshot | null {
+  const filePath = path.join(process.cwd(), fileName);
+  if (!fs.existsSync(filePath)) {
+    cache.delete(filePath);
+    return null;
+  }
+
+  const stat = fs.statSync(filePath, { bigint: true });
+  const cached = cache.get(filePath);
+  if (cached && cached.size === stat.size && cached.mtimeNs === stat.mtimeNs) return cached.snapshot;
+
+  const snapshot = decodeSnapshot(filePath, fs.readFileSync(filePath));
+  cache.set(filePath, { size: stat.size, mtimeNs: stat.mtimeNs, snapshot });
+  return snapshot;
+}
+
+function decodeSnapshot(filePath: string, file: Buffer): Snapshot {
+  // Typed arrays need aligned offsets; small Buffers may sit at any offset in a shared pool
+  const aligned = file.byteOffset % ALIGNMENT === 0;
+  const buffer = (aligned
+    ? file.buffer
+    : file.buffer.slice(file.byteOffset, file.byteOffset + file.byteLength)) as ArrayBuffer;
+  const start = aligned ? file.byteOffset : 0;
+
+  if (decoder.decode(new Uint8Array(buffer, start, MAGIC.length)) !== MAGIC) {
+    throw new Error(`${filePath} is not an Ombaa snapshot`);
+  }
+  const headerSize = new DataView(buffer, start + MAGIC.length, 4).getUint32(0, true);
+  const prefixSize = MAGIC.length + 4 + headerSize;
+  const header: SnapshotHeader = JSON.parse(
+    decoder.decode(new Uint8Array(buffer, start + MAGIC.length + 4, headerSize))
+  );
+  if (header.version !== FORMAT_VERSION) {
+    throw new Error(`${filePath} has snapshot format ${header.version}, expected ${FORMAT_VERSION}`);
+  }
+
+  const base = start + prefixSize + ((ALIGNMENT - (prefixSize % ALIGNMENT)) % ALIGNMENT);
+  const tables: Record<string, SnapshotTable> = {};
+  for (const [name, entry] of Object.entries(header.tables)) {
+    tables[name] = readTable(buffer, base, entry);
+  }
+
+  return { countries: header.countries, tables, sources: header.sources };
+}
+
+/**
+ * Whether a snapshot table was built from a combined file as it is now (server-side only).
+ * Only size and mtime are compared, since the app may see the file under another path than
+ * snapshot.py did; a snapshot is not stale against a file that is not there.
+ */
+export function isSourceCurrent(snapshot: Snapshot, table: string, filePath: string): boolean {
+  if (!fs.existsSync(filePath)) return true;
+  const source = snapshot.sources[table];
+  if (!source) return false;
+  const stat = fs.statSync(filePath, { bigint: true });
+  return BigInt(source[1]) === stat.size && source[2] === stat.mtimeNs.toString();
+}
+
+/**
+ * Country name of every row of a snapshot table, decoded from its country code column.
+ */
+export function tableCountries(snapshot: Snapshot, table: string): string[] {
+  const codes = snapshot.tables[table].columns.country as Uint8Array;
+  return Array.from(codes, code => snapshot.countries[code]);
+}
@@ -1,5 +1,6 @@
 import fs from 'fs';
 import path from 'path';
+import { isSourceCurrent, readSnapshot, tableCountries } from './snapshot';
 
 // MVP countries - only show these in the public API
 const MVP_COUNTRIES = ['Netherlands', 'Belgium'];
@@ -28,16 +29,22 @@ export interface AllStats {
   byCountry: Record<string, CountryStats>;
 }
 
-function loadSolarParksData(): any[] {
-  const filePath = path.join(process.cwd(), 'processed_solar_parks_combined.json');
+// Country of every record: from the columnar snapshot when it is up to date, else from the JSON file
+function loadCountries(table: 'solar_parks' | 'sheep_farms', fileName: string): string[] {
+  const filePath = path.join(process.cwd(), fileName);
+  const snapshot = readSnapshot();
+  if (snapshot && isSourceCurrent(snapshot, table, filePath)) return tableCountries(snapshot, table);
+
   const data = fs.readFileSync(filePath, 'utf8');
-  return JSON.parse(data);
+  return JSON.parse(data).map((record: { country: string }) => record.country);
 }
 
-function loadSheepFarmsData(): any[] {
-  const filePath = path.join(process.cwd(), 'processed_sheep_farms_combined.json');
-  const data = fs.readFileSync(filePath, 'utf8');
-  return JSON.parse(data);
+function loadSolarParkCountries(): string[] {
+  return loadCountries('solar_parks', 'processed_solar_parks_combined.json');
+}
+
+function loadSheepFarmCountries(): string[] {
+  return loadCountries('sheep_farms', 'processed_sheep_farms_combined.json');
 }
 
 function normalizeCountry(country: string): string {
@@ -50,18 +57,18 @@ function normalizeCountry(country: string): string {
  * Returns real counts from data files regardless of MVP status
  */
 export function getCountryStats(country: string): CountryStats {
-  const solarParks = loadSolarParksData();
-  const sheepFarms = loadSheepFarmsData();
+  const solarParks = loadSolarParkCountries();
+  const sheepFarms = loadSheepFarmCountries();
   
   const normalizedCountry = normalizeCountry(country);
   const isMvp = MVP_COUNTRIES.includes(normalizedCountry);
   
   // Get actual counts for the country (not filtered by MVP)
   const countrySolarParks = solarParks.filter(
-    park => normalizeCountry(park.country) === normalizedCountry
+    parkCountry => normalizeCountry(parkCountry) === normalizedCountry
   );
   const countrySheepFarms = sheepFarms.filter(
-    farm => normalizeCountry(farm.country) === normalizedCountry
+    farmCountry => normalizeCountry(farmCountry) === normalizedCountry
   );
 
   return {
@@ -77,13 +84,13 @@ export function getCountryStats(country: string): CountryStats {
  * Use mvpOnly=false to get stats for all countries
  */
 export function getAllStats(mvpOnly: boolean = true): AllStats {
-  const solarParks = loadSolarParksData();
-  const sheepFarms = loadSheepFarmsData();
+  const solarParks = loadSolarParkCountries();
+  const sheepFarms = loadSheepFarmCountries();
   
   // Get unique countries
   const allCountries = [...new Set([
-    ...solarParks.map(p => normalizeCountry(p.country)),
-    ...sheepFarms.map(f => normalizeCountry(f.country)),
+    ...solarParks.map(normalizeCountry),
+    ...sheepFarms.map(normalizeCountry),
   ])];
   
   const countries = mvpOnly 
@@ -95,8 +102,8 @@ export function getAllStats(mvpOnly: boolean = true): AllStats {
   let totalFarms = 0;
   
   for (const country of countries) {
-    const countryParks = solarParks.filter(p => normalizeCountry(p.country) === country).length;
-    const countryFarms = sheepFarms.filter(f => normalizeCountry(f.country) === country).length;
+    const countryParks = solarParks.filter(c => normalizeCountry(c) === country).length;
+    const countryFarms = sheepFarms.filter(c => normalizeCountry(c) === country).length;
     const isMvp = MVP_COUNTRIES.includes(country);
     
     byCountry[country] = {
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Incremental park-farm match maintenance for the Ombaa directory.
+A MatchTable keeps the parks and farms it last matched (record ID -> location
+and the fields a match shows), the matches of every park, and a grid index
+(spatial_index) of the parks and of the farms, and is saved as JSON between
+runs. update() takes the added, changed and removed records of an ingest and
+only re-measures the affected neighbourhoods: the changed parks themselves,
+and the parks within the match radius of a changed farm's old or new location.
+It returns the delta, the match entries that changed and the parks that lost
+all their matches, in the format of integrate_directory's matches.
+
+Every saved table gets a new revision. The delta file names the revision it
+leads to and the one it starts from, and integrate_directory --delta applies it
+to a matches-data.js at that starting revision instead of matching from scratch.
+
+Parks come out in the order of the combined files (combine_stream.merge_key,
+then ID) and the farms of a park by distance, then in that order, so the
+table's matches equal those integrate_directory computes from scratch over
+the combined files; only records with equal merge keys may swap places.
+"""
+
+import argparse
+import json
+import os
+import time
+import uuid
+from collections import namedtuple
+
+import combine_stream
+import dedup
+import ingest_engine
+import integrate_directory
+import snapshot
+import spatial_index
+
+# Bump when the saved layout changes; a table of another version is rebuilt
+TABLE_VERSION = 2
+
+MATCH_TABLE_FILE = "/home/ubuntu/ombaa_matches.json"
+DELTA_FILE = "/home/ubuntu/ombaa_matches_delta.json"
+
+# What matching and a match entry read from a record; order is its merge_key plus its ID
+Place = namedtuple("Place", ["latitude", "longitude", "name", "country", "region", "order"])
+
+
+def _place(record):
+    coordinates = record.get('coordinates') or {}
+    return Place(coordinates.get('latitude'), coordinates.get('longitude'), record.get('name'),
+                 record.get('country'), record.get('region'), (*combine_stream.merge_key(record), record['id']))
+
+
+def _point(place):
+    return integrate_directory._valid_point(place.latitude, place.longitude)
+
+
+class MatchTable:
+    """Parks, farms and the farms within max_distance km of every park, keyed by record ID."""
+
+    def __init__(self, max_distance=50):
+        self.max_distance = max_distance
+        self.parks = {}  # ID -> Place
+        self.farms = {}
+        self.matches = {}  # park ID -> [(farm ID, distance in km rounded to 0.1)], parks with a match only
+        self.revision = None  # set by save()
+        # Cells about one radius across, as in integrate_directory
+        cell_km = max(max_distance, 1)
+        self._park_index = spatial_index.GridIndex([], cell_km)
+        self._farm_index = spatial_index.GridIndex([], cell_km)
+
+    @classmethod
+    def build(cls, solar_parks, sheep_farms, max_distance=50):
+        """A table of all records, matched in one pass of the block matcher."""
+        table = cls(max_distance)
+        for record in solar_parks:
+            table._set(table.parks, table._park_index, dedup.with_record_id(record))
+        for record in sheep_farms:
+            table._set(table.farms, table._farm_index, dedup.with_record_id(record))
+
+        park_ids = list(table.parks)
+        # Farms in their order, so that the matcher breaks distance ties the way _measure() does
+        farm_ids = sorted(table.farms, key=lambda farm_id: table.farms[farm_id].order)
+        point_matches = integrate_directory._match_points([_point(table.parks[i]) for i in park_ids],
+                                                          [_point(table.farms[i]) for i in farm_ids], max_distance)
+        for park_index, pairs in point_matches:
+            table.matches[park_ids[park_index]] = [(farm_ids[farm_index], distance) for farm_index, distance in pairs]
+        return table
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get("version") != TABLE_VERSION:
+            raise ValueError(f"{path} has match table version {data.get('version')}, expected {TABLE_VERSION}")
+        table = cls(data["max_distance"])
+        for places, index, rows in ((table.parks, table._park_index, data["parks"]),
+                                    (table.farms, table._farm_index, data["farms"])):
+            for record_id, row in rows.items():
+                place = Place(*row[:-1], tuple(row[-1]))
+                places[record_id] = place
+                index.add(record_id, _point(place))
+        table.matches = {park_id: [tuple(pair) for pair in pairs] for park_id, pairs in data["matches"].items()}
+        table.revision = data["revision"]
+        return table
+
+    def save(self, path):
+        """Save the table under a new revision."""
+        self.revision = uuid.uuid4().hex
+        data = {"version": TABLE_VERSION, "revision": self.revision, "max_distance": self.max_distance,
+                "parks": self.parks, "farms": self.farms, "matches": self.matches}
+        temp_file = path + ".tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_file, path)
+
+    def _set(self, places, index, record):
+        old = places.get(record['id'])
+        if old is not None:
+            index.remove(record['id'], _point(old))
+        place = _place(record)
+        places[record['id']] = place
+        index.add(record['id'], _point(place))
+
+    def _remove(self, places, index, record_id):
+        old = places.pop(record_id, None)
+        if old is not None:
+            index.remove(record_id, _point(old))
+
+    def _parks_near(self, place):
+        """Park ID -> distance in km of the parks within the match radius of a location."""
+        point = _point(place) if place is not None else None
+        if point is None:
+            return {}
+        near = {}
+        for park_id in self._park_index.candidates(point[0], point[1], self.max_distance):
+            park = _point(self.parks[park_id])
+            distance = integrate_directory.calculate_distance(park[0], park[1], point[0], point[1])
+            if distance <= self.max_distance:
+                near[park_id] = distance
+        return near
+
+    def _measure(self, park_id):
+        """The matches of one park, measured against the farms around it."""
+        point = _point(self.parks[park_id])
+        if point is None:
+            return []
+        farms = self.farms
+        pairs = []
+        for farm_id in self._farm_index.candidates(point[0], point[1], self.max_distance):
+            farm = _point(farms[farm_id])
+            distance = integrate_directory.calculate_distance(point[0], point[1], farm[0], farm[1])
+            if distance <= self.max_distance:
+                pairs.append((farm_id, round(distance, 1)))
+        pairs.sort(key=lambda m: (m[1], farms[m[0]].order))
+        return pairs
+
+    def _entry(self, park_id):
+        park = self.parks[park_id]
+        return {
+            "solar_park_id": park_id,
+            "solar_park_name": park.name,
+            "country": park.country,
+            "region": park.region,
+            "potential_matches": [{
+                "sheep_farm_id": farm_id,
+                "sheep_farm_name": self.farms[farm_id].name,
+                "distance_km": distance
+            } for farm_id, distance in self.matches[park_id]]
+        }
+
+    def match_entries(self):
+        """All matches, as integrate_directory.find_potential_matches returns them."""
+        return [self._entry(park_id) for park_id in sorted(self.matches, key=lambda i: self.parks[i].order)]
+
+    def changes(self, solar_parks, sheep_farms):
+        """update() arguments turning the table into one of these records: what is new or changed, and what is gone.
+
+        A record counts as changed when a field of its Place differs.
+        """
+        def diff(records, places):
+            records = [dedup.with_record_id(record) for record in records]
+            ids = {record['id'] for record in records}
+            return ([record for record in records if places.get(record['id']) != _place(record)],
+                    [record_id for record_id in places if record_id not in ids])
+
+        parks, removed_parks = diff(solar_parks, self.parks)
+        farms, removed_farms = diff(sheep_farms, self.farms)
+        return {"parks": parks, "farms": farms, "removed_parks": removed_parks, "removed_farms": removed_farms}
+
+    def update(self, parks=(), farms=(), removed_parks=(), removed_farms=()):
+        """Apply added or changed records and removed IDs; return {"upserted": [match entries], "removed": [park IDs]}."""
+        parks = [dedup.with_record_id(record) for record in parks]
+        farms = [dedup.with_record_id(record) for record in farms]
+
+        # Added and changed parks are measured afresh; the others only lose or gain the changed farms,
+        # those around a farm's old location and those around its new one
+        measured = {record['id'] for record in parks}
+        lost = {farm_id: self._parks_near(self.farms.get(farm_id))
+                for farm_id in [*removed_farms, *(record['id'] for record in farms)]}
+        gained = {record['id']: self._parks_near(_place(record)) for record in farms}
+        affected = measured | set(removed_parks)
+        for near in [*lost.values(), *gained.values()]:
+            affected.update(near)
+        before = {park_id: self._entry(park_id) for park_id in affected if park_id in self.matches}
+
+        for farm_id, near in lost.items():
+            for park_id in near:
+                self.matches[park_id] = [pair for pair in self.matches[park_id] if pair[0] != farm_id]
+        for farm_id in removed_farms:
+            self._remove(self.farms, self._farm_index, farm_id)
+        for record in farms:
+            self._set(self.farms, self._farm_index, record)
+        for park_id in removed_parks:
+            self._remove(self.parks, self._park_index, park_id)
+            self.matches.pop(park_id, None)
+        for record in parks:
+            self._set(self.parks, self._park_index, record)
+            self.matches[record['id']] = self._measure(record['id'])
+        for farm_id, near in gained.items():
+            for park_id, distance in near.items():
+                if park_id not in measured and park_id in self.parks:
+                    self.matches.setdefault(park_id, []).append((farm_id, round(distance, 1)))
+
+        after = {}
+        farm_places = self.farms
+        for park_id in affected:
+            pairs = self.matches.get(park_id)
+            if not pairs:
+                self.matches.pop(park_id, None)
+                continue
+            if park_id not in measured:
+                pairs.sort(key=lambda m: (m[1], farm_places[m[0]].order))
+            after[park_id] = self._entry(park_id)
+
+        return {
+            "upserted": [after[park_id] for park_id in sorted(after, key=lambda i: self.parks[i].order)
+                         if after[park_id] != before.get(park_id)],
+            "removed": sorted(park_id for park_id in before if park_id not in after)
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bring the Ombaa match table up to date with the combined datasets.")
+    parser.add_argument("--solar-parks", default=snapshot.SOLAR_PARKS_FILE,
+                        help="combined solar parks (default: %(default)s)")
+    parser.add_argument("--sheep-farms", default=snapshot.SHEEP_FARMS_FILE,
+                        help="combined sheep farms (default: %(default)s)")
+    parser.add_argument("--table", default=MATCH_TABLE_FILE, help="match table (default: %(default)s)")
+    parser.add_argument("--delta", default=DELTA_FILE, help="delta of this run (default: %(default)s)")
+    parser.add_argument("--radius", type=float, default=50, help="match radius in km (default: %(default)s)")
+    parser.add_argument("--rebuild", action="store_true", help="match everything from scratch")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    solar_parks = list(ingest_engine.iter_records(args.solar_parks))
+    sheep_farms = list(ingest_engine.iter_records(args.sheep_farms))
+
+    table = None
+    if args.rebuild:
+        reason = "--rebuild given"
+    elif not os.path.exists(args.table):
+        reason = f"no match table at {args.table}"
+    else:
+        try:
+            table = MatchTable.load(args.table)
+        except ValueError as error:
+            reason = str(error)
+        # A table of another radius has to be rebuilt
+        if table is not None and table.max_distance != args.radius:
+            reason = f"{args.table} was matched within {table.max_distance} km, not {args.radius} km"
+            table = None
+
+    rebuilt = table is None
+    base_revision = None if rebuilt else table.revision
+    if rebuilt:
+        print(f"Rebuilding the match table: {reason}")
+        table = MatchTable.build(solar_parks, sheep_farms, args.radius)
+        changes = {"parks": table.parks, "farms": table.farms, "removed_parks": [], "removed_farms": []}
+        delta = {"upserted": table.match_entries(), "removed": []}
+    else:
+        changes = table.changes(solar_parks, sheep_farms)
+        delta = table.update(**changes)
+    table.save(args.table)
+
+    counts = {name: len(records) for name, records in changes.items()}
+    with open(args.delta, 'w', encoding='utf-8') as f:
+        json.dump({
+            "rebuilt": rebuilt,
+            "rebuild_reason": reason if rebuilt else None,
+            "max_distance": table.max_distance,
+            "revision": table.revision,
+            "base_revision": base_revision,
+            "records": counts,
+            "matches": delta
+        }, f, indent=2, ensure_ascii=False)
+
+    elapsed = time.perf_counter() - start
+    print(f"{counts['parks']} parks and {counts['farms']} farms added or changed, "
+          f"{counts['removed_parks']} parks and {counts['removed_farms']} farms removed: "
+          f"{len(delta['upserted'])} match entries updated, {len(delta['removed'])} removed in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Numeric entity extraction for the Ombaa ingest scripts.
+One regex, compiled at import, finds every area (ha, hectare, Hektar, acre),
+capacity (MW, MWp) and flock size (sheep, moutons, schapen, Schafe, ...) in a
+single case-insensitive pass over the text and normalises the units.
+"""
+
+import re
+from bisect import bisect_right
+from collections import namedtuple
+
+# kind is "area" (value in hectares), "power" (value in MW) or "flock" (number of animals)
+Quantity = namedtuple("Quantity", ["kind", "value", "unit", "start"])
+
+HECTARES_PER_ACRE = 0.404686
+
+AREA_UNITS = {
+    "ha": 1.0,
+    "hectare": 1.0,
+    "hectares": 1.0,
+    "hectaren": 1.0,
+    "hektar": 1.0,
+    "hektare": 1.0,
+    "hektaren": 1.0,
+    "acre": HECTARES_PER_ACRE,
+    "acres": HECTARES_PER_ACRE
+}
+
+POWER_UNITS = {"mw", "mwp", "megawatt", "megawatts"}
+
+# Animals counted after the number ("300 sheep", "120 Schafe")
+FLOCK_NOUNS = ["sheep", "ewes", "animals", "moutons", "brebis", "schapen", "ooien", "schafe", "mutterschafe"]
+
+# Phrases followed by the count ("flock of 300", "troupeau de 200")
+FLOCK_PHRASES = [r"flock\s+of", r"troupeau\s+de", r"herde\s+von", r"kudde\s+van"]
+
+
+def _alternation(words):
+    # Longest first, so "hectares" is preferred over "ha"
+    return "|".join(sorted((re.escape(word) for word in words), key=len, reverse=True))
+
+
+_NUMBER = r"(?<![\w.,])\d+(?:[.,]\d+)?"
+
+_QUANTITY_PATTERN = re.compile(
+    rf"(?P<area>{_NUMBER})\s*(?P<area_unit>{_alternation(AREA_UNITS)})\b"
+    rf"|(?P<power>{_NUMBER})\s*(?P<power_unit>{_alternation(POWER_UNITS)})\b"
+    rf"|(?P<flock>(?<![\w.,])(?:\d{{1,3}}(?:[.,]\d{{3}})+|\d+))[\s-](?P<flock_noun>{_alternation(FLOCK_NOUNS)})\b"
+    rf"|\b(?:{'|'.join(FLOCK_PHRASES)})\s+(?P<flock_count>\d+)\b",
+    re.IGNORECASE
+)
+
+# Separates texts joined for a batch scan; no quantity can span it
+_BATCH_SEPARATOR = "\n\x00\n"
+
+
+def _to_float(number):
+    return float(number.replace(',', '.'))
+
+
+def _quantity(match, offset=0):
+    if match.group('area') is not None:
+        unit = match.group('area_unit').lower()
+        return Quantity("area", _to_float(match.group('area')) * AREA_UNITS[unit], unit, match.start() - offset)
+    if match.group('power') is not None:
+        return Quantity("power", _to_float(match.group('power')), match.group('power_unit').lower(),
+                        match.start() - offset)
+    if match.group('flock') is not None:
+        count = int(re.sub(r'[.,]', '', match.group('flock')))
+        return Quantity("flock", count, match.group('flock_noun').lower(), match.start() - offset)
+    return Quantity("flock", int(match.group('flock_count')), "count", match.start() - offset)
+
+
+def extract_quantities(text):
+    """Return every quantity in the text, in order of appearance, with units normalised."""
+    if not text:
+        return []
+    return [_quantity(match) for match in _QUANTITY_PATTERN.finditer(text)]
+
+
+def extract_quantities_batch(texts):
+    """Return a list of quantities per text, scanning all texts in a single regex pass."""
+    texts = [text or "" for text in texts]
+    results = [[] for _ in texts]
+    if not texts:
+        return results
+
+    starts = []
+    position = 0
+    for text in texts:
+        starts.append(position)
+        position += len(text) + len(_BATCH_SEPARATOR)
+
+    for match in _QUANTITY_PATTERN.finditer(_BATCH_SEPARATOR.join(texts)):
+        index = bisect_right(starts, match.start()) - 1
+        results[index].append(_quantity(match, starts[index]))
+
+    return results
+
+
+def first_quantity(text, kind):
+    """Value of the first quantity of the given kind in the text, or None."""
+    for quantity in extract_quantities(text):
+        if quantity.kind == kind:
+            return quantity.value
+    return None
+
+
+def extract_hectares(text):
+    """First area mentioned in the text, in hectares, or None."""
+    return first_quantity(text, "area")
+
+
+def extract_capacity_mw(text):
+    """First capacity mentioned in the text, in MW, or None."""
+    return first_quantity(text, "power")
+
+
+def extract_flock_size(text):
+    """First flock size mentioned in the text, or None."""
+    return first_quantity(text, "flock")
+
+
+def has_quantity(text):
+    """Whether the text mentions any area, capacity or flock size."""
+    return bool(text) and _QUANTITY_PATTERN.search(text) is not None
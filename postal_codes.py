@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Postal code to region resolver for the Ombaa ingest scripts.
+UK outward codes are resolved by walking a prefix trie of postcode areas
+(longest area wins, so "BT" is Northern Ireland while "B" is England); NL and
+BE numeric codes are resolved by bisecting sorted range tables.
+"""
+
+import re
+from bisect import bisect_right
+
+# UK postcode areas by region
+UK_POSTCODE_AREAS = {
+    "England": ["B", "BA", "BB", "BD", "BH", "BL", "BN", "BR", "BS", "CA", "CB", "CH", "CM", "CO", "CR",
+                "CV", "CW", "DA", "DE", "DH", "DL", "DN", "DT", "DY", "E", "EC", "EN", "EX", "FY", "GL",
+                "GU", "HA", "HD", "HG", "HP", "HR", "HU", "HX", "IG", "IP", "KT", "L", "LA", "LE", "LN",
+                "LS", "LU", "M", "ME", "MK", "N", "NE", "NG", "NN", "NR", "NW", "OL", "OX", "PE",
+                "PL", "PO", "PR", "RG", "RH", "RM", "S", "SE", "SG", "SK", "SL", "SM", "SN", "SO", "SP",
+                "SR", "SS", "ST", "SW", "SY", "TA", "TF", "TN", "TQ", "TR", "TS", "TW", "UB", "W", "WA",
+                "WC", "WD", "WF", "WN", "WR", "WS", "WV", "YO"],
+    "Scotland": ["AB", "DD", "DG", "EH", "FK", "G", "HS", "IV", "KA", "KW", "KY", "ML", "PA", "PH", "TD", "ZE"],
+    "Wales": ["CF", "LD", "LL", "NP", "SA"],
+    "Northern Ireland": ["BT"]
+}
+
+# Dutch postcode ranges by province (inclusive); approximate where a range straddles a border
+NL_POSTCODE_RANGES = [
+    (1000, 1299, "Noord-Holland"),
+    (1300, 1379, "Flevoland"),
+    (1380, 2199, "Noord-Holland"),
+    (2200, 3399, "Zuid-Holland"),
+    (3400, 3999, "Utrecht"),
+    (4000, 4199, "Gelderland"),
+    (4200, 4299, "Zuid-Holland"),
+    (4300, 4599, "Zeeland"),
+    (4600, 5299, "Noord-Brabant"),
+    (5300, 5339, "Gelderland"),
+    (5340, 5799, "Noord-Brabant"),
+    (5800, 6499, "Limburg"),
+    (6500, 7399, "Gelderland"),
+    (7400, 7799, "Overijssel"),
+    (7800, 7999, "Drenthe"),
+    (8000, 8199, "Overijssel"),
+    (8200, 8259, "Flevoland"),
+    (8260, 8299, "Overijssel"),
+    (8300, 8399, "Flevoland"),
+    (8400, 9299, "Friesland"),
+    (9300, 9499, "Drenthe"),
+    (9500, 9999, "Groningen")
+]
+
+# Belgian postcode ranges by region (inclusive)
+BE_POSTCODE_RANGES = [
+    (1000, 1299, "Brussels"),
+    (1300, 1499, "Wallonia"),
+    (1500, 3999, "Flanders"),
+    (4000, 7999, "Wallonia"),
+    (8000, 9999, "Flanders")
+]
+
+_UK_OUTWARD_PATTERN = re.compile(r'([A-Z]{1,2}\d{1,2}[A-Z]?)', re.IGNORECASE)
+_NL_POSTCODE_PATTERN = re.compile(r'(\d{4})\s*[A-Z]{2}')
+_BE_POSTCODE_PATTERN = re.compile(r'(\d{4})')
+
+# Key under which a trie node stores the region of the prefix ending there
+_REGION = ""
+
+
+def _build_trie(areas_by_region):
+    root = {}
+    for region, areas in areas_by_region.items():
+        for area in areas:
+            node = root
+            for char in area:
+                node = node.setdefault(char, {})
+            node[_REGION] = region
+    return root
+
+
+def _build_ranges(ranges):
+    # Parallel arrays for bisect: range starts, ends and regions, sorted by start
+    ranges = sorted(ranges)
+    return [start for start, _, _ in ranges], [end for _, end, _ in ranges], [region for _, _, region in ranges]
+
+
+_UK_TRIE = _build_trie(UK_POSTCODE_AREAS)
+_NL_RANGES = _build_ranges(NL_POSTCODE_RANGES)
+_BE_RANGES = _build_ranges(BE_POSTCODE_RANGES)
+
+
+def uk_region(outward_code):
+    """Region of a UK outward code ("SW1A", "BT7"), by its longest known area prefix, or None."""
+    node = _UK_TRIE
+    region = None
+    for char in (outward_code or "").upper():
+        node = node.get(char)
+        if node is None:
+            break
+        region = node.get(_REGION, region)
+    return region
+
+
+def _range_region(table, code):
+    starts, ends, regions = table
+    index = bisect_right(starts, code) - 1
+    if index >= 0 and code <= ends[index]:
+        return regions[index]
+    return None
+
+
+def nl_region(postcode):
+    """Province of a Dutch postcode (its four digits), or None."""
+    return _range_region(_NL_RANGES, int(postcode))
+
+
+def be_region(postcode):
+    """Region (Brussels, Flanders, Wallonia) of a Belgian postcode, or None."""
+    return _range_region(_BE_RANGES, int(postcode))
+
+
+def region_from_address(country_code, address):
+    """Find the postal code in an address and resolve it to a region; None if there is none or it is unknown."""
+    if not address:
+        return None
+
+    if country_code in ("UK", "GB"):
+        match = _UK_OUTWARD_PATTERN.search(address)
+        return uk_region(match.group(1)) if match else None
+    if country_code == "NL":
+        match = _NL_POSTCODE_PATTERN.search(address)
+        return nl_region(match.group(1)) if match else None
+    if country_code == "BE":
+        match = _BE_POSTCODE_PATTERN.search(address)
+        return be_region(match.group(1)) if match else None
+    return None
@@ -5,282 +5,329 @@ This script converts the raw Google Maps data for sheep farms/shepherds into a s
 suitable for the Ombaa directory database.
 """
 
-import json
+import argparse
 import os
 import re
+import time
+
+import checkpoint
+import combine_stream
+import dedup
+import dictionary_matcher
+import ingest_engine
+import numeric_extractor
+import postal_codes
+import region_boundaries
+import region_gazetteer
+import review_digest
+import run_report
+import schema_validation
+import text_fold
+
+# Per country: name, defaults used when the text mentions no flock size or breed,
+# and the raw Google Maps dataset and processed output used when run as a script
+COUNTRIES = {
+    "NL": {
+        "country": "Netherlands",
+        "flock_size": 250,
+        "breed": "Texel",
+        "input_file": "/home/ubuntu/upload/sheep_farms_netherlands.json",
+        "output_file": "/home/ubuntu/processed_sheep_farms_netherlands.json"
+    },
+    "UK": {
+        "country": "United Kingdom",
+        "flock_size": 350,
+        "breed": "Suffolk",
+        "input_file": "/home/ubuntu/upload/sheep_farms_uk.json",
+        "output_file": "/home/ubuntu/processed_sheep_farms_uk.json"
+    },
+    "FR": {
+        "country": "France",
+        "flock_size": 400,
+        "breed": "Lacaune",
+        "input_file": "/home/ubuntu/upload/sheep_farms_france.json",
+        "output_file": "/home/ubuntu/processed_sheep_farms_france.json"
+    },
+    "DE": {
+        "country": "Germany",
+        "flock_size": 300,
+        "breed": "Merino",
+        "input_file": "/home/ubuntu/upload/sheep_farms_germany.json",
+        "output_file": "/home/ubuntu/processed_sheep_farms_germany.json"
+    },
+    "BE": {
+        "country": "Belgium",
+        "flock_size": 200,
+        "breed": "Texel",
+        "input_file": "/home/ubuntu/upload/sheep_farms_belgium.json",
+        "output_file": "/home/ubuntu/processed_sheep_farms_belgium.json"
+    }
+}
+
+COMBINED_OUTPUT_FILE = "/home/ubuntu/processed_sheep_farms_combined.json"
+
+# What extract_grazing_type returns when no keyword matches
+DEFAULT_GRAZING_TYPE = "Mixed grazing"
+
+# Grazing keywords, most specific first
+GRAZING_KEYWORDS = {
+    "rotational": "Rotational grazing",
+    "rotation": "Rotational grazing",
+    "seasonal": "Seasonal grazing",
+    "continuous": "Continuous grazing",
+    "transhumance": "Transhumance",
+    "transhumanz": "Transhumance",
+    "wanderschaferei": "Mobile grazing",
+    "mobile": "Mobile grazing",
+    "nomadic": "Mobile grazing",
+    "organic": "Organic grazing",
+    "biologisch": "Organic grazing",
+    "biologique": "Organic grazing",
+    "bio": "Organic grazing",
+    "ecological": "Ecological grazing",
+    "okologisch": "Ecological grazing",
+    "conservation": "Conservation grazing",
+    "natuurbeheer": "Conservation grazing",
+    "naturschutz": "Conservation grazing",
+    "landschaftspflege": "Conservation grazing",
+    "nature": "Conservation grazing",
+    "contract": "Contract grazing",
+    "service": "Service grazing",
+}
+
+# Common sheep breeds by country, labelled with their capitalised name
+BREEDS = [
+    # English breeds
+    "suffolk", "texel", "hampshire", "dorset", "romney", "lincoln", "cotswold",
+    "leicester", "southdown", "shropshire", "oxford", "cheviot", "jacob",
+    "wensleydale", "devon", "exmoor", "dartmoor", "herdwick", "swaledale",
+    # French breeds
+    "lacaune", "mérinos", "préalpes", "charollais", "île-de-france", "berrichon",
+    "romanov", "rava", "caussenard", "bizet", "mourerous", "tarasconnais",
+    # German breeds
+    "merino", "schwarzkopf", "rhönschaf", "skudde", "rauhwolliges", "pommersches",
+    "ostfriesisches", "leineschaf", "bentheimer", "coburger", "waldschaf",
+    # Dutch breeds
+    "zwartbles", "drenthe", "veluwe", "kempisch", "fries", "schoonebeeker",
+    # Belgian breeds
+    "ardennais", "entre-sambre-et-meuse", "lakens", "vlaams", "houtlandschaap",
+]
+
+# Generic words for "breed"; they only count when no breed is named, and the words after them are the breed
+GENERIC_BREED_TERMS = ["breed", "breeds", "race", "races", "ras", "rasse", "rassen"]
+
+# Breed and grazing type are labelled in one pass over the farm text. Breeds and grazing terms
+# also match inside Dutch and German compounds ("rhonschafen", "biologische"); the generic
+# breed words only match whole words, since the breed is read from the words after them
+_FARM_TERMS = dictionary_matcher.DictionaryMatcher({
+    "breed": {breed: breed.title() for breed in BREEDS},
+    "breed_word": dict.fromkeys(GENERIC_BREED_TERMS),
+    "grazing_type": GRAZING_KEYWORDS
+}, compounds=["breed", "grazing_type"])
+
+# Collects the counts of process_sheep_farm calls made without a report
+_DISCARDED_REPORT = run_report.RunReport("discarded")
 
 def extract_flock_size_from_text(text):
     """Extract flock size information from text if available."""
-    if not text:
+    # "300 sheep", "flock of 300", "troupeau de 200", "120 Schafe", ...
+    return numeric_extractor.extract_flock_size(text)
+
+def _grazing_type(hits):
+    hit = hits.get("grazing_type")
+    return hit.label if hit else DEFAULT_GRAZING_TYPE
+
+def _breed(text, hits):
+    hit = hits.get("breed")
+    if hit is not None:
+        return hit.label
+    hit = hits.get("breed_word")
+    if hit is None:
         return None
     
-    # Look for patterns like "X sheep", "X animals", "flock of X"
-    patterns = [
-        r'(\d+)[\s-]sheep',
-        r'(\d+)[\s-]animals',
-        r'(\d+)[\s-]ewes',
-        r'flock of (\d+)',
-        r'troupeau de (\d+)',
-        r'(\d+) moutons',
-        r'(\d+) schapen',
-        r'(\d+) Schafe',
-        r'Herde von (\d+)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text.lower())
-        if match:
-            return int(match.group(1))
-    
+    # A generic term ("breed", "race", "rasse", ...): the breed is the words that follow it
+    match = re.search(r'\b' + re.escape(hit.term) + r'\b:?\s+([a-z][a-z\s]*)', text_fold.fold(text))
+    if match:
+        # Limit to first 30 chars and capitalize
+        return match.group(1).strip()[:30].title()
     return None
 
 def extract_grazing_type(text):
     """Extract grazing type information if available."""
-    if not text:
-        return "Mixed grazing"  # Default value
+    return _grazing_type(_FARM_TERMS.match(text))
+
+def extract_breed_from_text(text):
+    """Extract sheep breed information if available."""
+    return _breed(text, _FARM_TERMS.match(text))
+
+def extract_region_from_address(address, city, country_code):
+    """Extract region information from address based on country."""
+    if not address and not city:
+        return ""
     
-    grazing_keywords = {
-        "rotational": "Rotational grazing",
-        "rotation": "Rotational grazing",
-        "seasonal": "Seasonal grazing",
-        "continuous": "Continuous grazing",
-        "mobile": "Mobile grazing",
-        "nomadic": "Mobile grazing",
-        "transhumance": "Transhumance",
-        "organic": "Organic grazing",
-        "bio": "Organic grazing",
-        "ecological": "Ecological grazing",
-        "conservation": "Conservation grazing",
-        "nature": "Conservation grazing",
-        "contract": "Contract grazing",
-        "service": "Service grazing",
-    }
+    region = region_gazetteer.match_region(country_code, address, city, "sheep_farms")
+    if region:
+        return region
     
-    text_lower = text.lower()
-    for keyword, grazing_type in grazing_keywords.items():
-        if keyword in text_lower:
-            return grazing_type
+    # Extract postal code and try to map to region
+    region = postal_codes.region_from_address(country_code, address)
+    if region:
+        return region
     
-    return "Mixed grazing"  # Default value
+    return ""  # Return empty string if no region found
 
-def extract_breed_from_text(text):
-    """Extract sheep breed information if available."""
-    if not text:
+def _compact_item(item):
+    """Keep only the fields process_sheep_farm reads, with the reviews reduced to a small digest."""
+    return {
+        "place_id": item.get('placeId'),
+        "title": item.get('title', ''),
+        "review_texts": review_digest.digest_reviews(item.get('reviews')),
+        "description": item.get('description'),
+        "address": item.get('address', ''),
+        "city": item.get('city', ''),
+        "phone": item.get('phone'),
+        "website": item.get('website'),
+        "location": item.get('location')
+    }
+
+def process_sheep_farm(item, country_code, report=None):
+    """Convert one compacted Google Places item into an Ombaa sheep farm record, or None if it has no name.
+    
+    With a RunReport the time of each extraction stage and the outcome of each
+    extractor are recorded in it.
+    """
+    if report is None:
+        report = _DISCARDED_REPORT
+    if not item.get('title'):
+        report.count("title", "missing")
         return None
+    report.count("title", "present")
     
-    # Common sheep breeds by country
-    breeds = [
-        # English breeds
-        "suffolk", "texel", "hampshire", "dorset", "romney", "lincoln", "cotswold", 
-        "leicester", "southdown", "shropshire", "oxford", "cheviot", "jacob", 
-        "wensleydale", "devon", "exmoor", "dartmoor", "herdwick", "swaledale",
-        # French breeds
-        "lacaune", "mérinos", "préalpes", "charollais", "île-de-france", "berrichon",
-        "romanov", "rava", "caussenard", "bizet", "mourerous", "tarasconnais",
-        # German breeds
-        "merino", "schwarzkopf", "rhönschaf", "skudde", "rauhwolliges", "pommersches",
-        "ostfriesisches", "leineschaf", "bentheimer", "coburger", "waldschaf",
-        # Dutch breeds
-        "zwartbles", "drenthe", "veluwe", "kempisch", "fries", "schoonebeeker",
-        # Belgian breeds
-        "ardennais", "entre-sambre-et-meuse", "lakens", "vlaams", "houtlandschaap",
-        # Generic terms
-        "breed", "race", "ras", "rasse"
-    ]
+    defaults = COUNTRIES[country_code]
+    timer = report.timer()
     
-    text_lower = text.lower()
+    # Title, description and the most informative reviews all describe the farm
+    text = " ".join(filter(None, [item['title'], item.get('description'), *item['review_texts']]))
     
-    # First look for specific breed mentions
-    for breed in breeds:
-        if breed in text_lower:
-            # Capitalize breed name
-            return breed.title()
+    # Region from the admin boundaries when the item has coordinates, else from the address text
+    location = item.get('location') or {}
+    region = region_boundaries.region_at(location.get('lat'), location.get('lng'), country_code)
+    region_source = "boundaries"
+    if not region:
+        region = extract_region_from_address(item.get('address', ''), item.get('city', ''), country_code)
+        region_source = "address" if region else "missing"
+    timer.lap("extract_region")
+    report.count("region", region_source)
     
-    # Look for breed mentions with the word "breed" or similar
-    breed_patterns = [
-        r'breed[s]?:?\s+([A-Za-z\s]+)',
-        r'race[s]?:?\s+([A-Za-z\s]+)',
-        r'ras:?\s+([A-Za-z\s]+)',
-        r'rasse[n]?:?\s+([A-Za-z\s]+)',
-    ]
+    flock_size = extract_flock_size_from_text(text)
+    timer.lap("extract_flock_size")
+    report.count("flock_size", "text" if flock_size else "default")
     
-    for pattern in breed_patterns:
-        match = re.search(pattern, text_lower)
-        if match:
-            breed_text = match.group(1).strip()
-            # Limit to first 30 chars and capitalize
-            return breed_text[:30].title()
+    hits = _FARM_TERMS.match(text)
+    timer.lap("match_terms")
     
-    return None
+    breed = _breed(text, hits)
+    timer.lap("extract_breed")
+    report.count("breed", "text" if breed else "default")
+    
+    grazing_type = _grazing_type(hits)
+    timer.lap("extract_grazing_type")
+    report.count("grazing_type", "default" if grazing_type == DEFAULT_GRAZING_TYPE else "keyword")
+    
+    return {
+        "id": dedup.record_id(item.get('place_id'), item['title'], location.get('lat'), location.get('lng')),
+        "name": item['title'],
+        "location": item.get('address', ''),
+        "country": defaults["country"],
+        "region": region,
+        "flock_size": flock_size or defaults["flock_size"],
+        "breed": breed or defaults["breed"],
+        "grazing_type": grazing_type,
+        "contact_email": "",  # Not available in the data
+        "contact_phone": item.get('phone'),
+        "website": item.get('website'),
+        "coordinates": {
+            "latitude": location.get('lat'),
+            "longitude": location.get('lng')
+        },
+        "place_id": item.get('place_id')
+    }
 
-def extract_region_from_address(address, city, country_code):
-    """Extract region information from address based on country."""
-    if not address and not city:
-        return ""
+def _process_item(item, plugin, report):
+    return process_sheep_farm(item, plugin["code"], report)
+
+def load_plugin(country_code):
+    """The ingest_engine plugin that turns a country's items into sheep farm records."""
+    return dict(COUNTRIES[country_code], code=country_code, record_type="sheep_farms",
+                compact_item=_compact_item, process_item=_process_item,
+                fingerprint_keys=("record_type", "country", "flock_size", "breed"))
+
+def process_sheep_farms(jobs, combined_file=None, workers=1, chunk_size=ingest_engine.ITEMS_PER_CHUNK, resume=False,
+                        checkpoint_interval=checkpoint.CHECKPOINT_INTERVAL):
+    """Process several (country_code, input_file, output_file) jobs and return a summary per output file.
     
-    search_text = (address or "").lower() + " " + (city or "").lower()
+    The jobs run through ingest_engine.process_countries with the plugins of
+    load_plugin, so parallel runs, checkpoints and resuming, run reports and the
+    quarantine of invalid items work as for the solar parks. If combined_file is
+    given, the country outputs are then merged into it by the streaming combine
+    step (sorted, with cross-country duplicates removed).
+    """
+    summaries = ingest_engine.process_countries(jobs, workers, chunk_size, resume=resume,
+                                                checkpoint_interval=checkpoint_interval, load=load_plugin)
     
-    # Define regions by country
-    if country_code == "NL":
-        # Dutch provinces
-        regions = {
-            "Noord-Holland": ["noord-holland", "amsterdam", "haarlem", "alkmaar", "hoorn", "den helder", "zaandam"],
-            "Zuid-Holland": ["zuid-holland", "rotterdam", "den haag", "dordrecht", "leiden", "delft", "gouda"],
-            "Utrecht": ["utrecht", "amersfoort", "veenendaal", "nieuwegein", "zeist"],
-            "Gelderland": ["gelderland", "arnhem", "nijmegen", "apeldoorn", "ede", "doetinchem"],
-            "Overijssel": ["overijssel", "enschede", "zwolle", "deventer", "hengelo", "almelo"],
-            "Flevoland": ["flevoland", "lelystad", "almere", "emmeloord", "dronten"],
-            "Noord-Brabant": ["noord-brabant", "eindhoven", "tilburg", "breda", "den bosch", "'s-hertogenbosch", "roosendaal"],
-            "Limburg": ["limburg", "maastricht", "venlo", "roermond", "sittard", "heerlen"],
-            "Zeeland": ["zeeland", "middelburg", "vlissingen", "terneuzen", "goes"],
-            "Drenthe": ["drenthe", "assen", "emmen", "hoogeveen", "meppel"],
-            "Friesland": ["friesland", "leeuwarden", "drachten", "heerenveen", "sneek"],
-            "Groningen": ["groningen", "delfzijl", "stadskanaal", "winschoten"]
-        }
-    elif country_code == "UK" or country_code == "GB":
-        # UK regions/countries
-        regions = {
-            "England": [
-                "london", "manchester", "birmingham", "leeds", "liverpool", "newcastle", "sheffield", 
-                "bristol", "nottingham", "leicester", "coventry", "bradford", "oxford", "cambridge",
-                "norfolk", "suffolk", "essex", "kent", "surrey", "sussex", "hampshire", "dorset", 
-                "devon", "cornwall", "somerset", "wiltshire", "gloucestershire", "oxfordshire", 
-                "buckinghamshire", "berkshire", "hertfordshire", "bedfordshire", "cambridgeshire", 
-                "northamptonshire", "warwickshire", "worcestershire", "herefordshire", "shropshire", 
-                "staffordshire", "derbyshire", "nottinghamshire", "lincolnshire", "leicestershire", 
-                "rutland", "northumberland", "durham", "cumbria", "lancashire", "yorkshire", "cheshire"
-            ],
-            "Scotland": [
-                "edinburgh", "glasgow", "aberdeen", "dundee", "inverness", "stirling", "perth",
-                "highlands", "grampian", "strathclyde", "lothian", "borders", "fife", "tayside",
-                "aberdeenshire", "angus", "argyll", "ayrshire", "banffshire", "berwickshire",
-                "caithness", "clackmannanshire", "dumfriesshire", "dunbartonshire", "east lothian",
-                "fife", "inverness-shire", "kincardineshire", "kinross-shire", "kirkcudbrightshire",
-                "lanarkshire", "midlothian", "moray", "nairnshire", "orkney", "peeblesshire",
-                "perthshire", "renfrewshire", "ross-shire", "roxburghshire", "selkirkshire",
-                "shetland", "stirlingshire", "sutherland", "west lothian", "wigtownshire"
-            ],
-            "Wales": [
-                "cardiff", "swansea", "newport", "bangor", "wrexham", "aberystwyth",
-                "anglesey", "brecknockshire", "caernarfonshire", "cardiganshire", "carmarthenshire",
-                "denbighshire", "flintshire", "glamorgan", "merionethshire", "monmouthshire",
-                "montgomeryshire", "pembrokeshire", "radnorshire", "gwynedd", "clwyd", "dyfed",
-                "powys", "gwent", "mid glamorgan", "south glamorgan", "west glamorgan"
-            ],
-            "Northern Ireland": [
-                "belfast", "derry", "lisburn", "newry", "armagh", "bangor", "antrim", "down",
-                "fermanagh", "londonderry", "tyrone", "county antrim", "county armagh", "county down",
-                "county fermanagh", "county londonderry", "county tyrone"
-            ]
-        }
-    elif country_code == "FR":
-        # French regions
-        regions = {
-            "Auvergne-Rhône-Alpes": ["auvergne", "rhône", "rhone", "alpes", "ain", "allier", "ardèche", "ardeche", "cantal", "drôme", "drome", "isère", "isere", "loire", "haute-loire", "puy-de-dôme", "puy de dome", "rhône", "rhone", "savoie", "haute-savoie"],
-            "Bourgogne-Franche-Comté": ["bourgogne", "franche", "comté", "comte", "côte-d'or", "cote d'or", "doubs", "jura", "nièvre", "nievre", "haute-saône", "haute saone", "saône-et-loire", "saone et loire", "yonne", "territoire de belfort"],
-            "Bretagne": ["bretagne", "côtes-d'armor", "cotes d'armor", "finistère", "finistere", "ille-et-vilaine", "morbihan"],
-            "Centre-Val de Loire": ["centre", "val de loire", "cher", "eure-et-loir", "indre", "indre-et-loire", "loir-et-cher", "loiret"],
-            "Corse": ["corse", "haute-corse", "corse-du-sud"],
-            "Grand Est": ["grand est", "alsace", "champagne", "ardenne", "lorraine", "ardennes", "aube", "marne", "haute-marne", "meurthe-et-moselle", "meuse", "moselle", "bas-rhin", "haut-rhin", "vosges"],
-            "Hauts-de-France": ["hauts-de-france", "hauts de france", "aisne", "nord", "oise", "pas-de-calais", "pas de calais", "somme"],
-            "Île-de-France": ["île-de-france", "ile de france", "paris", "seine-et-marne", "yvelines", "essonne", "hauts-de-seine", "seine-saint-denis", "val-de-marne", "val-d'oise", "val d'oise"],
-            "Normandie": ["normandie", "calvados", "eure", "manche", "orne", "seine-maritime"],
-            "Nouvelle-Aquitaine": ["nouvelle-aquitaine", "nouvelle aquitaine", "charente", "charente-maritime", "corrèze", "correze", "creuse", "dordogne", "gironde", "landes", "lot-et-garonne", "pyrénées-atlantiques", "pyrenees atlantiques", "deux-sèvres", "deux sevres", "vienne", "haute-vienne"],
-            "Occitanie": ["occitanie", "ariège", "ariege", "aude", "aveyron", "gard", "haute-garonne", "gers", "hérault", "herault", "lot", "lozère", "lozere", "hautes-pyrénées", "hautes pyrenees", "pyrénées-orientales", "pyrenees orientales", "tarn", "tarn-et-garonne"],
-            "Pays de la Loire": ["pays de la loire", "loire-atlantique", "maine-et-loire", "mayenne", "sarthe", "vendée", "vendee"],
-            "Provence-Alpes-Côte d'Azur": ["provence", "alpes", "côte d'azur", "cote d'azur", "alpes-de-haute-provence", "hautes-alpes", "alpes-maritimes", "bouches-du-rhône", "bouches du rhone", "var", "vaucluse"]
-        }
-    elif country_code == "DE":
-        # German federal states (Bundesländer)
-        regions = {
-            "Baden-Württemberg": ["baden-württemberg", "baden-wurttemberg", "baden württemberg", "baden wurttemberg", "stuttgart", "karlsruhe", "freiburg", "tübingen", "tubingen"],
-            "Bayern": ["bayern", "bavaria", "münchen", "munchen", "nürnberg", "nurnberg", "augsburg", "regensburg", "würzburg", "wurzburg", "ingolstadt"],
-            "Berlin": ["berlin"],
-            "Brandenburg": ["brandenburg", "potsdam", "cottbus", "frankfurt an der oder"],
-            "Bremen": ["bremen", "bremerhaven"],
-            "Hamburg": ["hamburg"],
-            "Hessen": ["hessen", "hesse", "wiesbaden", "frankfurt am main", "kassel", "darmstadt"],
-            "Mecklenburg-Vorpommern": ["mecklenburg-vorpommern", "mecklenburg vorpommern", "schwerin", "rostock", "neubrandenburg", "stralsund"],
-            "Niedersachsen": ["niedersachsen", "lower saxony", "hannover", "braunschweig", "osnabrück", "osnabruck", "oldenburg", "göttingen", "gottingen"],
-            "Nordrhein-Westfalen": ["nordrhein-westfalen", "north rhine-westphalia", "düsseldorf", "dusseldorf", "köln", "koln", "cologne", "dortmund", "essen", "duisburg", "bochum", "wuppertal", "bonn", "münster", "munster"],
-            "Rheinland-Pfalz": ["rheinland-pfalz", "rhineland-palatinate", "mainz", "ludwigshafen", "koblenz", "trier", "kaiserslautern"],
-            "Saarland": ["saarland", "saarbrücken", "saarbrucken"],
-            "Sachsen": ["sachsen", "saxony", "dresden", "leipzig", "chemnitz", "zwickau"],
-            "Sachsen-Anhalt": ["sachsen-anhalt", "saxony-anhalt", "magdeburg", "halle", "dessau-roßlau", "dessau-rosslau"],
-            "Schleswig-Holstein": ["schleswig-holstein", "kiel", "lübeck", "lubeck", "flensburg", "neumünster", "neumunster"],
-            "Thüringen": ["thüringen", "thuringen", "thuringia", "erfurt", "jena", "gera", "weimar"]
-        }
-    elif country_code == "BE":
-        # Belgian regions
-        regions = {
-            "Flanders": [
-                "vlaanderen", "flandre", "flanders",
-                "antwerpen", "antwerp", "anvers",
-                "limburg", "limbourg",
-                "oost-vlaanderen", "east flanders", "flandre orientale",
-                "west-vlaanderen", "west flanders", "flandre occidentale",
-                "vlaams-brabant", "flemish brabant", "brabant flamand",
-                "gent", "ghent", "gand",
-                "brugge", "bruges", "hasselt", "leuven", "louvain", "mechelen", "malines"
-            ],
-            "Wallonia": [
-                "wallonie", "wallonia", "wallonië",
-                "hainaut", "henegouwen",
-                "liège", "luik", "liege",
-                "luxembourg", "luxemburg",
-                "namur", "namen",
-                "brabant wallon", "waals-brabant", "walloon brabant",
-                "charleroi", "mons", "bergen", "liège", "luik", "namur", "namen"
-            ],
-            "Brussels": [
-                "brussels", "bruxelles", "brussel",
-                "brussels hoofdstedelijk gewest", "région de bruxelles-capitale", "brussels capital region"
-            ]
-        }
-    else:
-        # Default empty regions if country not recognized
-        regions = {}
+    if combined_file:
+        count, _, duplicates = combine_stream.combine([output_file for _, _, output_file in jobs], [combined_file],
+                                                      validator=schema_validation.SHEEP_FARMS)
+        summaries[combined_file] = {"count": count, "duplicates": duplicates,
+                                    "report": run_report.report_path(combined_file)}
     
-    # Try to find region in address
-    for region, keywords in regions.items():
-        for keyword in keywords:
-            if keyword in search_text:
-                return region
+    return summaries
+
+def main():
+    parser = argparse.ArgumentParser(description="Process the scraped sheep farm datasets of several countries.")
+    parser.add_argument("countries", nargs="*", default=list(COUNTRIES),
+                        help="country codes to process (default: all of %(default)s)")
+    parser.add_argument("--input", action="append", default=[], metavar="CODE=FILE",
+                        help="raw dataset for a country instead of its default input file")
+    parser.add_argument("--combined-output", default=COMBINED_OUTPUT_FILE,
+                        help="combined output file (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes; 1 runs serially (default: %(default)s)")
+    parser.add_argument("--chunk-size", type=int, default=ingest_engine.ITEMS_PER_CHUNK,
+                        help="items per chunk sent to a worker (default: %(default)s)")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue an interrupted run from the checkpoints it left")
+    parser.add_argument("--checkpoint-interval", type=int, default=checkpoint.CHECKPOINT_INTERVAL,
+                        help="input items between checkpoints; 0 disables them (default: %(default)s)")
+    args = parser.parse_args()
     
-    # Extract postal code and try to map to region
-    if address:
-        postal_match = None
-        if country_code == "NL":
-            postal_match = re.search(r'(\d{4})\s*[A-Z]{2}', address)
-            if postal_match:
-                postal_code = postal_match.group(1)
-                first_digit = postal_code[0]
-                # Map Dutch postal code first digit to province
-                postal_to_region = {
-                    "1": "Noord-Holland",
-                    "2": "Noord-Holland/Zuid-Holland",
-                    "3": "Utrecht/Zuid-Holland",
-                    "4": "Zuid-Holland/Noord-Brabant/Zeeland",
-                    "5": "Noord-Brabant/Limburg",
-                    "6": "Gelderland/Limburg",
-                    "7": "Gelderland/Overijssel",
-                    "8": "Overijssel/Flevoland/Friesland",
-                    "9": "Groningen/Drenthe/Friesland"
-                }
-                if first_digit in postal_to_region:
-                    return postal_to_region[first_digit].split('/')[0]  # Take first option
-        elif country_code == "UK" or country_code == "GB":
-            # UK postal code first letters to region mapping
-            postal_match = re.search(r'([A-Z]{1,2}\d{1,2}[A-Z]?)', address, re.IGNORECASE)
-            if postal_match:
-                postal_prefix = postal_match.group(1)[:2].upper()  # Take first two characters
-                postal_to_region = {
-                    "England": ["B", "BA", "BB", "BD", "BH", "BL", "BN", "BR", "BS", "CA", "CB", "CH", "CM", "CO", "CR", 
-                               "CV", "CW", "DA", "DE", "DH", "DL", "DN", "DT", "DY", "E", "EC", "EN", "EX", "FY", "GL", 
-                               "GU", "HA", "HD", "HG", "HP", "HR", "HU", "HX", "IG", "IP", "KT", "L", "LA", "LE", "LN", 
-                               "LS", "LU", "M", "ME", "MK", "N", "NE", "NG", "NN", "NP", "NR", "NW", "OL", "OX", "PE", 
-                               "PL", "PO", "PR", "RG", "RH", "RM", "S", "SE", "SG", "SK", "SL", "SM", "SN", "SO", "SP", 
-                               "SR", "SS", "ST", "SW", "SY", "TA", "TF", "TN", "TQ", "TR", "TS", "TW", "UB", "W", "WA", 
-                               "WC", "WD", "WF", "WN", "WR", "WS", "WV", "YO"],
+    input_files = dict(spec.split("=", 1) for spec in args.input)
+    jobs = [(code, input_files.get(code, COUNTRIES[code]["input_file"]), COUNTRIES[code]["output_file"])
+            for code in args.countries]
     
-(Content truncated due to size limit. Use line ranges to read in chunks)
+    print(region_boundaries.describe_boundaries())
+    start = time.perf_counter()
+    summaries = process_sheep_farms(jobs, args.combined_output, args.workers, args.chunk_size, args.resume,
+                                    args.checkpoint_interval)
+    elapsed = time.perf_counter() - start
+    
+    total_items = 0
+    for country_code, _, output_file in jobs:
+        summary = summaries[output_file]
+        total_items += summary["items"]
+        print(f"{country_code}: processed {summary['count']} sheep farms from {summary['items']} items. "
+              f"Output saved to {output_file}")
+        if summary['resumed_from']:
+            print(f"  Resumed from the checkpoint after {summary['resumed_from']} items")
+        if summary['quarantined']:
+            print(f"  {summary['quarantined']} invalid items quarantined in "
+                  f"{schema_validation.quarantine_path(output_file)}")
+        print(f"  Run report saved to {summary['report']}")
+    combined = summaries[args.combined_output]
+    print(f"Combined {combined['count']} sheep farms ({combined['duplicates']} duplicates removed). "
+          f"Output saved to {args.combined_output}")
+    print(f"Finished in {elapsed:.1f}s with {args.workers} worker(s): "
+          f"{total_items / elapsed if elapsed else 0:,.0f} items/s")
+
+if __name__ == "__main__":
+    main()
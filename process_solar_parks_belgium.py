@@ -5,205 +5,78 @@ This script converts the raw Google Maps data for Belgian solar parks into a str
 suitable for the Ombaa directory database.
 """
 
-import json
-import os
-import re
+import dictionary_matcher
+import ingest_engine
+import postal_codes
+import region_gazetteer
 
-def extract_hectares_from_text(text):
-    """Extract hectare information from text if available."""
-    if not text:
-        return None
-    
-    # Look for patterns like "X ha", "X hectare", "X hectares"
-    patterns = [
-        r'(\d+[\.,]?\d*)\s*ha\b',
-        r'(\d+[\.,]?\d*)\s*hectare[s]?\b',
-        r'(\d+[\.,]?\d*)\s*hectaren\b'
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text.lower())
-        if match:
-            return float(match.group(1).replace(',', '.'))
-    
-    return None
+# Vegetation keywords, most specific first
+VEGETATION_KEYWORDS = {
+    "fleurs sauvages": "Wild flowers",
+    "wilde bloemen": "Wild flowers",
+    "fleurs": "Wild flowers",
+    "fleur": "Wild flowers",
+    "bloemen": "Wild flowers",
+    "bloem": "Wild flowers",
+    "kruiden": "Herbs and wildflowers",
+    "kruid": "Herbs and wildflowers",
+    "herbs": "Herbs and wildflowers",
+    "herb": "Herbs and wildflowers",
+    "sauvages": "Wild flowers",
+    "sauvage": "Wild flowers",
+    "paturages": "Pasture",
+    "paturage": "Pasture",
+    "prairies": "Meadow",
+    "prairie": "Meadow",
+    "weiden": "Meadow",
+    "weide": "Meadow",
+    "grasland": "Grass",
+    "herbe": "Grass",
+    "grass": "Grass",
+    "gras": "Grass",
+    "vegetation": "Mixed vegetation"
+}
+
+# Dutch and German descriptions glue the terms into compounds ("grasflache", "bloemenweide")
+_VEGETATION = dictionary_matcher.DictionaryMatcher({"vegetation": VEGETATION_KEYWORDS}, compounds=["vegetation"])
 
 def extract_vegetation_type(text):
     """Extract vegetation type information if available."""
-    if not text:
-        return "Mixed grass"  # Default value
-    
-    vegetation_keywords = {
-        "grass": "Grass",
-        "gras": "Grass",
-        "herbe": "Grass",
-        "prairie": "Meadow",
-        "weide": "Meadow",
-        "pâturage": "Pasture",
-        "fleur": "Wild flowers",
-        "bloem": "Wild flowers",
-        "sauvage": "Wild flowers",
-        "herb": "Herbs and wildflowers",
-        "kruid": "Herbs and wildflowers",
-        "végétation": "Mixed vegetation"
-    }
-    
-    text_lower = text.lower()
-    for keyword, veg_type in vegetation_keywords.items():
-        if keyword in text_lower:
-            return veg_type
-    
-    return "Mixed grass"  # Default value
+    hit = _VEGETATION.match(text).get("vegetation")
+    return hit.label if hit else "Mixed grass"  # Default value
 
 def extract_region_from_address(address, city):
     """Extract region information from address."""
-    # Belgian regions and provinces
-    regions = {
-        "Flanders": [
-            "vlaanderen", "flandre", "flanders",
-            "antwerpen", "antwerp", "anvers",
-            "limburg", "limbourg",
-            "oost-vlaanderen", "east flanders", "flandre orientale",
-            "west-vlaanderen", "west flanders", "flandre occidentale",
-            "vlaams-brabant", "flemish brabant", "brabant flamand",
-            "gent", "ghent", "gand",
-            "brugge", "bruges", "hasselt", "leuven", "louvain", "mechelen", "malines"
-        ],
-        "Wallonia": [
-            "wallonie", "wallonia", "wallonië",
-            "hainaut", "henegouwen",
-            "liège", "luik", "liege",
-            "luxembourg", "luxemburg",
-            "namur", "namen",
-            "brabant wallon", "waals-brabant", "walloon brabant",
-            "charleroi", "mons", "bergen", "liège", "luik", "namur", "namen"
-        ],
-        "Brussels": [
-            "brussels", "bruxelles", "brussel",
-            "brussels hoofdstedelijk gewest", "région de bruxelles-capitale", "brussels capital region"
-        ]
-    }
-    
-    if not address and not city:
-        return ""
-    
-    search_text = (address or "").lower() + " " + (city or "").lower()
-    
-    # Try to find region in address
-    for region, keywords in regions.items():
-        for keyword in keywords:
-            if keyword in search_text:
-                return region
+    region = region_gazetteer.match_region("BE", address, city)
+    if region:
+        return region
     
     # Extract postal code and map to region
-    if address:
-        postal_match = re.search(r'(\d{4})', address)
-        if postal_match:
-            postal_code = int(postal_match.group(1))
-            
-            # Map postal code ranges to regions
-            if 1000 <= postal_code <= 1299:
-                return "Brussels"
-            elif (1300 <= postal_code <= 1499) or (1500 <= postal_code <= 1999) or (3000 <= postal_code <= 3499) or (8000 <= postal_code <= 9999):
-                return "Flanders"
-            elif (1400 <= postal_code <= 1499) or (4000 <= postal_code <= 7999):
-                return "Wallonia"
+    region = postal_codes.region_from_address("BE", address)
+    if region:
+        return region
     
     return ""  # Return empty string if no region found
 
-def process_solar_parks(input_file, output_file):
+PLUGIN = {
+    "code": "BE",
+    "country": "Belgium",
+    "solar_keywords": ['solar', 'solaire', 'zonne', 'photovoltaique', 'pv'],
+    "park_keywords": ['park', 'parc', 'centrale', 'ferme', 'farm', 'installation', 'plant'],
+    "default_hectares": 18.0,  # Average size for Belgian solar parks
+    "extract_vegetation": extract_vegetation_type,
+    "extract_region": extract_region_from_address
+}
+
+def process_solar_parks(input_file, output_file, workers=1, incremental=False, resume=False):
     """Process solar park data from Apify and convert to Ombaa format."""
-    with open(input_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    processed_data = []
-    
-    for item in data:
-        # Skip entries that don't look like solar parks
-        title = item.get('title', '').lower()
-        categories = [cat.lower() for cat in item.get('categories', [])]
-        
-        # Check if this is likely a solar park
-        is_solar_park = False
-        solar_keywords = ['solar', 'solaire', 'zonne', 'photovoltaïque', 'photovoltaique', 'pv']
-        park_keywords = ['park', 'parc', 'centrale', 'ferme', 'farm', 'installation', 'plant']
-        
-        for solar_kw in solar_keywords:
-            if solar_kw in title:
-                for park_kw in park_keywords:
-                    if park_kw in title:
-                        is_solar_park = True
-                        break
-        
-        # Also check categories
-        for category in categories:
-            for solar_kw in solar_keywords:
-                if solar_kw in category:
-                    is_solar_park = True
-                    break
-        
-        if not is_solar_park:
-            continue
-        
-        # Extract description from reviews if available
-        description = ""
-        if item.get('reviews'):
-            for review in item['reviews']:
-                if review.get('text') and len(review.get('text', '')) > len(description):
-                    description = review.get('text', '')
-        
-        # Extract hectares from description or default to None
-        hectares = extract_hectares_from_text(description)
-        if not hectares and item.get('description'):
-            hectares = extract_hectares_from_text(item['description'])
-        
-        # If no hectares found, make an estimate based on the name
-        if not hectares:
-            # Solar parks are often named with their capacity
-            capacity_match = re.search(r'(\d+[\.,]?\d*)\s*[mM][wW]', title)
-            if capacity_match:
-                # Rough estimate: 1 MW ≈ 1-2 hectares
-                mw = float(capacity_match.group(1).replace(',', '.'))
-                hectares = mw * 1.5
-        
-        # If still no hectares, provide a default range
-        if not hectares:
-            hectares = 18.0  # Average size for Belgian solar parks
-        
-        # Extract vegetation type
-        vegetation_type = extract_vegetation_type(description)
-        
-        # Extract region
-        region = extract_region_from_address(item.get('address', ''), item.get('city', ''))
-        
-        # Create processed entry
-        processed_entry = {
-            "name": item.get('title', ''),
-            "location": item.get('address', ''),
-            "country": "Belgium",
-            "region": region,
-            "total_hectares": hectares,
-            "vegetation_type": vegetation_type,
-            "contact_email": "",  # Not available in the data
-            "contact_phone": item.get('phone', ''),
-            "website": item.get('website', ''),
-            "coordinates": {
-                "latitude": item.get('location', {}).get('lat'),
-                "longitude": item.get('location', {}).get('lng')
-            }
-        }
-        
-        processed_data.append(processed_entry)
-    
-    # Write processed data to output file
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(processed_data, f, indent=2, ensure_ascii=False)
-    
-    return len(processed_data)
+    return ingest_engine.process_solar_parks(input_file, output_file, PLUGIN, workers=workers,
+                                             incremental=incremental, resume=resume)
+
+# Raw Apify dataset and processed output used when run as a script
+INPUT_FILE = "/home/ubuntu/upload/BE dataset_crawler-google-places_2025-05-20_09-19-11-637.json"
+OUTPUT_FILE = "/home/ubuntu/processed_solar_parks_belgium.json"
 
 if __name__ == "__main__":
-    input_file = "/home/ubuntu/upload/BE dataset_crawler-google-places_2025-05-20_09-19-11-637.json"
-    output_file = "/home/ubuntu/processed_solar_parks_belgium.json"
-    
-    count = process_solar_parks(input_file, output_file)
-    print(f"Processed {count} solar parks in Belgium. Output saved to {output_file}")
+    count = process_solar_parks(INPUT_FILE, OUTPUT_FILE)
+    print(f"Processed {count} solar parks in Belgium. Output saved to {OUTPUT_FILE}")
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Coordinate-based region assignment for the Ombaa ingest scripts.
+Regions are looked up by point-in-polygon against a local GeoJSON file of
+administrative boundaries, backed by a grid index: a point in a cell that no
+boundary crosses is answered from a per-cell cache, and other points only
+ray-cast against the polygons crossing their cell, using the edges in their
+own grid row.
+
+The boundary file is a GeoJSON FeatureCollection of Polygon/MultiPolygon
+features whose properties carry "country" (NL, FR, DE, UK, BE) and "region"
+(the region names the process_* scripts emit, e.g. "Gelderland", "Bretagne",
+"Scotland", "Flanders"). data/admin_regions.geojson ships a simplified set
+(about 1 km precision; the Dutch provinces are approximated from GeoNames
+places), see its "source" member; point OMBAA_REGION_BOUNDARIES at a more
+detailed file if needed. Without a file callers fall back to the text
+heuristics, and the run summaries and reports say that no boundaries were loaded.
+"""
+
+import math
+import os
+import json
+
+# Boundary file used when none is given; OMBAA_REGION_BOUNDARIES overrides it
+DEFAULT_BOUNDARIES_FILE = os.getenv(
+    'OMBAA_REGION_BOUNDARIES',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "admin_regions.geojson")
+)
+
+# Grid cell size in degrees (about 2 km); candidate polygons are kept on a coarser grid
+CELL_SIZE = 0.02
+COARSE_CELLS = 25
+
+
+def _polygons(geometry):
+    """Yield the rings of every polygon in a Polygon or MultiPolygon geometry."""
+    if geometry["type"] == "Polygon":
+        yield geometry["coordinates"]
+    elif geometry["type"] == "MultiPolygon":
+        yield from geometry["coordinates"]
+
+
+class RegionIndex:
+    """Grid index over administrative boundary polygons."""
+
+    def __init__(self, features, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.regions = []        # region index -> (country, region)
+        self.polygons = []       # polygon index -> (region index, grid row -> edges crossing that row)
+        self.candidates = {}     # coarse cell -> polygons whose bounding box overlaps it
+        self.edge_cells = {}     # cell -> polygons with an edge crossing it
+        self._resolved = {}      # cell -> polygon containing the part of the cell no edge touches
+
+        for feature in features:
+            properties = feature.get("properties") or {}
+            region_index = len(self.regions)
+            self.regions.append((properties.get("country"), properties.get("region")))
+            for rings in _polygons(feature["geometry"]):
+                self._add_polygon(region_index, rings)
+
+    def _cell(self, value):
+        return math.floor(value / self.cell_size)
+
+    def _coarse(self, cell):
+        return (cell[0] // COARSE_CELLS, cell[1] // COARSE_CELLS)
+
+    def _traverse(self, x1, y1, x2, y2):
+        """Yield every grid cell the segment passes through (grid traversal)."""
+        cx, cy = self._cell(x1), self._cell(y1)
+        end_x, end_y = self._cell(x2), self._cell(y2)
+        dx, dy = x2 - x1, y2 - y1
+        step_x = 1 if dx > 0 else -1
+        step_y = 1 if dy > 0 else -1
+        next_x = ((cx + (step_x > 0)) * self.cell_size - x1) / dx if dx else math.inf
+        next_y = ((cy + (step_y > 0)) * self.cell_size - y1) / dy if dy else math.inf
+        delta_x = self.cell_size / abs(dx) if dx else math.inf
+        delta_y = self.cell_size / abs(dy) if dy else math.inf
+
+        yield cx, cy
+        for _ in range(abs(end_x - cx) + abs(end_y - cy)):
+            if (cx, cy) == (end_x, end_y):
+                break
+            if next_x < next_y:
+                cx += step_x
+                next_x += delta_x
+            elif next_y < next_x:
+                cy += step_y
+                next_y += delta_y
+            else:
+                # Through a grid corner: both side cells are touched as well
+                yield cx + step_x, cy
+                yield cx, cy + step_y
+                cx += step_x
+                cy += step_y
+                next_x += delta_x
+                next_y += delta_y
+            yield cx, cy
+        yield end_x, end_y
+
+    def _add_polygon(self, region_index, rings):
+        polygon_index = len(self.polygons)
+        rows = {}
+        min_x = min_y = math.inf
+        max_x = max_y = -math.inf
+
+        # Holes are just more rings: the even-odd rule takes care of them
+        for ring in rings:
+            for (x1, y1), (x2, y2) in zip(ring, ring[1:] + ring[:1]):
+                if (x1, y1) == (x2, y2):
+                    continue
+                edge = (x1, y1, x2, y2)
+                for row in range(self._cell(min(y1, y2)), self._cell(max(y1, y2)) + 1):
+                    rows.setdefault(row, []).append(edge)
+                for cell in self._traverse(x1, y1, x2, y2):
+                    polygons = self.edge_cells.setdefault(cell, [])
+                    if not polygons or polygons[-1] != polygon_index:
+                        polygons.append(polygon_index)
+                min_x, max_x = min(min_x, x1), max(max_x, x1)
+                min_y, max_y = min(min_y, y1), max(max_y, y1)
+
+        if not rows:
+            return
+        self.polygons.append((region_index, rows))
+        low = self._coarse((self._cell(min_x), self._cell(min_y)))
+        high = self._coarse((self._cell(max_x), self._cell(max_y)))
+        for gx in range(low[0], high[0] + 1):
+            for gy in range(low[1], high[1] + 1):
+                self.candidates.setdefault((gx, gy), []).append(polygon_index)
+
+    def _contains(self, polygon_index, x, y):
+        """Ray-cast against the polygon's edges in the point's grid row only."""
+        inside = False
+        for x1, y1, x2, y2 in self.polygons[polygon_index][1].get(self._cell(y), ()):
+            if (y1 > y) != (y2 > y) and x < (x2 - x1) * (y - y1) / (y2 - y1) + x1:
+                inside = not inside
+        return inside
+
+    def _resolve(self, cell):
+        """Polygon containing the cell wherever none of the cell's own edges interferes."""
+        if cell not in self._resolved:
+            crossing = self.edge_cells.get(cell, ())
+            centre = ((cell[0] + 0.5) * self.cell_size, (cell[1] + 0.5) * self.cell_size)
+            found = None
+            # A polygon with no edge in the cell contains all of it or none of it
+            for polygon_index in self.candidates.get(self._coarse(cell), ()):
+                if polygon_index not in crossing and self._contains(polygon_index, *centre):
+                    found = polygon_index
+                    break
+            self._resolved[cell] = found
+            if found is not None and not crossing:
+                self._flood(cell, found)
+        return self._resolved[cell]
+
+    def _flood(self, cell, polygon_index):
+        """Give the same polygon to every edge-free cell connected to an edge-free cell."""
+        # No boundary separates neighbouring edge-free cells, so they share the polygon
+        stack = [cell]
+        while stack:
+            cx, cy = stack.pop()
+            for neighbour in ((cx + 1, cy), (cx - 1, cy), (cx, cy + 1), (cx, cy - 1)):
+                if neighbour not in self._resolved and neighbour not in self.edge_cells:
+                    self._resolved[neighbour] = polygon_index
+                    stack.append(neighbour)
+
+    def _region(self, polygon_index, country):
+        if polygon_index is None:
+            return None
+        region_country, region = self.regions[self.polygons[polygon_index][0]]
+        if country is not None and region_country != country:
+            return None
+        return region
+
+    def _locate(self, x, y, cell):
+        for crossing in self.edge_cells.get(cell, ()):
+            if self._contains(crossing, x, y):
+                return crossing
+        return self._resolve(cell)
+
+    def lookup(self, latitude, longitude, country=None):
+        """Return the region containing the point, or None; restricted to one country if given."""
+        cell = (self._cell(longitude), self._cell(latitude))
+        return self._region(self._locate(longitude, latitude, cell), country)
+
+    def lookup_batch(self, points, country=None):
+        """Return the region (or None) for each (latitude, longitude) pair."""
+        floor, size = math.floor, self.cell_size
+        edge_cells, resolved = self.edge_cells, self._resolved
+        results = []
+        for latitude, longitude in points:
+            if latitude is None or longitude is None:
+                results.append(None)
+                continue
+            cell = (floor(longitude / size), floor(latitude / size))
+            # Most points fall in cells no boundary crosses: one dict hit
+            if cell not in edge_cells and cell in resolved:
+                polygon_index = resolved[cell]
+            else:
+                polygon_index = self._locate(longitude, latitude, cell)
+            results.append(self._region(polygon_index, country))
+        return results
+
+
+_INDEXES = {}
+
+
+def load_region_index(boundaries_file=None):
+    """The RegionIndex for a boundary file, built once per process; None if the file does not exist."""
+    path = boundaries_file or DEFAULT_BOUNDARIES_FILE
+    if path not in _INDEXES:
+        index = None
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                index = RegionIndex(json.load(f)["features"])
+        _INDEXES[path] = index
+    return _INDEXES[path]
+
+
+def boundaries_fingerprint(boundaries_file=None):
+    """Identify the boundary file in use (or its absence), for caches of extracted records."""
+    path = boundaries_file or DEFAULT_BOUNDARIES_FILE
+    if not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    return [path, stat.st_size, int(stat.st_mtime)]
+
+
+def describe_boundaries(boundaries_file=None):
+    """One line for run summaries: the boundary file regions are looked up in, or that none was loaded."""
+    path = boundaries_file or DEFAULT_BOUNDARIES_FILE
+    if os.path.exists(path):
+        return f"Regions from the boundaries in {path}, else from addresses"
+    return (f"No region boundaries loaded ({path} does not exist; set OMBAA_REGION_BOUNDARIES): "
+            f"regions come from addresses only")
+
+
+def region_at(latitude, longitude, country=None):
+    """Region at a coordinate from the default boundary file, or None if unknown."""
+    if latitude is None or longitude is None:
+        return None
+    index = load_region_index()
+    if index is None:
+        return None
+    return index.lookup(latitude, longitude, country)
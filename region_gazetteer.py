@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Region gazetteer for the Ombaa ingest scripts.
+The province/region keyword tables for every country live here and are compiled
+once at import into a single trie-shaped regex per country, so an address is
+matched against all keywords in one pass instead of a substring scan per keyword.
+Keywords are listed in their text_fold.fold() form and matched against the
+folded address, so "Münster", "MUNSTER" and "munster" are one keyword.
+The solar park and sheep farm scripts keep their own Dutch tables, and only
+the solar park scripts fall back to the city tables.
+"""
+
+import re
+
+import text_fold
+
+# Dutch provinces, as the solar park scripts name them
+NL_PROVINCES = {
+    "Groningen": ["groningen"],
+    "Friesland": ["friesland", "fryslan"],
+    "Drenthe": ["drenthe"],
+    "Overijssel": ["overijssel"],
+    "Flevoland": ["flevoland"],
+    "Gelderland": ["gelderland"],
+    "Utrecht": ["utrecht"],
+    "Noord-Holland": ["noord-holland", "noord holland", "north holland"],
+    "Zuid-Holland": ["zuid-holland", "zuid holland", "south holland"],
+    "Zeeland": ["zeeland"],
+    "Noord-Brabant": ["noord-brabant", "noord brabant", "north brabant"],
+    "Limburg": ["limburg"]
+}
+
+# Dutch provinces and their towns, as process_sheep_farms lists them
+NL_FARM_REGIONS = {
+    "Noord-Holland": ["noord-holland", "amsterdam", "haarlem", "alkmaar", "hoorn", "den helder", "zaandam"],
+    "Zuid-Holland": ["zuid-holland", "rotterdam", "den haag", "dordrecht", "leiden", "delft", "gouda"],
+    "Utrecht": ["utrecht", "amersfoort", "veenendaal", "nieuwegein", "zeist"],
+    "Gelderland": ["gelderland", "arnhem", "nijmegen", "apeldoorn", "ede", "doetinchem"],
+    "Overijssel": ["overijssel", "enschede", "zwolle", "deventer", "hengelo", "almelo"],
+    "Flevoland": ["flevoland", "lelystad", "almere", "emmeloord", "dronten"],
+    "Noord-Brabant": [
+        "noord-brabant", "eindhoven", "tilburg", "breda", "den bosch", "'s-hertogenbosch", "roosendaal"
+    ],
+    "Limburg": ["limburg", "maastricht", "venlo", "roermond", "sittard", "heerlen"],
+    "Zeeland": ["zeeland", "middelburg", "vlissingen", "terneuzen", "goes"],
+    "Drenthe": ["drenthe", "assen", "emmen", "hoogeveen", "meppel"],
+    "Friesland": ["friesland", "leeuwarden", "drachten", "heerenveen", "sneek"],
+    "Groningen": ["groningen", "delfzijl", "stadskanaal", "winschoten"]
+}
+
+# French regions
+FR_REGIONS = {
+    "Auvergne-Rhône-Alpes": [
+        "auvergne", "rhone", "alpes", "ain", "allier", "ardeche", "cantal", "drome", "isere", "loire",
+        "haute-loire", "puy-de-dome", "puy de dome", "savoie", "haute-savoie"
+    ],
+    "Bourgogne-Franche-Comté": [
+        "bourgogne", "franche", "comte", "cote-d'or", "cote d'or", "doubs", "jura", "nievre", "haute-saone",
+        "haute saone", "saone-et-loire", "saone et loire", "yonne", "territoire de belfort"
+    ],
+    "Bretagne": ["bretagne", "cotes-d'armor", "cotes d'armor", "finistere", "ille-et-vilaine", "morbihan"],
+    "Centre-Val de Loire": [
+        "centre", "val de loire", "cher", "eure-et-loir", "indre", "indre-et-loire", "loir-et-cher",
+        "loiret"
+    ],
+    "Corse": ["corse", "haute-corse", "corse-du-sud"],
+    "Grand Est": [
+        "grand est", "alsace", "champagne", "ardenne", "lorraine", "ardennes", "aube", "marne",
+        "haute-marne", "meurthe-et-moselle", "meuse", "moselle", "bas-rhin", "haut-rhin", "vosges"
+    ],
+    "Hauts-de-France": [
+        "hauts-de-france", "hauts de france", "aisne", "nord", "oise", "pas-de-calais", "pas de calais",
+        "somme"
+    ],
+    "Île-de-France": [
+        "ile-de-france", "ile de france", "paris", "seine-et-marne", "yvelines", "essonne",
+        "hauts-de-seine", "seine-saint-denis", "val-de-marne", "val-d'oise", "val d'oise"
+    ],
+    "Normandie": ["normandie", "calvados", "eure", "manche", "orne", "seine-maritime"],
+    "Nouvelle-Aquitaine": [
+        "nouvelle-aquitaine", "nouvelle aquitaine", "charente", "charente-maritime", "correze", "creuse",
+        "dordogne", "gironde", "landes", "lot-et-garonne", "pyrenees-atlantiques", "pyrenees atlantiques",
+        "deux-sevres", "deux sevres", "vienne", "haute-vienne"
+    ],
+    "Occitanie": [
+        "occitanie", "ariege", "aude", "aveyron", "gard", "haute-garonne", "gers", "herault", "lot",
+        "lozere", "hautes-pyrenees", "hautes pyrenees", "pyrenees-orientales", "pyrenees orientales",
+        "tarn", "tarn-et-garonne"
+    ],
+    "Pays de la Loire": [
+        "pays de la loire", "loire-atlantique", "maine-et-loire", "mayenne", "sarthe", "vendee"
+    ],
+    "Provence-Alpes-Côte d'Azur": [
+        "provence", "alpes", "cote d'azur", "alpes-de-haute-provence", "hautes-alpes", "alpes-maritimes",
+        "bouches-du-rhone", "bouches du rhone", "var", "vaucluse"
+    ]
+}
+
+# German federal states (Bundesländer)
+DE_REGIONS = {
+    "Baden-Württemberg": [
+        "baden-wurttemberg", "baden wurttemberg", "stuttgart", "karlsruhe", "freiburg", "tubingen"
+    ],
+    "Bayern": [
+        "bayern", "bavaria", "munchen", "nurnberg", "augsburg", "regensburg", "wurzburg", "ingolstadt"
+    ],
+    "Berlin": ["berlin"],
+    "Brandenburg": ["brandenburg", "potsdam", "cottbus", "frankfurt an der oder"],
+    "Bremen": ["bremen", "bremerhaven"],
+    "Hamburg": ["hamburg"],
+    "Hessen": ["hessen", "hesse", "wiesbaden", "frankfurt am main", "kassel", "darmstadt"],
+    "Mecklenburg-Vorpommern": [
+        "mecklenburg-vorpommern", "mecklenburg vorpommern", "schwerin", "rostock", "neubrandenburg",
+        "stralsund"
+    ],
+    "Niedersachsen": [
+        "niedersachsen", "lower saxony", "hannover", "braunschweig", "osnabruck", "oldenburg", "gottingen"
+    ],
+    "Nordrhein-Westfalen": [
+        "nordrhein-westfalen", "north rhine-westphalia", "dusseldorf", "koln", "cologne", "dortmund",
+        "essen", "duisburg", "bochum", "wuppertal", "bonn", "munster"
+    ],
+    "Rheinland-Pfalz": [
+        "rheinland-pfalz", "rhineland-palatinate", "mainz", "ludwigshafen", "koblenz", "trier",
+        "kaiserslautern"
+    ],
+    "Saarland": ["saarland", "saarbrucken"],
+    "Sachsen": ["sachsen", "saxony", "dresden", "leipzig", "chemnitz", "zwickau"],
+    "Sachsen-Anhalt": ["sachsen-anhalt", "saxony-anhalt", "magdeburg", "halle", "dessau-rosslau"],
+    "Schleswig-Holstein": ["schleswig-holstein", "kiel", "lubeck", "flensburg", "neumunster"],
+    "Thüringen": ["thuringen", "thuringia", "erfurt", "jena", "gera", "weimar"]
+}
+
+# UK countries
+UK_REGIONS = {
+    "England": [
+        "london", "manchester", "birmingham", "leeds", "liverpool", "newcastle", "sheffield", "bristol",
+        "nottingham", "leicester", "coventry", "bradford", "oxford", "cambridge", "norfolk", "suffolk",
+        "essex", "kent", "surrey", "sussex", "hampshire", "dorset", "devon", "cornwall", "somerset",
+        "wiltshire", "gloucestershire", "oxfordshire", "buckinghamshire", "berkshire", "hertfordshire",
+        "bedfordshire", "cambridgeshire", "northamptonshire", "warwickshire", "worcestershire",
+        "herefordshire", "shropshire", "staffordshire", "derbyshire", "nottinghamshire", "lincolnshire",
+        "leicestershire", "rutland", "northumberland", "durham", "cumbria", "lancashire", "yorkshire",
+        "cheshire"
+    ],
+    "Scotland": [
+        "edinburgh", "glasgow", "aberdeen", "dundee", "inverness", "stirling", "perth", "highlands",
+        "grampian", "strathclyde", "lothian", "borders", "fife", "tayside", "aberdeenshire", "angus",
+        "argyll", "ayrshire", "banffshire", "berwickshire", "caithness", "clackmannanshire",
+        "dumfriesshire", "dunbartonshire", "east lothian", "inverness-shire", "kincardineshire",
+        "kinross-shire", "kirkcudbrightshire", "lanarkshire", "midlothian", "moray", "nairnshire", "orkney",
+        "peeblesshire", "perthshire", "renfrewshire", "ross-shire", "roxburghshire", "selkirkshire",
+        "shetland", "stirlingshire", "sutherland", "west lothian", "wigtownshire"
+    ],
+    "Wales": [
+        "cardiff", "swansea", "newport", "bangor", "wrexham", "aberystwyth", "anglesey", "brecknockshire",
+        "caernarfonshire", "cardiganshire", "carmarthenshire", "denbighshire", "flintshire", "glamorgan",
+        "merionethshire", "monmouthshire", "montgomeryshire", "pembrokeshire", "radnorshire", "gwynedd",
+        "clwyd", "dyfed", "powys", "gwent", "mid glamorgan", "south glamorgan", "west glamorgan"
+    ],
+    "Northern Ireland": [
+        "belfast", "derry", "lisburn", "newry", "armagh", "bangor", "antrim", "down", "fermanagh",
+        "londonderry", "tyrone", "county antrim", "county armagh", "county down", "county fermanagh",
+        "county londonderry", "county tyrone"
+    ]
+}
+
+# Belgian regions
+BE_REGIONS = {
+    "Flanders": [
+        "vlaanderen", "flandre", "flanders", "antwerpen", "antwerp", "anvers", "limburg", "limbourg",
+        "oost-vlaanderen", "east flanders", "flandre orientale", "west-vlaanderen", "west flanders",
+        "flandre occidentale", "vlaams-brabant", "flemish brabant", "brabant flamand", "gent", "ghent",
+        "gand", "brugge", "bruges", "hasselt", "leuven", "louvain", "mechelen", "malines"
+    ],
+    "Wallonia": [
+        "wallonie", "wallonia", "hainaut", "henegouwen", "liege", "luik", "luxembourg", "luxemburg",
+        "namur", "namen", "brabant wallon", "waals-brabant", "walloon brabant", "charleroi", "mons",
+        "bergen"
+    ],
+    "Brussels": [
+        "brussels", "bruxelles", "brussel", "brussels hoofdstedelijk gewest",
+        "region de bruxelles-capitale", "brussels capital region"
+    ]
+}
+
+# City-to-region mappings for common cities (folded names), used when no keyword matches
+NL_CITIES = {
+    "amsterdam": "Noord-Holland",
+    "rotterdam": "Zuid-Holland",
+    "den haag": "Zuid-Holland",
+    "utrecht": "Utrecht",
+    "eindhoven": "Noord-Brabant",
+    "groningen": "Groningen",
+    "tilburg": "Noord-Brabant",
+    "almere": "Flevoland",
+    "breda": "Noord-Brabant",
+    "nijmegen": "Gelderland",
+    "enschede": "Overijssel",
+    "apeldoorn": "Gelderland",
+    "haarlem": "Noord-Holland",
+    "arnhem": "Gelderland",
+    "zaanstad": "Noord-Holland",
+    "amersfoort": "Utrecht",
+    "haarlemmermeer": "Noord-Holland",
+    "zwolle": "Overijssel",
+    "zoetermeer": "Zuid-Holland",
+    "leiden": "Zuid-Holland",
+    "maastricht": "Limburg",
+    "dordrecht": "Zuid-Holland",
+    "ede": "Gelderland",
+    "leeuwarden": "Friesland",
+    "almelo": "Overijssel",
+    "delft": "Zuid-Holland",
+    "venlo": "Limburg",
+    "deventer": "Overijssel",
+    "sittard": "Limburg",
+    "roermond": "Limburg"
+}
+
+FR_CITIES = {
+    "paris": "Île-de-France",
+    "marseille": "Provence-Alpes-Côte d'Azur",
+    "lyon": "Auvergne-Rhône-Alpes",
+    "toulouse": "Occitanie",
+    "nice": "Provence-Alpes-Côte d'Azur",
+    "nantes": "Pays de la Loire",
+    "strasbourg": "Grand Est",
+    "montpellier": "Occitanie",
+    "bordeaux": "Nouvelle-Aquitaine",
+    "lille": "Hauts-de-France",
+    "rennes": "Bretagne",
+    "reims": "Grand Est",
+    "toulon": "Provence-Alpes-Côte d'Azur",
+    "grenoble": "Auvergne-Rhône-Alpes",
+    "dijon": "Bourgogne-Franche-Comté",
+    "angers": "Pays de la Loire",
+    "nimes": "Occitanie",
+    "villeurbanne": "Auvergne-Rhône-Alpes"
+}
+
+COUNTRY_REGIONS = {
+    "NL": NL_PROVINCES,
+    "FR": FR_REGIONS,
+    "DE": DE_REGIONS,
+    "UK": UK_REGIONS,
+    "GB": UK_REGIONS,
+    "BE": BE_REGIONS
+}
+
+COUNTRY_CITIES = {
+    "NL": NL_CITIES,
+    "FR": FR_CITIES
+}
+
+# Region and city tables per record type: the sheep farm script has its own
+# Dutch table and no city tables
+RECORD_TYPE_TABLES = {
+    "solar_parks": (COUNTRY_REGIONS, COUNTRY_CITIES),
+    "sheep_farms": (dict(COUNTRY_REGIONS, NL=NL_FARM_REGIONS), {})
+}
+
+
+def _trie_pattern(keywords):
+    """Build a regex alternation shaped like a trie, so each position is tried in O(keyword length)."""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # Greedy optional tail: the longest keyword is tried first
+        return "(?:" + body + ")?" if "" in node else body
+
+    return build(trie)
+
+
+def _compile_gazetteer(regions):
+    """Compile a region table into (pattern, keyword -> (rank of its region in the table, region))."""
+    keyword_to_region = {}
+    for rank, (region, keywords) in enumerate(regions.items()):
+        for keyword in text_fold.fold_keywords(keywords):
+            # Keywords listed under several regions keep the first region, as the old scans did
+            keyword_to_region.setdefault(keyword, (rank, region))
+
+    if not keyword_to_region:
+        return None, keyword_to_region
+
+    # Whole words only, so "ain" no longer matches inside "saint"
+    pattern = re.compile(r"(?<!\w)" + _trie_pattern(keyword_to_region) + r"(?!\w)")
+    return pattern, keyword_to_region
+
+
+_GAZETTEERS = {
+    record_type: {code: _compile_gazetteer(regions) for code, regions in tables[0].items()}
+    for record_type, tables in RECORD_TYPE_TABLES.items()
+}
+
+
+def match_region(country_code, address, city, record_type="solar_parks"):
+    """Return the best keyword-matched region for an address and city, or "" if none matches.
+
+    record_type picks the tables of the solar park or the sheep farm scripts.
+    """
+    if not address and not city:
+        return ""
+
+    pattern, keyword_to_region = _GAZETTEERS[record_type].get(country_code, (None, {}))
+    search_text = text_fold.fold(address) + " " + text_fold.fold(city)
+
+    if pattern is not None:
+        # As in the old scans, the region listed first in the table wins; at one
+        # position the longest keyword is matched, so "loire-atlantique" is not "loire"
+        best = None
+        for match in pattern.finditer(search_text):
+            hit = keyword_to_region[match.group(0)]
+            if best is None or hit[0] < best[0]:
+                best = hit
+        if best is not None:
+            return best[1]
+
+    cities = RECORD_TYPE_TABLES[record_type][1].get(country_code)
+    if cities and city:
+        return cities.get(text_fold.fold(city), "")
+
+    return ""
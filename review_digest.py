@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Bounded-memory review digest for the Ombaa ingest scripts.
+Google Places items carry every review, but the extractors only need a few
+informative texts. Reviews are streamed through a small heap that keeps the top-k
+texts (those mentioning an area or flock size first, then the longest) within a
+byte budget, and the rest are dropped as soon as the item is parsed.
+"""
+
+import heapq
+
+import numeric_extractor
+
+# Review texts kept per item
+DIGEST_SIZE = 3
+
+# Upper bound on the UTF-8 size of the texts kept per item
+DIGEST_BYTE_BUDGET = 16 * 1024
+
+
+def _clip(text, byte_budget):
+    data = text.encode('utf-8')
+    if len(data) <= byte_budget:
+        return text
+    return data[:byte_budget].decode('utf-8', errors='ignore')
+
+
+class ReviewDigest:
+    """Keeps the k most informative review texts seen so far, within a byte budget."""
+
+    def __init__(self, k=DIGEST_SIZE, byte_budget=DIGEST_BYTE_BUDGET):
+        self.k = k
+        self.byte_budget = byte_budget
+        self._heap = []
+        self._seen = 0
+
+    def add(self, text):
+        if not text or self.k <= 0:
+            return
+        # Earlier reviews win ties, as with the old "strictly longer" scan
+        self._seen += 1
+        entry = (numeric_extractor.has_quantity(text), len(text), -self._seen, _clip(text, self.byte_budget))
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def texts(self):
+        """Kept texts, most informative first, trimmed so together they fit the byte budget."""
+        kept = []
+        remaining = self.byte_budget
+        for _, _, _, text in sorted(self._heap, reverse=True):
+            size = len(text.encode('utf-8'))
+            if size > remaining:
+                if not kept:
+                    kept.append(_clip(text, remaining))
+                break
+            kept.append(text)
+            remaining -= size
+        return kept
+
+
+def digest_reviews(reviews, k=DIGEST_SIZE, byte_budget=DIGEST_BYTE_BUDGET):
+    """Reduce a list of Google Places reviews to its most informative texts."""
+    digest = ReviewDigest(k, byte_budget)
+    for review in reviews or []:
+        digest.add(review.get('text'))
+    return digest.texts()
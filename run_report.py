@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Run reports for the Ombaa ingest and combine scripts.
+A RunReport collects the wall and CPU time spent in each pipeline stage
+(parsing, classification, extraction, writing, ...), the items going in and
+out, and per extractor how often each outcome occurred, e.g. how often the
+hectares came from a review and how often they fell back to the country
+default. Worker processes fill their own report per chunk and send it back as
+a plain dict for the parent to merge. The report is saved as JSON next to the
+output it describes.
+"""
+
+import json
+import os
+import time
+from collections import Counter
+
+# Laps run several times per item, so skip the attribute lookups
+_wall_clock = time.perf_counter
+_cpu_clock = time.process_time
+
+
+def report_path(output_file):
+    """Run report kept next to an output file."""
+    name = output_file[:-3] if output_file.endswith('.gz') else output_file
+    return os.path.splitext(name)[0] + ".report.json"
+
+
+class StageTimer:
+    """Attributes the wall and CPU time since the previous lap to a stage."""
+
+    __slots__ = ("stages", "wall", "cpu")
+
+    def __init__(self, stages):
+        self.stages = stages
+        self.reset()
+
+    def reset(self):
+        """Start timing from now, dropping the time since the previous lap."""
+        self.wall = _wall_clock()
+        self.cpu = _cpu_clock()
+
+    def lap(self, stage):
+        wall = _wall_clock()
+        cpu = _cpu_clock()
+        try:
+            totals = self.stages[stage]
+        except KeyError:
+            totals = self.stages[stage] = [0.0, 0.0, 0]
+        totals[0] += wall - self.wall
+        totals[1] += cpu - self.cpu
+        totals[2] += 1
+        self.wall = wall
+        self.cpu = cpu
+
+
+class RunReport:
+    """Stage timings, item counts and extractor outcome counts of one run."""
+
+    def __init__(self, name):
+        self.name = name
+        self.started = time.time()
+        self._start = time.perf_counter()
+        self.stages = {}      # stage -> [wall seconds, CPU seconds, laps]
+        self.items = Counter()
+        self.extractors = {}  # extractor -> Counter of outcomes
+        self.summary = {}
+
+    def timer(self):
+        """A StageTimer adding to this report, started now."""
+        return StageTimer(self.stages)
+
+    def count(self, extractor, outcome, n=1):
+        """Record an outcome ("review", "default", ...) of an extractor."""
+        outcomes = self.extractors.get(extractor)
+        if outcomes is None:
+            outcomes = self.extractors[extractor] = Counter()
+        outcomes[outcome] += n
+
+    def to_dict(self):
+        """Raw counts and timings, as sent back by worker processes."""
+        return {
+            "stages": self.stages,
+            "items": dict(self.items),
+            "extractors": {name: dict(outcomes) for name, outcomes in self.extractors.items()}
+        }
+
+    def merge(self, data):
+        """Add the counts and timings of another report's to_dict()."""
+        for stage, (wall, cpu, laps) in data["stages"].items():
+            totals = self.stages.setdefault(stage, [0.0, 0.0, 0])
+            totals[0] += wall
+            totals[1] += cpu
+            totals[2] += laps
+        self.items.update(data["items"])
+        for extractor, outcomes in data["extractors"].items():
+            self.extractors.setdefault(extractor, Counter()).update(outcomes)
+
+    def as_json(self):
+        """The machine-readable report: stage times summed over all processes, and outcome rates."""
+        extractors = {}
+        for extractor, outcomes in self.extractors.items():
+            total = sum(outcomes.values())
+            extractors[extractor] = {
+                outcome: {"count": n, "rate": round(n / total, 4)}
+                for outcome, n in outcomes.most_common()
+            }
+        return {
+            "name": self.name,
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(self.started)),
+            "elapsed_seconds": round(time.perf_counter() - self._start, 3),
+            "items": dict(self.items),
+            "stages": {
+                stage: {"wall_seconds": round(wall, 3), "cpu_seconds": round(cpu, 3), "laps": laps}
+                for stage, (wall, cpu, laps) in self.stages.items()
+            },
+            "extractors": extractors,
+            "summary": self.summary
+        }
+
+    def save(self, output_file):
+        """Write the report next to output_file and return its path."""
+        path = report_path(output_file)
+        temp_file = path + ".tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.as_json(), f, indent=2, ensure_ascii=False)
+        os.replace(temp_file, path)
+        return path
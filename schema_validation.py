@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Schema validation with quarantine for the Ombaa ingest and combine scripts.
+A schema maps dotted field paths ("location.lat") to a Field rule. It is
+compiled once into the source of a single straight-line validate function
+(exact-class type tests, inline loops over list elements, error messages only
+formatted on failure), so no schema is interpreted at run time. Raw
+Apify items are validated before they are compacted, and processed records
+before they are combined. Invalid rows are written with their reasons to a
+quarantine file next to the output, and the stream moves on without them.
+"""
+
+import json
+import os
+from collections import namedtuple
+
+import checkpoint
+
+# types: accepted Python types; required: must be present, not None and, for strings, not blank;
+# minimum and maximum bound numbers; each: rule for every element of a list, a Field or a schema dict
+Field = namedtuple("Field", ["types", "required", "minimum", "maximum", "each"],
+                   defaults=(False, None, None, None))
+
+NUMBER = (int, float)
+
+# Raw Google Places items: only what the extractors read, typed so that compaction cannot crash
+RAW_ITEM_SCHEMA = {
+    "title": Field((str,)),
+    "categories": Field((list,), each=Field((str,))),
+    "description": Field((str,)),
+    "address": Field((str,)),
+    "city": Field((str,)),
+    "phone": Field((str,)),
+    "website": Field((str,)),
+    "placeId": Field((str,)),
+    "location": Field((dict,)),
+    "location.lat": Field(NUMBER, minimum=-90, maximum=90),
+    "location.lng": Field(NUMBER, minimum=-180, maximum=180),
+    "reviews": Field((list,), each={"text": Field((str,))})
+}
+
+_RECORD_SCHEMA = {
+    "id": Field((str,)),
+    "name": Field((str,), required=True),
+    "country": Field((str,), required=True),
+    "location": Field((str,)),
+    "region": Field((str,)),
+    "coordinates": Field((dict,), required=True),
+    "coordinates.latitude": Field(NUMBER, required=True, minimum=-90, maximum=90),
+    "coordinates.longitude": Field(NUMBER, required=True, minimum=-180, maximum=180),
+    "place_id": Field((str,))
+}
+
+# Processed records as the combine step, the snapshot and the matcher expect them
+SOLAR_PARK_SCHEMA = dict(_RECORD_SCHEMA, total_hectares=Field(NUMBER, required=True, minimum=0))
+SHEEP_FARM_SCHEMA = dict(_RECORD_SCHEMA, flock_size=Field((int,), required=True, minimum=1))
+
+
+def _type_names(types):
+    return " or ".join("number" if t is float else "object" if t is dict else t.__name__
+                       for t in types if t is not int or float not in types)
+
+
+def _emit_value(lines, indent, value, field, label, depth, constants, none_is_missing=False):
+    """Append the checks of one field rule on the variable named value."""
+    pad = "    " * indent
+    types = f"T{len(constants)}"
+    # Exact classes, as the JSON decoder produces them; this also keeps bool out of the numbers
+    constants[types] = frozenset(field.types)
+
+    lines.append(f"{pad}if {value} is None:")
+    lines.append(f"{pad}    errors.append(f\"{label} is missing\")" if field.required or none_is_missing
+                 else f"{pad}    pass")
+    lines.append(f"{pad}elif {value}.__class__ not in {types}:")
+    lines.append(f"{pad}    errors.append(f\"{label} is {{type({value}).__name__}}, expected {_type_names(field.types)}\")")
+    if field.required and str in field.types:
+        lines.append(f"{pad}elif {value}.__class__ is str and not {value}.strip():")
+        lines.append(f"{pad}    errors.append(f\"{label} is empty\")")
+    if field.minimum is not None and field.maximum is not None:
+        lines.append(f"{pad}elif not ({field.minimum!r} <= {value} <= {field.maximum!r}):")
+        lines.append(f"{pad}    errors.append(f\"{label} is {{{value}}}, outside {field.minimum} to {field.maximum}\")")
+    elif field.minimum is not None:
+        lines.append(f"{pad}elif not {value} >= {field.minimum!r}:")
+        lines.append(f"{pad}    errors.append(f\"{label} is {{{value}}}, below {field.minimum}\")")
+    elif field.maximum is not None:
+        lines.append(f"{pad}elif not {value} <= {field.maximum!r}:")
+        lines.append(f"{pad}    errors.append(f\"{label} is {{{value}}}, above {field.maximum}\")")
+
+    if field.each is not None:
+        index, element = f"i{depth}", f"e{depth}"
+        element_label = f"{label}[{{{index}}}]"
+        lines.append(f"{pad}else:")
+        lines.append(f"{pad}    for {index}, {element} in enumerate({value}):")
+        if isinstance(field.each, Field):
+            _emit_value(lines, indent + 2, element, field.each, element_label, depth + 1, constants,
+                        none_is_missing=True)
+        else:
+            _emit_value(lines, indent + 2, element, Field((dict,)), element_label, depth + 1, constants,
+                        none_is_missing=True)
+            lines.append(f"{pad}        else:")
+            _emit_fields(lines, indent + 3, element, field.each, element_label + ".", depth + 1, constants)
+
+
+def _emit_fields(lines, indent, record, schema, prefix, depth, constants):
+    """Append the checks of every field of a schema on the dict variable named record."""
+    pad = "    " * indent
+    value = f"v{depth}"
+    for path, field in schema.items():
+        keys = path.split('.')
+        lines.append(f"{pad}{value} = {record}.get({keys[0]!r})")
+        for key in keys[1:]:
+            # A parent of the wrong type is reported by its own rule
+            lines.append(f"{pad}{value} = {value}.get({key!r}) if {value}.__class__ is dict else None")
+        _emit_value(lines, indent, value, field, prefix + path, depth, constants)
+
+
+def compile_schema(schema):
+    """Python source of a validate(record, errors, prefix) function for a schema, and the function itself."""
+    lines = [
+        "def validate(record, errors, prefix):",
+        "    if record.__class__ is not dict:",
+        "        errors.append(f\"{prefix or 'record'} is {type(record).__name__}, expected object\")",
+        "        return"
+    ]
+    constants = {}
+    _emit_fields(lines, 1, "record", schema, "{prefix}", 0, constants)
+    source = "\n".join(lines) + "\n"
+    namespace = dict(constants)
+    exec(compile(source, "<schema>", "exec"), namespace)
+    return source, namespace["validate"]
+
+
+class Validator:
+    """A schema compiled into one validate function; errors() lists what is wrong with one record."""
+
+    def __init__(self, schema):
+        self.source, self._validate = compile_schema(schema)
+
+    def errors(self, record):
+        """Reasons a record is invalid; empty if it is valid."""
+        errors = []
+        self._validate(record, errors, "")
+        return errors
+
+    def validate_batch(self, records):
+        """(index, reasons) of every invalid record in a batch."""
+        validate = self._validate
+        invalid = []
+        for index, record in enumerate(records):
+            errors = []
+            validate(record, errors, "")
+            if errors:
+                invalid.append((index, errors))
+        return invalid
+
+
+RAW_ITEMS = Validator(RAW_ITEM_SCHEMA)
+SOLAR_PARKS = Validator(SOLAR_PARK_SCHEMA)
+SHEEP_FARMS = Validator(SHEEP_FARM_SCHEMA)
+
+
+def quarantine_path(output_file):
+    """Quarantine file kept next to an output file."""
+    name = output_file[:-3] if output_file.endswith('.gz') else output_file
+    return os.path.splitext(name)[0] + ".quarantine.jsonl"
+
+
+class Quarantine:
+    """Invalid rows of one run, one JSON line each with their source, position and reasons.
+
+    The file is only created once something is quarantined; a stale one from an
+    earlier run is removed up front. resume is the state returned by sync() at
+    a checkpoint, from which the file is continued instead.
+    """
+
+    def __init__(self, output_file, resume=None):
+        self.path = quarantine_path(output_file)
+        self.count = resume["count"] if resume else 0
+        self._file = None
+        if resume and resume["offset"]:
+            self._file = checkpoint.OutputStream(self.path, resume["offset"])
+        elif os.path.exists(self.path):
+            os.remove(self.path)
+
+    def add(self, source, index, reasons, row):
+        if self._file is None:
+            self._file = checkpoint.OutputStream(self.path)
+        self._file.write(json.dumps({"source": source, "index": index, "reasons": reasons, "row": row},
+                                    ensure_ascii=False, default=repr) + "\n")
+        self.count += 1
+
+    def sync(self):
+        """Make the rows quarantined so far durable; returns the state to resume from."""
+        return {"count": self.count, "offset": self._file.sync() if self._file is not None else 0}
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Columnar binary snapshot of the combined Ombaa datasets.
+The solar parks and sheep farms are stored column by column: coordinates,
+size and country code (an index into the header's country list) as
+fixed-width little-endian arrays, and record IDs,
+names, addresses, regions and place IDs as UTF-8 string tables (an offsets array plus
+one blob per column). Every column starts on an 8-byte boundary, so a reader
+maps the file once and views each column in place: numpy here, typed arrays in
+the web app (lib/snapshot.ts).
+
+Layout: the 8-byte magic, a little-endian uint32 header length, the JSON
+header, padding to 8 bytes, then the data section. Column offsets in the
+header are relative to the start of the data section.
+"""
+
+import argparse
+import json
+import os
+import struct
+import time
+
+import numpy as np
+
+import dedup
+import ingest_engine
+
+MAGIC = b"OMBAASNP"
+FORMAT_VERSION = 3
+ALIGNMENT = 8
+
+# The first country codes; other countries in the data get the next codes, in order of appearance
+COUNTRIES = ["Netherlands", "United Kingdom", "France", "Germany", "Belgium"]
+
+# Country codes are one byte
+MAX_COUNTRIES = 256
+
+# String offsets are uint32, so one string column holds at most this many bytes
+MAX_STRING_BYTES = 2 ** 32 - 1
+
+# Per table: fixed-width columns (name, dtype, value getter) and string columns
+TABLES = {
+    "solar_parks": {
+        "columns": [
+            ("latitude", "<f8", lambda r: (r.get('coordinates') or {}).get('latitude')),
+            ("longitude", "<f8", lambda r: (r.get('coordinates') or {}).get('longitude')),
+            ("total_hectares", "<f8", lambda r: r.get('total_hectares')),
+            ("country", "u1", lambda r: r.get('country'))
+        ],
+        "strings": ["id", "name", "location", "region", "place_id"]
+    },
+    "sheep_farms": {
+        "columns": [
+            ("latitude", "<f8", lambda r: (r.get('coordinates') or {}).get('latitude')),
+            ("longitude", "<f8", lambda r: (r.get('coordinates') or {}).get('longitude')),
+            ("flock_size", "<i4", lambda r: r.get('flock_size')),
+            ("country", "u1", lambda r: r.get('country'))
+        ],
+        "strings": ["id", "name", "location", "region", "place_id"]
+    }
+}
+
+# Combined datasets and the snapshot built from them when run as a script
+SOLAR_PARKS_FILE = "/home/ubuntu/processed_solar_parks_combined.json"
+SHEEP_FARMS_FILE = "/home/ubuntu/processed_sheep_farms_combined.json"
+SNAPSHOT_FILE = "/home/ubuntu/ombaa_snapshot.bin"
+
+def _cell(dtype, value, country_codes):
+    if dtype == "u1":
+        country = value or ""
+        code = country_codes.setdefault(country, len(country_codes))
+        if code >= MAX_COUNTRIES:
+            raise ValueError(f"More than {MAX_COUNTRIES} countries; {country!r} has no country code left")
+        return code
+    if dtype == "<f8":
+        # Missing numbers are NaN
+        return float("nan") if value is None else float(value)
+    return 0 if value is None else int(value)
+
+
+def _pad(size):
+    return -size % ALIGNMENT
+
+
+def _source_fingerprint(path):
+    # Nanoseconds, so a rewrite within the same second is noticed; a string, as
+    # JavaScript numbers cannot hold them exactly
+    stat = os.stat(path)
+    return [path, stat.st_size, str(stat.st_mtime_ns)]
+
+
+def _build_table(records, spec, country_codes):
+    """Column arrays and string tables of one table, as (name, bytes) sections plus header entries.
+
+    Countries missing from country_codes (country -> code) are added to it.
+    """
+    values = {name: [] for name, _, _ in spec["columns"]}
+    strings = {name: [] for name in spec["strings"]}
+    count = 0
+
+    for record in records:
+        # The same ID the web app is given for a record that predates IDs
+        record = dedup.with_record_id(record)
+        for name, dtype, get in spec["columns"]:
+            values[name].append(_cell(dtype, get(record), country_codes))
+        for name in spec["strings"]:
+            strings[name].append((record.get(name) or "").encode('utf-8'))
+        count += 1
+
+    sections = []
+    columns = {}
+    for name, dtype, _ in spec["columns"]:
+        sections.append(np.asarray(values[name], dtype=dtype).tobytes())
+        columns[name] = {"dtype": dtype, "section": len(sections) - 1}
+    string_columns = {}
+    for name in spec["strings"]:
+        lengths = np.fromiter((len(s) for s in strings[name]), dtype=np.int64, count=count)
+        ends = np.cumsum(lengths)
+        if count and ends[-1] > MAX_STRING_BYTES:
+            raise ValueError(f"The {name} strings take {ends[-1]} bytes, more than the "
+                             f"{MAX_STRING_BYTES} a string column can address")
+        offsets = np.zeros(count + 1, dtype="<u4")
+        offsets[1:] = ends
+        sections.append(offsets.tobytes())
+        sections.append(b"".join(strings[name]))
+        string_columns[name] = {"offsets": len(sections) - 2, "data": len(sections) - 1}
+
+    return count, sections, columns, string_columns
+
+
+def write_snapshot(solar_parks_file, sheep_farms_file, snapshot_file):
+    """Build the snapshot from the combined files (JSON array or NDJSON); returns the row count per table."""
+    sources = {"solar_parks": solar_parks_file, "sheep_farms": sheep_farms_file}
+    header = {"version": FORMAT_VERSION, "countries": None, "tables": {}, "sources": {}}
+    sections = []
+    country_codes = {country: code for code, country in enumerate(COUNTRIES)}
+
+    for table, spec in TABLES.items():
+        count, table_sections, columns, string_columns = _build_table(
+            ingest_engine.iter_records(sources[table]), spec, country_codes)
+        base = len(sections)
+        sections.extend(table_sections)
+        header["tables"][table] = {
+            "count": count,
+            "columns": {name: {"dtype": c["dtype"], "offset": base + c["section"]} for name, c in columns.items()},
+            "strings": {name: {"offsets": base + s["offsets"], "data": base + s["data"]}
+                        for name, s in string_columns.items()}
+        }
+        header["sources"][table] = _source_fingerprint(sources[table])
+    header["countries"] = list(country_codes)
+
+    # Turn section numbers into byte offsets within the data section
+    offsets = []
+    position = 0
+    for section in sections:
+        offsets.append(position)
+        position += len(section) + _pad(len(section))
+    for table in header["tables"].values():
+        for column in table["columns"].values():
+            column["offset"] = offsets[column["offset"]]
+        for column in table["strings"].values():
+            column["size"] = len(sections[column["data"]])
+            column["offsets"] = offsets[column["offsets"]]
+            column["data"] = offsets[column["data"]]
+
+    header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    prefix_size = len(MAGIC) + 4 + len(header_bytes)
+
+    temp_file = snapshot_file + ".tmp"
+    with open(temp_file, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<I', len(header_bytes)))
+        f.write(header_bytes)
+        f.write(b"\0" * _pad(prefix_size))
+        for section in sections:
+            f.write(section)
+            f.write(b"\0" * _pad(len(section)))
+    os.replace(temp_file, snapshot_file)
+
+    return {table: entry["count"] for table, entry in header["tables"].items()}
+
+
+class SnapshotTable:
+    """One table of a mapped snapshot: fixed-width columns as numpy views, strings decoded on access."""
+
+    def __init__(self, buffer, base, entry):
+        self.count = entry["count"]
+        self.columns = {
+            name: np.frombuffer(buffer, dtype=column["dtype"], count=self.count, offset=base + column["offset"])
+            for name, column in entry["columns"].items()
+        }
+        self._strings = {
+            name: (np.frombuffer(buffer, dtype="<u4", count=self.count + 1, offset=base + column["offsets"]),
+                   np.frombuffer(buffer, dtype="u1", count=column["size"], offset=base + column["data"]))
+            for name, column in entry["strings"].items()
+        }
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def string(self, name, index):
+        """The string of one row in a string column."""
+        offsets, data = self._strings[name]
+        return data[offsets[index]:offsets[index + 1]].tobytes().decode('utf-8')
+
+    def strings(self, name):
+        """Every string of a string column, in row order."""
+        offsets, data = self._strings[name]
+        blob = data.tobytes()
+        bounds = offsets.tolist()
+        return [blob[start:end].decode('utf-8') for start, end in zip(bounds, bounds[1:])]
+
+
+class Snapshot:
+    """A snapshot file mapped read-only; tables are available by name."""
+
+    def __init__(self, snapshot_file):
+        self.path = snapshot_file
+        self._buffer = np.memmap(snapshot_file, dtype=np.uint8, mode='r')
+        if self._buffer[:len(MAGIC)].tobytes() != MAGIC:
+            raise ValueError(f"{snapshot_file} is not an Ombaa snapshot")
+        (header_size,) = struct.unpack('<I', self._buffer[len(MAGIC):len(MAGIC) + 4].tobytes())
+        prefix_size = len(MAGIC) + 4 + header_size
+        self.header = json.loads(self._buffer[len(MAGIC) + 4:prefix_size].tobytes().decode('utf-8'))
+        if self.header["version"] != FORMAT_VERSION:
+            raise ValueError(f"{snapshot_file} has snapshot format {self.header['version']}, expected {FORMAT_VERSION}")
+
+        base = prefix_size + _pad(prefix_size)
+        self.countries = self.header["countries"]
+        self.tables = {name: SnapshotTable(self._buffer, base, entry) for name, entry in self.header["tables"].items()}
+
+    def __getitem__(self, table):
+        return self.tables[table]
+
+    def is_current(self, solar_parks_file, sheep_farms_file):
+        """Whether the snapshot was built from the given files as they are now."""
+        sources = {"solar_parks": solar_parks_file, "sheep_farms": sheep_farms_file}
+        return all(os.path.exists(path) and self.header["sources"].get(table) == _source_fingerprint(path)
+                   for table, path in sources.items())
+
+
+def load_snapshot(snapshot_file=SNAPSHOT_FILE):
+    """Map a snapshot file."""
+    return Snapshot(snapshot_file)
+
+
+def load_or_build(solar_parks_file=SOLAR_PARKS_FILE, sheep_farms_file=SHEEP_FARMS_FILE, snapshot_file=SNAPSHOT_FILE):
+    """Map the snapshot, rebuilding it first if it is missing, of another format or older than the combined files."""
+    if os.path.exists(snapshot_file):
+        try:
+            snapshot = Snapshot(snapshot_file)
+        except ValueError:
+            snapshot = None
+        if snapshot is not None and snapshot.is_current(solar_parks_file, sheep_farms_file):
+            return snapshot
+    write_snapshot(solar_parks_file, sheep_farms_file, snapshot_file)
+    return Snapshot(snapshot_file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the columnar snapshot of the combined Ombaa datasets.")
+    parser.add_argument("--solar-parks", default=SOLAR_PARKS_FILE, help="combined solar parks (default: %(default)s)")
+    parser.add_argument("--sheep-farms", default=SHEEP_FARMS_FILE, help="combined sheep farms (default: %(default)s)")
+    parser.add_argument("--output", default=SNAPSHOT_FILE, help="snapshot file (default: %(default)s)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    counts = write_snapshot(args.solar_parks, args.sheep_farms, args.output)
+    elapsed = time.perf_counter() - start
+    print(f"Snapshot of {counts['solar_parks']} solar parks and {counts['sheep_farms']} sheep farms "
+          f"saved to {args.output} in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Solar park classifier for the Ombaa ingest scripts.
+Built once per country from its solar and park keyword sets, it decides whether
+a Google Places item is a solar park and says why, so the keyword filters can be
+tuned from a report without rerunning the whole pipeline.
+"""
+
+import argparse
+import importlib
+import json
+import re
+from collections import Counter, namedtuple
+
+import ingest_engine
+import text_fold
+
+# rule names the test that decided: "title", "category", "no_park_keyword" or "no_solar_keyword"
+Classification = namedtuple("Classification", ["accepted", "reason", "rule"])
+
+
+def _keyword_pattern(keywords):
+    # Keywords match anywhere in the folded text ("zon" in "zonnepark"), longest first
+    return re.compile("|".join(sorted((re.escape(kw) for kw in text_fold.fold_keywords(keywords)),
+                                      key=len, reverse=True)))
+
+
+class SolarParkClassifier:
+    """Accepts a title with a solar and a park keyword, or any category with a solar keyword."""
+
+    def __init__(self, solar_keywords, park_keywords):
+        self.solar_pattern = _keyword_pattern(solar_keywords)
+        self.park_pattern = _keyword_pattern(park_keywords)
+
+    def classify(self, title, categories):
+        """Classify one title and its list of categories."""
+        title = text_fold.fold(title)
+
+        solar_match = self.solar_pattern.search(title)
+        if solar_match:
+            park_match = self.park_pattern.search(title)
+            if park_match:
+                return Classification(True, f"title has solar '{solar_match.group(0)}' and park '{park_match.group(0)}'",
+                                      "title")
+
+        for category in categories or []:
+            category_match = self.solar_pattern.search(text_fold.fold(category))
+            if category_match:
+                return Classification(True, f"category '{category}' has solar '{category_match.group(0)}'",
+                                      "category")
+
+        if solar_match:
+            return Classification(False, f"title has solar '{solar_match.group(0)}' but no park keyword",
+                                  "no_park_keyword")
+        return Classification(False, "no solar keyword in title or categories", "no_solar_keyword")
+
+    def classify_batch(self, titles, categories_list):
+        """Classify many titles with their category lists in one call."""
+        classify = self.classify
+        return [classify(title, categories) for title, categories in zip(titles, categories_list)]
+
+
+# (solar keywords, park keywords) -> classifier
+_CLASSIFIERS = {}
+
+
+def classifier_for(plugin):
+    """The classifier for a plugin's keyword sets, built on first use and reused afterwards."""
+    # Keyed on the keywords, not the country code, so a plugin with edited keywords gets its own
+    key = (tuple(plugin["solar_keywords"]), tuple(plugin["park_keywords"]))
+    classifier = _CLASSIFIERS.get(key)
+    if classifier is None:
+        classifier = SolarParkClassifier(*key)
+        _CLASSIFIERS[key] = classifier
+    return classifier
+
+
+def write_classification_report(input_file, report_file, plugin, batch_size=1000):
+    """Classify every item of an Apify dump and write one JSON line per item; returns reason counts."""
+    classifier = classifier_for(plugin)
+    reasons = Counter()
+
+    def flush(batch, f):
+        results = classifier.classify_batch([item.get('title') for item in batch],
+                                            [item.get('categories') for item in batch])
+        for item, result in zip(batch, results):
+            # Group by the rule rather than the exact keyword
+            reasons[(result.accepted, re.sub(r"'[^']*'", "'…'", result.reason))] += 1
+            f.write(json.dumps({
+                "title": item.get('title'),
+                "categories": item.get('categories'),
+                "accepted": result.accepted,
+                "reason": result.reason
+            }, ensure_ascii=False) + "\n")
+
+    with open(report_file, 'w', encoding='utf-8') as f:
+        batch = []
+        for item in ingest_engine.iter_json_array(input_file):
+            batch.append({"title": item.get('title'), "categories": item.get('categories')})
+            if len(batch) >= batch_size:
+                flush(batch, f)
+                batch = []
+        if batch:
+            flush(batch, f)
+
+    return reasons
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a per-item solar park classification report.")
+    parser.add_argument("country", choices=list(ingest_engine.COUNTRY_PLUGINS), help="country code")
+    parser.add_argument("report_file", help="JSON lines report to write")
+    parser.add_argument("--input", help="Apify dataset (default: the country script's INPUT_FILE)")
+    args = parser.parse_args()
+
+    module = importlib.import_module(ingest_engine.COUNTRY_PLUGINS[args.country])
+    reasons = write_classification_report(args.input or module.INPUT_FILE, args.report_file, module.PLUGIN)
+
+    for (accepted, reason), count in reasons.most_common():
+        print(f"{'accepted' if accepted else 'rejected'}  {count:>8}  {reason}")
+    print(f"Report saved to {args.report_file}")
+
+
+if __name__ == "__main__":
+    main()
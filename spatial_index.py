@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Spatial grid index for matching Ombaa solar parks with nearby sheep farms.
+Points are bucketed into cells of about equal size in degrees of latitude
+and longitude. A radius search looks up the cells under the exact bounding box
+of the search circle on the sphere: latitudes within radius / R of the
+centre, and longitudes within asin(sin(radius / R) / cos(latitude)), or all
+of them when the circle reaches a pole. Every point within the radius is
+therefore a candidate, and the caller applies its own distance test to the
+candidates, so the matches equal those of a full scan.
+"""
+
+import math
+
+# Same Earth radius as integrate_directory.calculate_distance
+EARTH_RADIUS_KM = 6371
+
+# Kilometres per degree of latitude
+KM_PER_DEGREE = EARTH_RADIUS_KM * math.pi / 180
+
+# Widens every bounding box so points at exactly the radius survive rounding
+MARGIN_DEGREES = 1e-7
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """(south, north, west, east) in degrees around the circle; west/east are None when every longitude is in range."""
+    angle = radius_km / EARTH_RADIUS_KM
+    delta = math.degrees(angle) + MARGIN_DEGREES
+    south, north = latitude - delta, latitude + delta
+    if south <= -90 or north >= 90:
+        return max(south, -90.0), min(north, 90.0), None, None
+    delta_lng = math.degrees(math.asin(min(1.0, math.sin(angle) / math.cos(math.radians(latitude))))) + MARGIN_DEGREES
+    if delta_lng >= 180:
+        return south, north, None, None
+    return south, north, longitude - delta_lng, longitude + delta_lng
+
+
+class GridIndex:
+    """Positions of points (latitude, longitude), or None for points without a location, bucketed by grid cell.
+
+    add() and remove() keep the index up to date under other keys, e.g. record IDs.
+    """
+
+    def __init__(self, points, cell_km):
+        self.cell_degrees = cell_km / KM_PER_DEGREE
+        # Columns divide the globe exactly, so that longitudes 360 degrees apart share a column
+        self.columns = max(1, math.ceil(360 / self.cell_degrees))
+        self.column_degrees = 360 / self.columns
+        self.cells = {}  # (row, column) -> positions, ascending
+        for position, point in enumerate(points):
+            self.add(position, point)
+
+    def add(self, key, point):
+        if point is not None:
+            self.cells.setdefault(self.cell(*point), []).append(key)
+
+    def remove(self, key, point):
+        """Drop a key added at point."""
+        if point is None:
+            return
+        cell = self.cell(*point)
+        keys = self.cells[cell]
+        keys.remove(key)
+        if not keys:
+            del self.cells[cell]
+
+    def cell(self, latitude, longitude):
+        """(row, column) of the cell containing a point."""
+        return (math.floor((latitude + 90) / self.cell_degrees),
+                math.floor((longitude + 180) / self.column_degrees) % self.columns)
+
+    def candidates(self, latitude, longitude, radius_km):
+        """Keys of the points in the cells under the bounding box of a circle, cell by cell."""
+        south, north, west, east = bounding_box(latitude, longitude, radius_km)
+        size = self.cell_degrees
+        rows = range(math.floor((south + 90) / size), math.floor((north + 90) / size) + 1)
+        size = self.column_degrees
+        if west is None:
+            columns = range(self.columns)
+        else:
+            first = math.floor((west + 180) / size)
+            last = math.floor((east + 180) / size)
+            # Wrap around the antimeridian, without visiting a column twice
+            columns = [column % self.columns for column in range(first, min(last, first + self.columns - 1) + 1)]
+
+        cells = self.cells
+        found = []
+        for row in rows:
+            for column in columns:
+                positions = cells.get((row, column))
+                if positions is not None:
+                    found.extend(positions)
+        return found
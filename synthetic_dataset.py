@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Synthetic Apify Google Places datasets for the Ombaa ingest scripts.
+Generates items shaped like the crawler-google-places export (title, categories,
+address with a real postcode, coordinates, place ID, review array, ...) for the
+five countries, with titles and reviews in the local languages. A scrape is a
+mix of what the process_* scripts must keep (solar parks or sheep farms, often
+with an area, capacity or flock size in a review) and what they must drop
+(installers, energy suppliers, shops), plus the odd item found twice. Output
+is deterministic for a given seed and is streamed, so 1M items fit anywhere.
+"""
+
+import argparse
+import os
+import random
+from collections import deque
+
+import ingest_engine
+
+# Dataset sizes by name
+SCALES = {"10k": 10_000, "100k": 100_000, "1M": 1_000_000}
+
+KINDS = ("solar_parks", "sheep_farms")
+
+# Per country: name, address layout, and (city, postcode, latitude, longitude) to scatter items around.
+# The postcodes are real for each city, so postal and gazetteer region lookups both have work to do.
+COUNTRY_PROFILES = {
+    "NL": {
+        "country": "Netherlands",
+        "address": "{street} {number}, {postcode} {city}, Nederland",
+        "streets": ["Hoofdstraat", "Kerkstraat", "Dorpsweg", "Industrieweg", "Molenweg", "Polderdijk"],
+        "cities": [
+            ("Amsterdam", "1012 AB", 52.37, 4.90), ("Groningen", "9711 CD", 53.22, 6.57),
+            ("Zwolle", "8011 EF", 52.51, 6.09), ("Arnhem", "6811 GH", 51.98, 5.91),
+            ("Utrecht", "3511 JK", 52.09, 5.12), ("Rotterdam", "3011 LM", 51.92, 4.48),
+            ("Eindhoven", "5611 NP", 51.44, 5.48), ("Maastricht", "6211 RS", 50.85, 5.69),
+            ("Lelystad", "8232 TV", 52.52, 5.47), ("Assen", "9401 WX", 52.99, 6.56),
+            ("Leeuwarden", "8911 BC", 53.20, 5.80), ("Middelburg", "4331 DE", 51.50, 3.61),
+            ("Zeddam", "7038 DB", 51.90, 6.26), ("Hijken", "9415 PA", 52.89, 6.50)
+        ]
+    },
+    "UK": {
+        "country": "United Kingdom",
+        "address": "{number} {street}, {city} {postcode}, United Kingdom",
+        "streets": ["Church Lane", "Mill Road", "Station Road", "Farm Lane", "High Street", "Green Lane"],
+        "cities": [
+            ("London", "SW1A 1AA", 51.50, -0.13), ("Norwich", "NR1 2AB", 52.63, 1.30),
+            ("Leeds", "LS1 4DY", 53.80, -1.55), ("Bristol", "BS1 5TR", 51.45, -2.59),
+            ("Truro", "TR1 2HE", 50.26, -5.05), ("Cardiff", "CF10 1AA", 51.48, -3.18),
+            ("Swansea", "SA1 3SN", 51.62, -3.94), ("Newport", "NP20 1GA", 51.59, -3.00),
+            ("Edinburgh", "EH1 1YZ", 55.95, -3.19), ("Aberdeen", "AB10 1XG", 57.15, -2.09),
+            ("Inverness", "IV1 1QY", 57.48, -4.22), ("Belfast", "BT1 5GS", 54.60, -5.93)
+        ]
+    },
+    "FR": {
+        "country": "France",
+        "address": "{number} {street}, {postcode} {city}, France",
+        "streets": ["Rue de la Gare", "Chemin des Vignes", "Route de Lyon", "Rue de l'Église", "Lieu-dit Les Landes"],
+        "cities": [
+            ("Paris", "75001", 48.86, 2.35), ("Lyon", "69001", 45.76, 4.84),
+            ("Marseille", "13001", 43.30, 5.37), ("Toulouse", "31000", 43.60, 1.44),
+            ("Bordeaux", "33000", 44.84, -0.58), ("Nantes", "44000", 47.22, -1.55),
+            ("Montpellier", "34000", 43.61, 3.88), ("Lille", "59000", 50.63, 3.06),
+            ("Strasbourg", "67000", 48.57, 7.75), ("Ajaccio", "20000", 41.93, 8.74),
+            ("Millau", "12100", 44.10, 3.08), ("Gap", "05000", 44.56, 6.08)
+        ]
+    },
+    "DE": {
+        "country": "Germany",
+        "address": "{street} {number}, {postcode} {city}, Deutschland",
+        "streets": ["Hauptstraße", "Bahnhofstraße", "Feldweg", "Industriestraße", "Am Sonnenhang", "Dorfstraße"],
+        "cities": [
+            ("München", "80331", 48.14, 11.58), ("Berlin", "10115", 52.53, 13.38),
+            ("Hamburg", "20095", 53.55, 10.00), ("Leipzig", "04109", 51.34, 12.37),
+            ("Kiel", "24103", 54.32, 10.13), ("Freiburg im Breisgau", "79098", 47.99, 7.85),
+            ("Cottbus", "03046", 51.76, 14.33), ("Rostock", "18055", 54.09, 12.13),
+            ("Hannover", "30159", 52.37, 9.74), ("Köln", "50667", 50.94, 6.96)
+        ]
+    },
+    "BE": {
+        "country": "Belgium",
+        "address": "{street} {number}, {postcode} {city}, België",
+        "streets": ["Kerkstraat", "Rue de la Station", "Steenweg", "Rue du Moulin", "Dorpsstraat"],
+        "cities": [
+            ("Brussel", "1000", 50.85, 4.35), ("Antwerpen", "2000", 51.22, 4.40),
+            ("Gent", "9000", 51.05, 3.72), ("Brugge", "8000", 51.21, 3.22),
+            ("Leuven", "3000", 50.88, 4.70), ("Namur", "5000", 50.47, 4.87),
+            ("Liège", "4000", 50.63, 5.57), ("Mons", "7000", 50.45, 3.95),
+            ("Wavre", "1300", 50.72, 4.61), ("Arlon", "6700", 49.68, 5.82)
+        ]
+    }
+}
+
+# Titles per country and kind: "keep" items are what the pipeline is after, "drop" items are scrape noise
+TITLES = {
+    "solar_parks": {
+        "NL": {"keep": ["Zonnepark {place}", "Zonneveld {place}", "Solarpark {place}", "Zonnepark {place} {mw} MW",
+                        "Zonnecentrale {place}"],
+               "drop": ["Zonnepanelen {place} B.V.", "Bakkerij {surname}", "Installatiebedrijf {surname}",
+                        "Energieleverancier {place}", "Camping De Zon"]},
+        "UK": {"keep": ["{place} Solar Farm", "{place} Solar Park", "{mw}MW {place} Solar Farm",
+                        "{place} Renewable Energy Park", "{place} PV Array"],
+               "drop": ["{surname} Solar Installers Ltd", "{place} Garden Centre", "{surname} & Sons Roofing",
+                        "{place} Farm Shop", "The {place} Arms"]},
+        "FR": {"keep": ["Parc solaire de {place}", "Centrale photovoltaïque de {place}", "Ferme solaire {place}",
+                        "Centrale solaire flottante de {place}", "Parc photovoltaïque {place} {mw} MWc"],
+               "drop": ["{surname} Énergie Solaire", "Boulangerie {surname}", "Installateur photovoltaïque {place}",
+                        "Mairie de {place}", "Garage {surname}"]},
+        "DE": {"keep": ["Solarpark {place}", "Photovoltaik-Freiflächenanlage {place}", "PV-Anlage {place}",
+                        "Sonnenkraftwerk {place}", "Solarfeld {place} {mw} MWp"],
+               "drop": ["{surname} Solartechnik GmbH", "Bäckerei {surname}", "Stadtwerke {place}",
+                        "Autohaus {surname}", "Gasthof zur Sonne"]},
+        "BE": {"keep": ["Zonnepark {place}", "Parc solaire de {place}", "Centrale photovoltaïque {place}",
+                        "Solar Farm {place}", "Zonne-installatie {place}"],
+               "drop": ["{surname} Zonnepanelen", "Boulangerie {surname}", "Brouwerij {surname}",
+                        "Électricien {surname}", "Frituur {place}"]}
+    },
+    "sheep_farms": {
+        "NL": {"keep": ["Schapenhouderij {surname}", "Schaapskudde {place}", "Herder {surname}",
+                        "Schapenboerderij De Kudde", "Zorgboerderij {place}"],
+               "drop": []},
+        "UK": {"keep": ["{place} Sheep Farm", "{surname} Shepherding", "{place} Lamb Co",
+                        "{place} Grazing Services", "{surname} Farms"],
+               "drop": []},
+        "FR": {"keep": ["Bergerie de {place}", "Élevage ovin {surname}", "GAEC {surname}",
+                        "Berger {surname}", "Ferme des Moutons {place}"],
+               "drop": []},
+        "DE": {"keep": ["Schäferei {surname}", "Schafhof {place}", "Wanderschäferei {surname}",
+                        "Schafzucht {surname}", "Hof {place}"],
+               "drop": []},
+        "BE": {"keep": ["Schapenkwekerij {surname}", "Bergerie de {place}", "Herder {surname}",
+                        "Élevage de moutons {surname}", "Schapenboerderij {place}"],
+               "drop": []}
+    }
+}
+
+CATEGORIES = {
+    "solar_parks": {
+        "keep": [["Solar energy company"], ["Power plant"], ["Solar energy equipment supplier", "Power plant"], []],
+        "drop": [["Solar energy system service"], ["Bakery"], ["Electrician"], ["Energy supplier"], ["Restaurant"]]
+    },
+    "sheep_farms": {
+        "keep": [["Sheep farm"], ["Farm"], ["Livestock breeder"], ["Farm", "Butcher shop"], []],
+        "drop": []
+    }
+}
+
+SURNAMES = ["de Vries", "Smith", "Martin", "Müller", "Peeters", "Jansen", "Jones", "Bernard", "Schmidt", "Maes",
+            "van Dijk", "Taylor", "Dubois", "Schneider", "Claes"]
+
+PLACES = {
+    "NL": ["Hijken", "Zeddam", "Vlagtwedde", "Midden-Groningen", "Dronten", "Ede", "Sloegebied", "Goes"],
+    "UK": ["Shotwick", "Lyneham", "Wymeswold", "Owls Hatch", "Cleve Hill", "Elms", "Lark Rise", "Glen Farm"],
+    "FR": ["Cestas", "Toul-Rosières", "Les Mées", "Piolenc", "Marcoussis", "Sainte-Tulle", "Gabardan"],
+    "DE": ["Weesow-Willmersdorf", "Meuro", "Finow", "Lieberose", "Templin", "Eggebek", "Witznitz"],
+    "BE": ["Kristal", "Lommel", "Marche", "Tienen", "Fleurus", "Lanaken", "Beringen", "Nivelles"]
+}
+
+# Review sentences per language; {ha}, {mw}, {flock} and {breed} are filled in, plain text carries no number
+REVIEWS = {
+    "solar_parks": {
+        "en": ["Huge site, about {ha} hectares of panels with sheep grazing between the rows.",
+               "A {mw} MW park on {acres} acres of former farmland, lots of wildflower meadow now.",
+               "Nice walk along the fence, the grass is kept short.", "Good views, very quiet.",
+               "The biodiversity mix around the panels attracts lots of birds."],
+        "nl": ["Mooi zonnepark van {ha} hectare met schapen tussen de panelen.",
+               "Park van {mw} MW, veel gras en bloemen langs de randen.", "Rustige plek, goed onderhouden.",
+               "Het weiland rond de panelen wordt begraasd door een kudde schapen."],
+        "fr": ["Parc de {ha} ha avec prairie et moutons, très bien entretenu.",
+               "Centrale de {mw} MWc, végétation basse et fleurs sauvages.", "Site calme, rien à signaler.",
+               "Belle prairie autour des panneaux, pâturage ovin."],
+        "de": ["Der Solarpark hat etwa {ha} Hektar, dazwischen weiden Schafe.",
+               "Anlage mit {mw} MWp, viel Wiese und Blühstreifen.", "Ruhiger Ort, gepflegte Fläche.",
+               "Die Weide unter den Modulen wird von Schafen gepflegt."]
+    },
+    "sheep_farms": {
+        "en": ["Lovely farm with a flock of {flock} {breed} ewes.", "They graze {flock} sheep on solar sites nearby.",
+               "Rotational grazing on conservation land, very knowledgeable shepherd.", "Great lamb, friendly people."],
+        "nl": ["Een kudde van {flock} {breed} schapen, ze begrazen ook natuurgebieden.",
+               "Zo'n {flock} schapen in de wei, ras {breed}.", "Vriendelijke herder, mooie boerderij."],
+        "fr": ["Troupeau de {flock} brebis {breed}, pâturage en rotation.", "Élevage bio, environ {flock} moutons.",
+               "Berger passionné, accueil chaleureux."],
+        "de": ["Herde von {flock} {breed} Schafen, Wanderschäferei mit Naturschutzbeweidung.",
+               "Etwa {flock} Schafe auf der Weide.", "Sehr nette Schäferin, tolle Lammwurst."]
+    }
+}
+
+LANGUAGES = {"NL": ["nl", "en"], "UK": ["en"], "FR": ["fr", "en"], "DE": ["de", "en"], "BE": ["nl", "fr", "en"]}
+
+BREEDS = ["Texel", "Suffolk", "Swifter", "Zwartbles", "Lacaune", "Merino", "Skudde", "Drenthe heath", "Cheviot"]
+
+# Share of items the pipeline is after; the rest is noise for the classifier to drop
+KEEP_RATE = 0.7
+
+# Share of items that repeat an earlier one, as overlapping search queries do
+DUPLICATE_RATE = 0.03
+
+# Mean reviews per item; counts are skewed, with a few items carrying dozens
+MEAN_REVIEWS = 4
+
+
+def dataset_path(directory, kind, country_code, scale):
+    """Where the benchmark suite keeps a generated dataset."""
+    return os.path.join(directory, f"synthetic_{kind}_{country_code.lower()}_{scale}.json")
+
+
+def _review(rng, kind, country_code, index):
+    text = rng.choice(REVIEWS[kind][rng.choice(LANGUAGES[country_code])]).format(
+        ha=rng.choice([rng.randint(2, 120), round(rng.uniform(1, 60), 1)]),
+        acres=rng.randint(10, 300),
+        mw=rng.choice([rng.randint(1, 150), round(rng.uniform(0.5, 25), 1)]),
+        flock=rng.randint(20, 1500),
+        breed=rng.choice(BREEDS)
+    )
+    return {
+        "name": f"{rng.choice(['Jan', 'Emma', 'Paul', 'Marie', 'Lukas', 'Sophie'])} {rng.choice(SURNAMES)}",
+        "text": text if rng.random() < 0.85 else None,
+        "publishedAtDate": f"20{rng.randint(18, 25)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T12:00:00.000Z",
+        "likesCount": rng.randint(0, 5),
+        "reviewId": f"Ci9DQUlRQUNvZENodHljRjlv{index:x}{rng.getrandbits(32):08x}",
+        "stars": rng.randint(1, 5)
+    }
+
+
+def _item(rng, kind, country_code, index):
+    profile = COUNTRY_PROFILES[country_code]
+    keep = rng.random() < KEEP_RATE or not TITLES[kind][country_code]["drop"]
+    city, postcode, latitude, longitude = rng.choice(profile["cities"])
+    title = rng.choice(TITLES[kind][country_code]["keep" if keep else "drop"]).format(
+        place=rng.choice(PLACES[country_code]), surname=rng.choice(SURNAMES),
+        mw=rng.choice([rng.randint(2, 150), round(rng.uniform(1, 30), 1)]))
+    categories = rng.choice(CATEGORIES[kind]["keep" if keep else "drop"])
+    review_count = min(int(rng.expovariate(1 / MEAN_REVIEWS)), 80)
+    street = f"{rng.choice(profile['streets'])}"
+    number = rng.randint(1, 250)
+
+    item = {
+        "title": title,
+        "categoryName": categories[0] if categories else None,
+        "categories": categories,
+        "address": profile["address"].format(street=street, number=number, postcode=postcode, city=city),
+        "street": f"{street} {number}",
+        "city": city if rng.random() < 0.9 else "",
+        "postalCode": postcode,
+        "countryCode": "GB" if country_code == "UK" else country_code,
+        "location": {"lat": round(latitude + rng.uniform(-0.15, 0.15), 7),
+                     "lng": round(longitude + rng.uniform(-0.15, 0.15), 7)},
+        "placeId": f"ChIJ{country_code}{kind[0]}{index:09d}{rng.getrandbits(24):06x}",
+        "cid": str(rng.getrandbits(63)),
+        "totalScore": round(rng.uniform(3, 5), 1) if review_count else None,
+        "reviewsCount": review_count,
+        "phone": f"+{rng.randint(30, 49)} {rng.randint(100, 999)} {rng.randint(100000, 999999)}"
+        if rng.random() < 0.6 else None,
+        "website": f"https://www.{title.split()[-1].lower()}-{index}.example" if rng.random() < 0.5 else None,
+        "reviews": [_review(rng, kind, country_code, index) for _ in range(review_count)]
+    }
+    if rng.random() < 0.2:
+        item["description"] = _review(rng, kind, country_code, index)["text"]
+    return item
+
+
+def generate_items(kind, country_code, count, seed=0):
+    """Yield count synthetic Google Places items of one kind ("solar_parks" or "sheep_farms") for a country."""
+    rng = random.Random(f"{kind}-{country_code}-{seed}")
+    recent = deque(maxlen=1000)
+    for index in range(count):
+        if recent and rng.random() < DUPLICATE_RATE:
+            yield rng.choice(recent)
+            continue
+        item = _item(rng, kind, country_code, index)
+        recent.append(item)
+        yield item
+
+
+def write_dataset(output_file, kind, country_code, count, seed=0):
+    """Write a synthetic dataset as a JSON array like the Apify export; returns the item count."""
+    with ingest_engine.JsonArrayWriter(output_file) as writer:
+        for item in generate_items(kind, country_code, count, seed):
+            writer.write(item)
+    return writer.count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic Apify Google Places datasets.")
+    parser.add_argument("countries", nargs="*", default=list(COUNTRY_PROFILES),
+                        help="country codes (default: all of %(default)s)")
+    parser.add_argument("--kind", choices=KINDS, default="solar_parks", help="dataset kind (default: %(default)s)")
+    parser.add_argument("--scale", choices=list(SCALES), default="10k", help="items per country (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: %(default)s)")
+    parser.add_argument("--output-dir", default=".", help="directory for the datasets (default: %(default)s)")
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    for country_code in args.countries:
+        output_file = dataset_path(args.output_dir, args.kind, country_code, args.scale)
+        count = write_dataset(output_file, args.kind, country_code, SCALES[args.scale], args.seed)
+        print(f"{country_code}: {count} items saved to {output_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Crash output streams and ingestion runs in a separate process, resume them, and compare with uninterrupted runs."""
+
+import gzip
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+import checkpoint
+import ingest_engine
+import process_sheep_farms
+import synthetic_dataset
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Child process: exit abruptly, without closing the outputs, right after the second checkpoint;
+# serial, since pool workers would outlive it
+CRASH_SCRIPT = textwrap.dedent("""
+    import os, sys
+    sys.path.insert(0, {root!r})
+    import checkpoint, ingest_engine, process_sheep_farms
+
+    save = checkpoint.Checkpoint.save
+    saved = []
+
+    def save_then_crash(self, state):
+        save(self, state)
+        if "summary" not in state:
+            saved.append(state)
+            if len(saved) == 2:
+                os._exit(3)
+
+    checkpoint.Checkpoint.save = save_then_crash
+    {call}
+""")
+
+SOLAR_CALL = 'ingest_engine.process_countries([("UK", {source!r}, {output!r})], 1, 64, checkpoint_interval=100)'
+SHEEP_CALL = 'process_sheep_farms.process_sheep_farms([("NL", {source!r}, {output!r})], None, 1, 64, checkpoint_interval=100)'
+
+
+def _crash(call, source, output):
+    script = CRASH_SCRIPT.format(root=ROOT, call=call.format(source=source, output=output))
+    crashed = subprocess.run([sys.executable, "-c", script], capture_output=True)
+    assert crashed.returncode == 3, crashed.stderr.decode()
+
+
+def _read_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+# Child process: write lines, make them durable, write more and exit abruptly with the offset
+STREAM_CRASH_SCRIPT = textwrap.dedent("""
+    import os, sys
+    sys.path.insert(0, {root!r})
+    import checkpoint
+
+    stream = checkpoint.OutputStream({output!r})
+    for i in range(100):
+        stream.write("line %d\\n" % i)
+    offset = stream.sync()
+    for i in range(100, 150):
+        stream.write("lost %d\\n" % i)
+    stream.sync()
+    stream.write("never synced\\n")
+    print(offset)
+    sys.stdout.flush()
+    os._exit(3)
+""")
+
+
+@pytest.mark.parametrize("name", ["lines.txt", "lines.txt.gz"])
+def test_output_stream_resumes_at_synced_offset(tmp_path, name):
+    path = str(tmp_path / name)
+    crashed = subprocess.run([sys.executable, "-c", STREAM_CRASH_SCRIPT.format(root=ROOT, output=path)],
+                             capture_output=True, text=True)
+    assert crashed.returncode == 3, crashed.stderr
+    offset = int(crashed.stdout)
+
+    stream = checkpoint.OutputStream(path, offset)
+    for i in range(100, 200):
+        stream.write("line %d\n" % i)
+    stream.close()
+
+    expected = "".join("line %d\n" % i for i in range(200))
+    if name.endswith(".gz"):
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            assert f.read() == expected
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            assert f.read() == expected
+
+
+@pytest.fixture(scope="module")
+def source(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("raw") / "raw.json")
+    synthetic_dataset.write_dataset(path, "solar_parks", "UK", 600, seed=7)
+    return path
+
+
+@pytest.mark.parametrize("extension", [".json", ".json.gz"])
+def test_resume_after_crash_matches_uninterrupted_run(tmp_path, source, extension):
+    # Same file name in both runs, since gzip headers record it
+    for run in ("expected", "resumed"):
+        (tmp_path / run).mkdir()
+    expected = str(tmp_path / "expected" / ("parks" + extension))
+    resumed = str(tmp_path / "resumed" / ("parks" + extension))
+    ingest_engine.process_countries([("UK", source, expected)], 1, 64, checkpoint_interval=100)
+
+    _crash(SOLAR_CALL, source, resumed)
+    assert os.path.exists(resumed[:-len(extension)] + ".checkpoint.json")
+
+    summary = ingest_engine.process_countries([("UK", source, resumed)], 1, 64, resume=True,
+                                              checkpoint_interval=100)[resumed]
+    assert summary["resumed_from"] > 0
+
+    assert _read_bytes(resumed) == _read_bytes(expected)
+
+    records = list(ingest_engine.iter_records(resumed))
+    assert records == list(ingest_engine.iter_records(expected))
+    assert records
+    if extension.endswith(".gz"):
+        # Every member decompresses, none is cut short by a duplicated header
+        with gzip.open(resumed, 'rt', encoding='utf-8') as f:
+            text = f.read()
+        assert json.loads(text) == records
+
+
+def test_sheep_farms_resume_in_parallel_after_crash(tmp_path):
+    source = str(tmp_path / "raw.json")
+    synthetic_dataset.write_dataset(source, "sheep_farms", "NL", 600, seed=3)
+    for run in ("expected", "resumed"):
+        (tmp_path / run).mkdir()
+    expected = str(tmp_path / "expected" / "farms.json")
+    resumed = str(tmp_path / "resumed" / "farms.json")
+    process_sheep_farms.process_sheep_farms([("NL", source, expected)], checkpoint_interval=100)
+
+    _crash(SHEEP_CALL, source, resumed)
+    summary = process_sheep_farms.process_sheep_farms([("NL", source, resumed)], None, 2, 64, resume=True,
+                                                      checkpoint_interval=100)[resumed]
+    assert summary["resumed_from"] > 0
+    assert summary["items"] == 600
+    assert _read_bytes(resumed) == _read_bytes(expected)
+    assert list(ingest_engine.iter_records(resumed))
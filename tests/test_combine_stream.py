@@ -0,0 +1,86 @@
+"""The streaming combine step against a naive in-memory combine."""
+
+import json
+import random
+
+import pytest
+
+import combine_stream
+import dedup
+import ingest_engine
+import run_report
+import schema_validation
+
+COUNTRIES = ["Netherlands", "Belgium", "Germany"]
+
+
+def _inputs(tmp_path, rng):
+    """Three processed country files; some places appear in two of them."""
+    files = []
+    shared = []
+    for number, country in enumerate(COUNTRIES):
+        records = []
+        for index in range(40):
+            records.append({"name": f"Zonnepark {rng.choice('ABCDEFGH')}{index}", "country": country,
+                            "region": "", "location": f"Weg {index}", "total_hectares": 10.0,
+                            "place_id": f"{country}-{index}" if index % 3 else None,
+                            "coordinates": {"latitude": 50 + number + rng.random(), "longitude": 4 + rng.random()}})
+        records += shared
+        shared = records[:5]
+        path = str(tmp_path / f"parks_{number}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(records, f)
+        files.append(path)
+    return files
+
+
+def _naive(input_files):
+    records = [record for path in input_files for record in ingest_engine.iter_records(path)]
+    kept, _ = dedup.deduplicate(records)
+    return sorted((dedup.with_record_id(record) for record in kept), key=combine_stream.merge_key)
+
+
+@pytest.mark.parametrize("run_size", [7, 1000])
+def test_sorted_merge_equals_naive_combine(tmp_path, run_size):
+    input_files = _inputs(tmp_path, random.Random(run_size))
+    outputs = [str(tmp_path / "out" / "combined.ndjson"), str(tmp_path / "out" / "combined.json.gz")]
+    (tmp_path / "out").mkdir()
+
+    total, counts, duplicates = combine_stream.combine(input_files + [str(tmp_path / "missing.json")], outputs,
+                                                       run_size=run_size)
+    expected = _naive(input_files)
+    assert list(ingest_engine.iter_records(outputs[0])) == expected
+    assert list(ingest_engine.iter_records(outputs[1])) == expected
+    assert total == len(expected) and duplicates == 10
+    assert counts == {country: sum(1 for r in expected if r["country"] == country) for country in COUNTRIES}
+
+
+def test_without_deduplication_everything_is_kept(tmp_path):
+    input_files = _inputs(tmp_path, random.Random(1))
+    output = str(tmp_path / "combined.ndjson")
+    total, _, duplicates = combine_stream.combine(input_files, [output], deduplicate=False, run_size=10)
+    assert (total, duplicates) == (130, 0)
+    records = list(ingest_engine.iter_records(output))
+    assert [combine_stream.merge_key(r) for r in records] == sorted(combine_stream.merge_key(r) for r in records)
+
+
+def test_invalid_records_are_quarantined(tmp_path):
+    path = str(tmp_path / "parks.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump([
+            {"name": "Goed", "country": "Netherlands", "total_hectares": 3,
+             "coordinates": {"latitude": 52.0, "longitude": 5.0}},
+            {"name": "Zonder plek", "country": "Netherlands", "total_hectares": 3, "coordinates": {}},
+            {"name": "Negatief", "country": "Netherlands", "total_hectares": -1,
+             "coordinates": {"latitude": 52.0, "longitude": 5.1}},
+        ], f)
+    output = str(tmp_path / "combined.ndjson")
+    total, _, _ = combine_stream.combine([path], [output], validator=schema_validation.SOLAR_PARKS)
+    assert total == 1
+
+    with open(schema_validation.quarantine_path(output), encoding='utf-8') as f:
+        quarantined = [json.loads(line) for line in f]
+    assert [row["index"] for row in quarantined] == [1, 2]
+    with open(run_report.report_path(output), encoding='utf-8') as f:
+        summary = json.load(f)["summary"]
+    assert (summary["quarantined"], summary["quarantined_without_coordinates"]) == (2, 1)
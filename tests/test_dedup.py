@@ -0,0 +1,109 @@
+"""Cross-source deduplication: place IDs, nearby similar names, the geohash neighbourhood, and stable record IDs."""
+
+import random
+
+import dedup
+import integrate_directory
+
+
+def _record(name, latitude=None, longitude=None, place_id=None, location=""):
+    return {"name": name, "place_id": place_id, "location": location,
+            "coordinates": {"latitude": latitude, "longitude": longitude}}
+
+
+def test_same_place_id_collapses_wherever_it_lies():
+    kept, stats = dedup.deduplicate([_record("Zonnepark A", 52.0, 5.0, "p1"), _record("Other", 53.0, 6.0, "p1")])
+    assert [r["name"] for r in kept] == ["Zonnepark A"]
+    assert stats == {"kept": 1, "place_id": 1, "near": 0}
+
+
+def test_near_similar_names_merge_and_the_first_is_kept():
+    records = [
+        _record("Zonnepark De Kwekerij", 52.0, 5.0),
+        _record("Zonnepark de Kwekerij B.V.", 52.0005, 5.0005),
+        # Same name, too far away
+        _record("Zonnepark De Kwekerij", 52.01, 5.0),
+        # Close, but a different phase
+        _record("Zonnepark Phase 2", 52.0, 5.0),
+        _record("Zonnepark Phase 3", 52.0, 5.0),
+    ]
+    kept, stats = dedup.deduplicate(records)
+    assert kept == [records[0], records[2], records[3], records[4]]
+    assert stats == {"kept": 4, "place_id": 0, "near": 1}
+
+
+def test_different_place_ids_stay_apart():
+    kept, _ = dedup.deduplicate([_record("Solar Farm", 52.0, 5.0, "p1"), _record("Solar Farm", 52.0, 5.0, "p2")])
+    assert len(kept) == 2
+
+
+def test_records_without_coordinates_by_name_and_address():
+    records = [_record("Schaapskooi", location="Heideweg 1"), _record("Schaapskooi", location="Heideweg 1"),
+               _record("Schaapskooi", location="Heideweg 2")]
+    kept, stats = dedup.deduplicate(records)
+    assert kept == [records[0], records[2]]
+    assert stats["near"] == 1
+
+
+def test_duplicates_across_geohash_cell_borders():
+    # Points either side of a cell border, a few metres apart
+    latitude, longitude = 52.0, 5.0
+    row, column = dedup.geohash_cell(latitude, longitude)
+    border = (column + 1) * 360.0 / (1 << 15) - 180.0
+    a = _record("Zonnepark Noord", latitude, border - 0.00001)
+    b = _record("Zonnepark Noord", latitude, border + 0.00001)
+    assert dedup.geohash_cell(latitude, border - 0.00001) != dedup.geohash_cell(latitude, border + 0.00001)
+    assert dedup.deduplicate([a, b])[0] == [a]
+
+
+def test_same_result_as_comparing_every_pair():
+    rng = random.Random(3)
+    names = ["Zonnepark Noord", "Zonnepark Zuid", "Solar Farm 1", "Solar Farm 2", "Schapenweide"]
+    records = [_record(rng.choice(names), 52 + rng.uniform(0, 0.02), 5 + rng.uniform(0, 0.02)) for _ in range(300)]
+
+    kept = []
+    for record in records:
+        name = dedup.normalise_name(record["name"])
+        point = record["coordinates"]
+        if not any(dedup._distance_km(point["latitude"], point["longitude"], other["coordinates"]["latitude"],
+                                      other["coordinates"]["longitude"]) <= dedup.MAX_DUPLICATE_DISTANCE_KM
+                   and dedup.similar_names(name, dedup.normalise_name(other["name"])) for other in kept):
+            kept.append(record)
+    assert dedup.deduplicate(records)[0] == kept
+
+
+def test_record_id_from_the_place_id():
+    first = dedup.record_id("ChIJ-p1", "Zonnepark A", 52.0, 5.0)
+    assert len(first) == 16 and int(first, 16) >= 0
+    # Renamed or moved, still the same place
+    assert dedup.record_id("ChIJ-p1", "Zonnepark A (fase 2)", 52.1, 5.1) == first
+    assert dedup.record_id("ChIJ-p2", "Zonnepark A", 52.0, 5.0) != first
+
+
+def test_record_id_from_the_name_and_point():
+    first = dedup.record_id(None, "Zonnepark  Één", 52.1234567, 5.7654321)
+    # Case, spacing and float noise of a re-scrape do not change it
+    assert dedup.record_id("", "zonnepark één", 52.12345670000001, 5.7654321) == first
+    assert dedup.record_id(None, "Zonnepark Één", 52.1234567, 5.7654321 + 2e-6) != first
+    assert dedup.record_id(None, "Zonnepark Twee", 52.1234567, 5.7654321) != first
+    assert dedup.record_id(None, None, None, None) == dedup.record_id(None, "", None, None)
+
+
+def test_with_record_id_keeps_an_existing_id():
+    record = _record("Zonnepark A", 52.0, 5.0, "ChIJ-p1")
+    derived = dedup.with_record_id(record)
+    assert list(derived)[0] == "id"
+    assert derived == dict(record, id=dedup.record_id("ChIJ-p1", "Zonnepark A", 52.0, 5.0))
+    assert "id" not in record
+    assert dedup.with_record_id(dict(record, id="kept")) == dict(record, id="kept")
+
+
+def test_ids_do_not_shift_when_records_are_added():
+    parks = [dict(_record(f"Park {i}", 52.0 + i / 100, 5.0), country="Netherlands", region="") for i in range(3)]
+    farms = [_record(f"Farm {i}", 52.0 + i / 100, 5.01, f"farm-{i}") for i in range(3)]
+    before = integrate_directory.find_potential_matches(parks, farms, 5)
+    after = integrate_directory.find_potential_matches([_record("New park", 40.0, 1.0)] + parks,
+                                                       [_record("New farm", 40.0, 1.01)] + farms, 5)
+    assert after[1:] == before
+    assert before[0]["solar_park_id"] == dedup.with_record_id(parks[0])["id"]
+    assert before[0]["potential_matches"][0]["sheep_farm_id"] == dedup.record_id("farm-0", "Farm 0", 52.0, 5.01)
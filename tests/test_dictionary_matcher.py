@@ -0,0 +1,65 @@
+"""Labels of the dictionary matcher and the extractors built on it, for compounds, inflections and false hits."""
+
+import pytest
+
+import dictionary_matcher
+import process_sheep_farms
+import process_solar_parks
+import process_solar_parks_belgium
+import process_solar_parks_germany
+
+
+def test_whole_words_only_without_compounds():
+    matcher = dictionary_matcher.DictionaryMatcher({"vegetation": {"gras": "Grass"}})
+    assert matcher.match("Grasfläche") == {}
+    assert matcher.match("viel Gras").get("vegetation") == ("Grass", "gras", 1)
+
+
+def test_compound_start_end_and_inflection():
+    matcher = dictionary_matcher.DictionaryMatcher({"vegetation": {"krauter": "Herbs", "wiese": "Meadow"}},
+                                                   compounds=["vegetation"])
+    assert matcher.match("Kräuterwiese").get("vegetation") == ("Herbs", "krauter", 0)
+    assert matcher.match("bunte Blumenwiesen").get("vegetation") == ("Meadow", "wiese", 1)
+    assert matcher.match("Wiesenrand").get("vegetation") == ("Meadow", "wiese", 0)
+    # Inside a word, only inflection endings may follow a term
+    assert matcher.match("Blumenwiesenrand") == {}
+
+
+def test_short_terms_stay_whole_words():
+    matcher = dictionary_matcher.DictionaryMatcher({"grazing_type": {"bio": "Organic", "ras": "Breed"}},
+                                                   compounds=["grazing_type"])
+    assert matcher.match("Biodiversity park, gras") == {}
+
+
+# Texts the substring matching labelled before the matcher became word-bounded
+@pytest.mark.parametrize("extract, text, label", [
+    (process_solar_parks_germany.extract_vegetation_type, "Wildblumenwiese", "Wild flowers"),
+    (process_solar_parks_germany.extract_vegetation_type, "Schafbeweidung der Anlage", "Sheep grazing"),
+    (process_solar_parks_germany.extract_vegetation_type, "Kräuterwiese", "Herbs and wildflowers"),
+    (process_solar_parks_germany.extract_vegetation_type, "Blumenwiesen und Schafe", "Wild flowers"),
+    (process_solar_parks_germany.extract_vegetation_type, "Grünlandfläche", "Grass"),
+    (process_solar_parks.extract_vegetation_type, "Wildblumenwiese", "Wild flowers"),
+    (process_solar_parks.extract_vegetation_type, "bloemenweide onder de panelen", "Wild flowers"),
+    # The Dutch table has no sheep label, as before
+    (process_solar_parks.extract_vegetation_type, "schapenbegrazing", "Mixed grass"),
+    (process_solar_parks.extract_vegetation_type, "Grasstroken langs het hek", "Grass"),
+    (process_solar_parks_belgium.extract_vegetation_type, "Grasfläche", "Grass"),
+    (process_solar_parks_belgium.extract_vegetation_type, "bloemenweide", "Wild flowers"),
+])
+def test_vegetation_compounds(extract, text, label):
+    assert extract(text) == label
+
+
+@pytest.mark.parametrize("text, grazing_type, breed", [
+    ("Biologische schapenhouderij", "Organic grazing", None),
+    ("Wanderschäferei mit Rhönschafen", "Mobile grazing", "Rhönschaf"),
+    ("Texelaars en zwartblesschapen", "Mixed grazing", "Texel"),
+    # No longer labelled: "bio" inside "biodiversity", "ras" inside "gras"
+    ("Biodiversity park", "Mixed grazing", None),
+    ("gras en bloemen", "Mixed grazing", None),
+    ("Ras: Schoonebeeker", "Mixed grazing", "Schoonebeeker"),
+    ("ras zwartkop", "Mixed grazing", "Zwartkop"),
+])
+def test_farm_terms_compounds(text, grazing_type, breed):
+    assert process_sheep_farms.extract_grazing_type(text) == grazing_type
+    assert process_sheep_farms.extract_breed_from_text(text) == breed
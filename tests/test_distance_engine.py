@@ -0,0 +1,86 @@
+"""Block-vectorised matching, serial and over shared memory, against measuring every pair with calculate_distance."""
+
+import random
+
+import pytest
+
+import distance_engine
+import integrate_directory
+
+
+def _points(rng, count, missing=0.05):
+    return [None if rng.random() < missing else (rng.uniform(50.5, 53.5), rng.uniform(3.0, 7.0))
+            for _ in range(count)]
+
+
+def _brute_force(park_points, farm_points, max_distance):
+    for park_index, park in enumerate(park_points):
+        if park is None:
+            continue
+        matches = []
+        for farm_index, farm in enumerate(farm_points):
+            if farm is None:
+                continue
+            distance = integrate_directory.calculate_distance(*park, *farm)
+            if distance <= max_distance:
+                matches.append((farm_index, round(distance, 1)))
+        if matches:
+            matches.sort(key=lambda match: (match[1], match[0]))
+            yield park_index, matches
+
+
+@pytest.mark.parametrize("memory_budget", [1 << 10, 1 << 16, distance_engine.MEMORY_BUDGET])
+@pytest.mark.parametrize("max_distance", [2, 25])
+def test_same_matches_as_brute_force(memory_budget, max_distance):
+    rng = random.Random(memory_budget + max_distance)
+    parks, farms = _points(rng, 300), _points(rng, 400)
+    expected = list(_brute_force(parks, farms, max_distance))
+    assert expected
+    assert list(distance_engine.match_points(parks, farms, max_distance, integrate_directory.calculate_distance,
+                                             memory_budget)) == expected
+
+
+def test_pairs_at_the_radius_and_rounding_boundaries():
+    # Farms at exactly the radius of a park, and at distances that round half-way
+    park = (52.0, 5.0)
+    farms = [(52.0 + d / 111.195, 5.0) for d in (10.0, 10.05, 9.95, 10.0000001, 0.05, 0.0)]
+    for max_distance in (integrate_directory.calculate_distance(*park, *farms[0]), 10.0, 10.05):
+        expected = list(_brute_force([park], farms, max_distance))
+        assert list(distance_engine.match_points([park], farms, max_distance,
+                                                 integrate_directory.calculate_distance)) == expected
+
+
+@pytest.mark.parametrize("parks, farms", [
+    ([], [(52.0, 5.0)]),
+    ([(52.0, 5.0)], []),
+    ([None, None], [(52.0, 5.0)]),
+    ([(52.0, 5.0)], [None]),
+])
+def test_nothing_to_match(parks, farms):
+    assert list(distance_engine.match_points(parks, farms, 50, integrate_directory.calculate_distance)) == []
+
+
+def test_every_engine_agrees():
+    rng = random.Random(4)
+    parks, farms = _points(rng, 200), _points(rng, 200)
+    expected = list(_brute_force(parks, farms, 15))
+    for engine in ("numpy", "grid"):
+        assert list(integrate_directory._match_points(parks, farms, 15, engine, 1 << 12)) == expected
+
+
+@pytest.mark.parametrize("workers, memory_budget", [(2, 1 << 12), (3, distance_engine.MEMORY_BUDGET)])
+def test_parallel_matches_equal_serial(workers, memory_budget):
+    rng = random.Random(workers)
+    parks, farms = _points(rng, 1500), _points(rng, 800)
+    serial = list(distance_engine.match_points(parks, farms, 10, integrate_directory.calculate_distance,
+                                               memory_budget))
+    assert serial
+    assert list(distance_engine.match_points_parallel(parks, farms, 10, integrate_directory.calculate_distance,
+                                                      workers, memory_budget)) == serial
+    assert list(integrate_directory._match_points(parks, farms, 10, "numpy", memory_budget,
+                                                  workers=workers)) == serial
+
+
+def test_parallel_with_nothing_to_match():
+    assert list(distance_engine.match_points_parallel([None], [(52.0, 5.0)], 50,
+                                                      integrate_directory.calculate_distance, 2)) == []
@@ -0,0 +1,161 @@
+"""Streaming reads and writes of the ingestion engine, and the records it extracts from raw Google Places items."""
+
+import json
+
+import pytest
+
+import ingest_engine
+import process_solar_parks_uk
+import run_report
+import schema_validation
+import synthetic_dataset
+
+ITEMS = [
+    {"title": "Westmill Solar Farm", "categories": ["Solar energy company"], "placeId": "ChIJ-westmill",
+     "address": "Westmill Farm, Watchfield, Swindon SN6 8TH", "city": "Swindon",
+     "location": {"lat": 51.62, "lng": -1.65},
+     "reviews": [{"text": "A 30 hectare site with sheep grazing between the panels"}]},
+    {"title": "Bright Sun Roofing Ltd", "categories": ["Roofing contractor"],
+     "placeId": "ChIJ-roofer", "address": "1 High Street, Leeds", "location": {"lat": 53.8, "lng": -1.55}},
+    {"title": "Lark Rise 12MW Solar Park", "categories": ["Solar energy company"], "placeId": "ChIJ-lark",
+     "address": "", "city": "", "description": "Café “Zonne” – ünïcode survives the round trip"},
+]
+
+
+def _write_array(path, items, **kwargs):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(items, f, ensure_ascii=False, **kwargs)
+    return str(path)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, ingest_engine.READ_CHUNK_SIZE])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_json_array_in_any_chunk_size(tmp_path, chunk_size, indent):
+    items = ITEMS + [[], {}, 12345, -0.5e-3, "text", None, True]
+    path = _write_array(tmp_path / "raw.json", items, indent=indent)
+    assert list(ingest_engine.iter_json_array(path, chunk_size)) == items
+
+
+@pytest.mark.parametrize("text", ["", "{}", "[1, 2", "[1 2]"])
+def test_malformed_json_array(tmp_path, text):
+    path = tmp_path / "raw.json"
+    path.write_text(text, encoding='utf-8')
+    with pytest.raises(ValueError):
+        list(ingest_engine.iter_json_array(str(path), 4))
+
+
+@pytest.mark.parametrize("name", ["records.json", "records.json.gz", "records.ndjson", "records.jsonl.gz"])
+def test_writer_round_trip(tmp_path, name):
+    path = str(tmp_path / name)
+    with ingest_engine.record_writer(path) as writer:
+        for item in ITEMS:
+            writer.write(item)
+    assert writer.count == len(ITEMS)
+    assert list(ingest_engine.iter_records(path)) == ITEMS
+
+
+def test_json_array_writer_formats_like_json_dump(tmp_path):
+    for items in (ITEMS, []):
+        path = str(tmp_path / "records.json")
+        with ingest_engine.JsonArrayWriter(path) as writer:
+            for item in items:
+                writer.write(item)
+        with open(path, 'r', encoding='utf-8') as f:
+            assert f.read() == json.dumps(items, indent=2, ensure_ascii=False)
+
+
+def test_process_item():
+    plugin = process_solar_parks_uk.PLUGIN
+    report = run_report.RunReport("test")
+    records = [ingest_engine.process_item(ingest_engine._compact_item(item), plugin, report) for item in ITEMS]
+
+    park, roofer, lark = records
+    assert roofer is None
+    assert park["name"] == "Westmill Solar Farm"
+    assert park["country"] == "United Kingdom"
+    assert park["total_hectares"] == 30
+    assert park["place_id"] == "ChIJ-westmill"
+    assert park["coordinates"] == {"latitude": 51.62, "longitude": -1.65}
+    # Without an area, the capacity in the title gives an estimate; without an address no region
+    assert lark["total_hectares"] == 12 * 1.5
+    assert lark["region"] == ""
+    assert report.extractors["hectares"] == {"review": 1, "capacity": 1}
+    assert sum(report.extractors["classifier"].values()) == 3
+
+
+def test_process_countries(tmp_path):
+    invalid = {"title": "Broken Solar Park", "location": {"lat": 123, "lng": 0}}
+    source = _write_array(tmp_path / "raw.json", ITEMS + [invalid])
+    output = str(tmp_path / "parks.json")
+    summary = ingest_engine.process_countries([("UK", source, output)])[output]
+
+    records = list(ingest_engine.iter_records(output))
+    assert [record["name"] for record in records] == ["Westmill Solar Farm", "Lark Rise 12MW Solar Park"]
+    assert (summary["count"], summary["items"], summary["quarantined"]) == (2, 4, 1)
+    assert summary["report"] == run_report.report_path(output)
+    with open(schema_validation.quarantine_path(output), 'r', encoding='utf-8') as f:
+        quarantined = json.loads(f.readline())
+    assert (quarantined["index"], quarantined["row"]) == (3, invalid)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 50])
+def test_parallel_output_identical_to_serial(tmp_path, chunk_size):
+    jobs = {"expected": [], "parallel": []}
+    for country_code in ("NL", "FR", "BE"):
+        source = str(tmp_path / f"raw_{country_code}.json")
+        synthetic_dataset.write_dataset(source, "solar_parks", country_code, 300, seed=5)
+        for run, run_jobs in jobs.items():
+            (tmp_path / run).mkdir(exist_ok=True)
+            run_jobs.append((country_code, source, str(tmp_path / run / f"{country_code}.json")))
+
+    serial = ingest_engine.process_countries(jobs["expected"], 1, chunk_size)
+    parallel = ingest_engine.process_countries(jobs["parallel"], 2, chunk_size)
+    for (_, _, expected), (_, _, output) in zip(jobs["expected"], jobs["parallel"]):
+        with open(expected, 'rb') as f, open(output, 'rb') as g:
+            assert f.read() == g.read()
+        assert parallel[output]["count"] == serial[expected]["count"] > 0
+        assert parallel[output]["items"] == 300
+        # The outcome counts of the worker chunks add up to those of the serial run
+        with open(parallel[output]["report"], 'r', encoding='utf-8') as f, \
+                open(serial[expected]["report"], 'r', encoding='utf-8') as g:
+            assert json.load(f)["extractors"] == json.load(g)["extractors"]
+
+
+def _unique_items(count, seed):
+    # The odd item found twice would count as unchanged within one run
+    items = {}
+    for item in synthetic_dataset.generate_items("solar_parks", "DE", count, seed):
+        items.setdefault(item["placeId"], item)
+    return list(items.values())
+
+
+def test_incremental_rerun_extracts_only_new_and_changed_items(tmp_path, monkeypatch):
+    items = _unique_items(200, 9)
+    source = _write_array(tmp_path / "raw.json", items)
+    output = str(tmp_path / "parks.json")
+    first = ingest_engine.process_countries([("DE", source, output)], incremental=True)[output]
+    assert (first["added"], first["unchanged"]) == (len(items), 0)
+
+    again = ingest_engine.process_countries([("DE", source, output)], incremental=True)[output]
+    assert (again["added"], again["changed"], again["unchanged"], again["removed"]) == (0, 0, len(items), 0)
+
+    # Rename one item, touch a field the extractors do not read, drop one and add one
+    items = [dict(item) for item in items]
+    items[3]["title"] = "Solarpark Neuhausen"
+    items[4]["totalScore"] = 1.0
+    del items[5]
+    items.append(dict(items[0], placeId="ChIJ-new", title="Solarpark Neudorf"))
+    _write_array(source, items)
+    update = ingest_engine.process_countries([("DE", source, output)], incremental=True)[output]
+    assert (update["added"], update["changed"], update["unchanged"], update["removed"]) == (
+        1, 1, len(items) - 2, 1)
+
+    # Same output as processing the new scrape from scratch
+    scratch = str(tmp_path / "scratch.json")
+    ingest_engine.process_countries([("DE", source, scratch)])
+    assert list(ingest_engine.iter_records(output)) == list(ingest_engine.iter_records(scratch))
+
+    # New extraction logic invalidates every cached record
+    monkeypatch.setattr(ingest_engine, "EXTRACTOR_VERSION", ingest_engine.EXTRACTOR_VERSION + 1)
+    rebuilt = ingest_engine.process_countries([("DE", source, output)], incremental=True)[output]
+    assert (rebuilt["added"], rebuilt["unchanged"]) == (len(items), 0)
@@ -0,0 +1,38 @@
+"""Nearest sheep farm limits of the park-farm matcher."""
+
+import pytest
+
+import integrate_directory
+
+
+def _place(name, latitude, longitude):
+    return {"name": name, "country": "Netherlands", "region": "",
+            "coordinates": {"latitude": latitude, "longitude": longitude}}
+
+
+PARKS = [_place("Zonnepark", 52.0, 5.0)]
+FARMS = [_place("Ver", 52.2, 5.0), _place("Dichtbij", 52.01, 5.0), _place("Midden", 52.1, 5.0)]
+
+
+@pytest.mark.parametrize("top_k", [0, -1])
+def test_top_k_below_one_is_rejected(top_k):
+    with pytest.raises(ValueError):
+        integrate_directory.find_potential_matches(PARKS, FARMS, top_k=top_k)
+
+
+def test_top_k_keeps_the_nearest_farms():
+    matches = integrate_directory.find_potential_matches(PARKS, FARMS, top_k=2)
+    assert [m["sheep_farm_name"] for m in matches[0]["potential_matches"]] == ["Dichtbij", "Midden"]
+    everything = integrate_directory.find_potential_matches(PARKS, FARMS)
+    assert everything[0]["potential_matches"][:2] == matches[0]["potential_matches"]
+
+
+def test_top_k_does_not_combine_with_workers():
+    with pytest.raises(ValueError):
+        integrate_directory.find_potential_matches(PARKS, FARMS, top_k=2, workers=2)
+
+
+@pytest.mark.parametrize("engine", ["numpy", "grid"])
+def test_top_k_is_the_same_for_every_engine(engine):
+    matches = integrate_directory.find_potential_matches(PARKS, FARMS, engine=engine, top_k=1)
+    assert [m["sheep_farm_name"] for m in matches[0]["potential_matches"]] == ["Dichtbij"]
@@ -0,0 +1,110 @@
+"""Incremental match table updates against matching from scratch, and applying their delta to the JS output."""
+
+import json
+import random
+
+import pytest
+
+import combine_stream
+import integrate_directory
+import match_table
+
+
+def _record(kind, index, rng):
+    return {"id": f"{kind}-{index}", "name": f"{kind} {index}", "country": "Netherlands", "region": "",
+            "place_id": f"{kind}-{index}",
+            "coordinates": {"latitude": round(rng.uniform(51.5, 52.5), 4),
+                            "longitude": round(rng.uniform(4.5, 6.0), 4)}}
+
+
+def _combined(records):
+    # The order of the combined files
+    return sorted(records, key=lambda record: (*combine_stream.merge_key(record), record['id']))
+
+
+def _scratch(parks, farms, radius):
+    return integrate_directory.find_potential_matches(_combined(parks), _combined(farms), radius)
+
+
+def _edit(records, kind, rng, start):
+    """Move some records, drop some and add new ones."""
+    records = [dict(record) for record in records]
+    for record in rng.sample(records, 5):
+        record["coordinates"] = {"latitude": round(rng.uniform(51.5, 52.5), 4),
+                                 "longitude": round(rng.uniform(4.5, 6.0), 4)}
+    for record in rng.sample(records, 3):
+        records.remove(record)
+    return records + [_record(kind, start + i, rng) for i in range(4)]
+
+
+@pytest.mark.parametrize("radius", [5, 20])
+def test_update_equals_rebuild(radius):
+    rng = random.Random(radius)
+    parks = [_record("park", i, rng) for i in range(60)]
+    farms = [_record("farm", i, rng) for i in range(80)]
+    table = match_table.MatchTable.build(parks, farms, radius)
+    assert table.match_entries() == _scratch(parks, farms, radius)
+    previous = table.match_entries()
+
+    for round_number in range(3):
+        parks = _edit(parks, "park", rng, 100 * (round_number + 1))
+        farms = _edit(farms, "farm", rng, 100 * (round_number + 1))
+        delta = table.update(**table.changes(parks, farms))
+
+        expected = _scratch(parks, farms, radius)
+        assert table.match_entries() == expected
+        assert table.match_entries() == match_table.MatchTable.build(parks, farms, radius).match_entries()
+        # The delta turns the previous matches into the new ones
+        assert integrate_directory.apply_match_delta(previous, delta, _combined(parks)) == expected
+        previous = expected
+
+
+def test_save_and_load(tmp_path):
+    rng = random.Random(1)
+    table = match_table.MatchTable.build([_record("park", i, rng) for i in range(20)],
+                                         [_record("farm", i, rng) for i in range(20)], 20)
+    path = str(tmp_path / "matches.json")
+    table.save(path)
+    first = table.revision
+    loaded = match_table.MatchTable.load(path)
+    assert loaded.revision == first
+    assert loaded.match_entries() == table.match_entries()
+    loaded.save(path)
+    assert loaded.revision != first
+
+
+def _matches_js(path, matches, revision):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("// Potential Matches Data for Ombaa Directory\n// Generated: 2025-01-01 00:00:00\n")
+        f.write(f"// Match table revision: {revision}\n\nconst matchesData = ")
+        json.dump(matches, f, indent=2)
+        f.write(";\n\nexport { matchesData };\n")
+
+
+def test_delta_applies_only_at_its_starting_revision(tmp_path):
+    rng = random.Random(2)
+    parks = [_record("park", i, rng) for i in range(30)]
+    farms = [_record("farm", i, rng) for i in range(30)]
+    table = match_table.MatchTable.build(parks, farms, 20)
+    old_matches = table.match_entries()
+    farms = _edit(farms, "farm", rng, 100)
+    delta = table.update(**table.changes(parks, farms))
+
+    delta_file = str(tmp_path / "delta.json")
+    with open(delta_file, 'w', encoding='utf-8') as f:
+        json.dump({"rebuilt": False, "max_distance": 20, "revision": "r2", "base_revision": "r1",
+                   "matches": delta}, f)
+    matches_file = str(tmp_path / "matches-data.js")
+    _matches_js(matches_file, old_matches, "r1")
+    assert integrate_directory.read_matches_js(matches_file) == ("r1", old_matches)
+
+    matches, revision, reason = integrate_directory._matches_from_delta(delta_file, matches_file,
+                                                                        _combined(parks), 20, None)
+    assert (matches, revision, reason) == (_scratch(parks, farms, 20), "r2", None)
+
+    # Another revision, radius or top_k: match from scratch
+    _matches_js(matches_file, old_matches, "r0")
+    assert integrate_directory._matches_from_delta(delta_file, matches_file, parks, 20, None)[::2] == (
+        None, f"{matches_file} is not at revision r1 the delta starts from")
+    assert integrate_directory._matches_from_delta(delta_file, matches_file, parks, 30, None)[0] is None
+    assert integrate_directory._matches_from_delta(delta_file, matches_file, parks, 20, 3)[0] is None
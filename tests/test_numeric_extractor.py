@@ -0,0 +1,59 @@
+"""Areas, capacities and flock sizes found by the numeric extractor, with their units normalised."""
+
+import pytest
+
+import numeric_extractor
+
+
+@pytest.mark.parametrize("text, hectares", [
+    ("Zonnepark van 12,5 ha", 12.5),
+    ("covers 30 hectares of farmland", 30.0),
+    ("Solarpark auf 8 Hektar", 8.0),
+    ("a 100 acre site", 100 * numeric_extractor.HECTARES_PER_ACRE),
+])
+def test_area(text, hectares):
+    assert numeric_extractor.extract_hectares(text) == pytest.approx(hectares)
+
+
+@pytest.mark.parametrize("text", ["no size given", "Hahnweg 3, Haarlem", "v1.5 ha"])
+def test_no_area(text):
+    assert numeric_extractor.extract_hectares(text) is None
+
+
+@pytest.mark.parametrize("text, megawatts", [
+    ("Capacity 14.2 MWp", 14.2),
+    ("un parc de 5 MW", 5.0),
+    ("20 megawatts of panels", 20.0),
+    ("12 kW rooftop", None),
+])
+def test_capacity(text, megawatts):
+    assert numeric_extractor.extract_capacity_mw(text) == megawatts
+
+
+@pytest.mark.parametrize("text, flock", [
+    ("We keep 250 sheep", 250),
+    ("Un troupeau de 400 brebis", 400),
+    ("flock of 120", 120),
+    ("1.200 schapen op de heide", 1200),
+    ("Herde von 80 Tieren", 80),
+    ("80 Mutterschafe auf der Weide", 80),
+    ("300-ooien", 300),
+    ("sheep since 1998", None),
+])
+def test_flock(text, flock):
+    assert numeric_extractor.extract_flock_size(text) == flock
+
+
+def test_first_of_each_kind_in_order():
+    text = "Solar park of 5 MW on 12 ha, grazed by 40 sheep; phase two adds 3 MW on 6 ha"
+    assert [(q.kind, q.value) for q in numeric_extractor.extract_quantities(text)] == [
+        ("power", 5.0), ("area", 12.0), ("flock", 40), ("power", 3.0), ("area", 6.0)]
+    assert numeric_extractor.extract_hectares(text) == 12.0
+    assert numeric_extractor.has_quantity(text)
+    assert not numeric_extractor.has_quantity("")
+
+
+def test_batch_equals_one_by_one():
+    texts = ["12 ha", None, "5 MW and 30 sheep", "", "flock of 9", "nothing"]
+    assert numeric_extractor.extract_quantities_batch(texts) == [
+        numeric_extractor.extract_quantities(text) for text in texts]
@@ -0,0 +1,67 @@
+"""Postal code lookups: UK outward codes by longest area prefix, NL and BE codes by range."""
+
+import pytest
+
+import postal_codes
+
+
+@pytest.mark.parametrize("outward_code, region", [
+    ("B1", "England"),
+    ("BT7", "Northern Ireland"),
+    ("SW1A", "England"),
+    ("EH1", "Scotland"),
+    ("G12", "Scotland"),
+    ("CF10", "Wales"),
+    ("sa1", "Wales"),
+    ("QQ1", None),
+    ("", None),
+])
+def test_uk_region(outward_code, region):
+    assert postal_codes.uk_region(outward_code) == region
+
+
+@pytest.mark.parametrize("postcode, province", [
+    ("1000", "Noord-Holland"),
+    ("1299", "Noord-Holland"),
+    ("1300", "Flevoland"),
+    ("3999", "Utrecht"),
+    ("4300", "Zeeland"),
+    ("5300", "Gelderland"),
+    ("5340", "Noord-Brabant"),
+    ("8260", "Overijssel"),
+    ("9999", "Groningen"),
+    ("0999", None),
+])
+def test_nl_ranges(postcode, province):
+    assert postal_codes.nl_region(postcode) == province
+
+
+@pytest.mark.parametrize("postcode, region", [
+    ("1000", "Brussels"),
+    ("1300", "Wallonia"),
+    ("1500", "Flanders"),
+    ("4000", "Wallonia"),
+    ("9000", "Flanders"),
+    ("0500", None),
+])
+def test_be_ranges(postcode, region):
+    assert postal_codes.be_region(postcode) == region
+
+
+@pytest.mark.parametrize("country_code, address, region", [
+    ("NL", "Dorpsweg 110, 9401 WX Assen", "Drenthe"),
+    ("NL", "Dorpsweg 110, Assen", None),
+    ("BE", "Kerkstraat 3, 9000 Gent", "Flanders"),
+    ("UK", "1 Church Lane, Truro TR1 2AB", "England"),
+    ("GB", "Mill Road, Belfast BT7 1NN", "Northern Ireland"),
+    ("DE", "Hauptstraße 5, 80331 München", None),
+    ("NL", "", None),
+])
+def test_region_from_address(country_code, address, region):
+    assert postal_codes.region_from_address(country_code, address) == region
+
+
+def test_ranges_do_not_overlap():
+    for table in (postal_codes.NL_POSTCODE_RANGES, postal_codes.BE_POSTCODE_RANGES):
+        ranges = sorted(table)
+        assert all(end < next_start for (_, end, _), (next_start, _, _) in zip(ranges, ranges[1:]))
@@ -0,0 +1,67 @@
+"""Sheep farm records extracted through the ingestion engine, per country and combined."""
+
+import json
+
+import pytest
+
+import ingest_engine
+import process_sheep_farms
+import synthetic_dataset
+
+
+def _farm(title, reviews=(), **fields):
+    item = {"title": title, "placeId": f"ChIJ-{title}", "address": "", "city": "",
+            "reviews": [{"text": text} for text in reviews]}
+    item.update(fields)
+    return process_sheep_farms._compact_item(item)
+
+
+@pytest.mark.parametrize("item, country_code, flock_size, breed, grazing_type", [
+    (_farm("Schapenhouderij De Kudde", ["Mooie kudde van 320 Zwartbles schapen, natuurbeheer op de dijk"]),
+     "NL", 320, "Zwartbles", "Conservation grazing"),
+    (_farm("Bergerie du Larzac", description="Un troupeau de 600 brebis Lacaune en transhumance"),
+     "FR", 600, "Lacaune", "Transhumance"),
+    (_farm("Hill Farm", ["Lovely farm, rotational grazing with their Swaledale ewes"]),
+     "UK", 350, "Swaledale", "Rotational grazing"),
+    (_farm("Schäferei Müller", ["Rasse: Coburger Fuchsschaf"]), "DE", 300, "Coburger", "Mixed grazing"),
+    (_farm("Schapenweide"), "BE", 200, "Texel", "Mixed grazing"),
+])
+def test_process_sheep_farm(item, country_code, flock_size, breed, grazing_type):
+    record = process_sheep_farms.process_sheep_farm(item, country_code)
+    assert (record["flock_size"], record["breed"], record["grazing_type"]) == (flock_size, breed, grazing_type)
+    assert record["country"] == process_sheep_farms.COUNTRIES[country_code]["country"]
+    assert record["place_id"] == item["place_id"]
+
+
+def test_untitled_items_are_dropped():
+    assert process_sheep_farms.process_sheep_farm(_farm(""), "NL") is None
+
+
+def test_generic_breed_word():
+    assert process_sheep_farms.extract_breed_from_text("Wij houden het ras Blauwe Texelaar") == "Texel"
+    assert process_sheep_farms.extract_breed_from_text("We keep the breed: north country mule") == "North Country Mule"
+    assert process_sheep_farms.extract_breed_from_text("Sheep for sale") is None
+
+
+def test_countries_and_combined_output(tmp_path):
+    jobs = []
+    for country_code in ("NL", "BE"):
+        source = str(tmp_path / f"raw_{country_code}.json")
+        synthetic_dataset.write_dataset(source, "sheep_farms", country_code, 150, seed=4)
+        jobs.append((country_code, source, str(tmp_path / f"farms_{country_code}.json")))
+    combined = str(tmp_path / "farms_combined.json")
+
+    summaries = process_sheep_farms.process_sheep_farms(jobs, combined)
+    total = 0
+    for country_code, _, output in jobs:
+        records = list(ingest_engine.iter_records(output))
+        assert len(records) == summaries[output]["count"] > 0
+        assert summaries[output]["items"] == 150
+        assert {record["country"] for record in records} == {process_sheep_farms.COUNTRIES[country_code]["country"]}
+        with open(summaries[output]["report"], 'r', encoding='utf-8') as f:
+            assert json.load(f)["name"] == f"sheep_farms {country_code}"
+        total += len(records)
+
+    combined_records = list(ingest_engine.iter_records(combined))
+    assert len(combined_records) == summaries[combined]["count"] == total - summaries[combined]["duplicates"]
+    assert len({record["id"] for record in combined_records}) == len(combined_records)
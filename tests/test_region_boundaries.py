@@ -0,0 +1,65 @@
+"""Region lookups against the boundary file shipped in data/, and the regions an ingestion run takes from it."""
+
+import json
+import os
+
+import pytest
+
+import ingest_engine
+import region_boundaries
+import synthetic_dataset
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_default_file_is_the_shipped_one():
+    assert "OMBAA_REGION_BOUNDARIES" not in os.environ
+    assert region_boundaries.DEFAULT_BOUNDARIES_FILE == os.path.join(ROOT, "data", "admin_regions.geojson")
+    assert region_boundaries.load_region_index() is not None
+
+
+@pytest.mark.parametrize("latitude, longitude, country, region", [
+    (52.37, 4.90, "NL", "Noord-Holland"),
+    (51.92, 4.48, "NL", "Zuid-Holland"),
+    (52.52, 5.47, "NL", "Flevoland"),
+    (50.85, 5.69, "NL", "Limburg"),
+    (51.05, 3.72, "BE", "Flanders"),
+    (50.85, 4.35, "BE", "Brussels"),
+    (50.63, 5.57, "BE", "Wallonia"),
+    (48.14, 11.58, "DE", "Bayern"),
+    (50.94, 6.96, "DE", "Nordrhein-Westfalen"),
+    (45.76, 4.84, "FR", "Auvergne-Rhône-Alpes"),
+    (48.11, -1.68, "FR", "Bretagne"),
+    (55.95, -3.19, "UK", "Scotland"),
+    (51.48, -3.18, "UK", "Wales"),
+    (51.51, -0.13, "UK", "England"),
+])
+def test_region_at(latitude, longitude, country, region):
+    assert region_boundaries.region_at(latitude, longitude, country) == region
+
+
+def test_region_at_other_country_or_sea():
+    assert region_boundaries.region_at(52.37, 4.90, "BE") is None
+    assert region_boundaries.region_at(54.0, 3.0, "NL") is None
+
+
+@pytest.mark.parametrize("country_code", ["NL", "BE", "DE", "FR", "UK"])
+def test_ingestion_takes_regions_from_the_boundaries(tmp_path, country_code):
+    source = str(tmp_path / "parks.json")
+    output = str(tmp_path / "out.json")
+    synthetic_dataset.write_dataset(source, "solar_parks", country_code, 200)
+
+    summary = ingest_engine.process_countries([(country_code, source, output)])[output]
+    assert summary["boundaries_file"] == region_boundaries.DEFAULT_BOUNDARIES_FILE
+
+    with open(summary["report"], encoding="utf-8") as f:
+        regions = json.load(f)["extractors"]["region"]
+    assert regions["boundaries"]["rate"] > 0.8
+
+    with open(output, encoding="utf-8") as f:
+        records = json.load(f)
+    for record in records:
+        coordinates = record["coordinates"]
+        region = region_boundaries.region_at(coordinates["latitude"], coordinates["longitude"], country_code)
+        if region is not None:
+            assert record["region"] == region
@@ -0,0 +1,69 @@
+"""Parity of the region gazetteer with the per-script substring scans it replaced."""
+
+import pytest
+
+import benchmark_region_gazetteer
+import region_gazetteer
+
+# (country, address, city) as Google Places gives them, with and without the country name
+SAMPLE = [
+    ("NL", "Hoofdstraat 12, 6711 AA Ede", "Ede"),
+    ("NL", "Stationsweg 3, 4461 HZ Goes", "Goes"),
+    ("NL", "Dorpsweg 110, 9401 WX Assen", "Assen"),
+    ("NL", "Molenweg 17, 8232 TV Lelystad", ""),
+    ("NL", "Zonneweg 1, Almere, Flevoland", "Almere"),
+    ("NL", "Kerkstraat 3, Amsterdam, Noord-Holland", "Amsterdam"),
+    ("NL", "Industrieweg 9, 3542 AD Utrecht", "Utrecht"),
+    ("NL", "Polderdijk 4, Fryslân", "Sneek"),
+    ("NL", "Parallelweg 8, Den Bosch, Noord-Brabant", "Den Bosch"),
+    ("NL", "Havenstraat 2, Middelburg, Zeeland", ""),
+    ("FR", "12 Rue de la Gare, 69003 Lyon", "Lyon"),
+    ("FR", "Zone Artisanale, 29200 Brest, Finistère", "Brest"),
+    ("FR", "Chemin du Moulin, 13100 Aix-en-Provence", ""),
+    ("FR", "Lieu-dit Les Landes, 40000 Mont-de-Marsan", "Mont-de-Marsan"),
+    ("FR", "Avenue Foch, Strasbourg", "Strasbourg"),
+    ("DE", "Hauptstraße 5, 80331 München", "München"),
+    ("DE", "Am Solarpark 1, 04109 Leipzig, Sachsen", "Leipzig"),
+    ("DE", "Industriegebiet Nord, Kassel, Hessen", "Kassel"),
+    ("DE", "Feldweg 2, 24103 Kiel", "Kiel"),
+    ("DE", "Bahnhofstraße 9, Köln", "Köln"),
+    ("UK", "1 Church Lane, Truro, Cornwall", "Truro"),
+    ("UK", "Solar Farm Road, Perth, Perthshire", "Perth"),
+    ("UK", "Farm Lane, Swansea, Wales", "Swansea"),
+    ("UK", "Mill Road, Belfast, County Antrim", "Belfast"),
+    ("BE", "Kerkstraat 3, 9000 Gent", "Gent"),
+    ("BE", "Rue de la Station 4, 4000 Liège", "Liège"),
+    ("BE", "Wetstraat 16, 1000 Brussel", "Brussel"),
+    ("BE", "Steenweg 10, 3500 Hasselt, Limburg", "Hasselt"),
+]
+
+
+@pytest.mark.parametrize("record_type", ["solar_parks", "sheep_farms"])
+@pytest.mark.parametrize("country_code, address, city", SAMPLE)
+def test_same_region_as_the_old_scan(record_type, country_code, address, city):
+    expected = benchmark_region_gazetteer.legacy_match_region(country_code, address, city, record_type)
+    assert region_gazetteer.match_region(country_code, address, city, record_type) == expected
+
+
+def test_solar_and_sheep_tables_stay_apart():
+    # Town names are only in the sheep farm table, city tables only in the solar park one
+    assert region_gazetteer.match_region("NL", "Stationsweg 3, Goes", "") == ""
+    assert region_gazetteer.match_region("NL", "Stationsweg 3, Goes", "", "sheep_farms") == "Zeeland"
+    assert region_gazetteer.match_region("NL", "Zuidweg 1", "Zaanstad") == "Noord-Holland"
+    assert region_gazetteer.match_region("NL", "Zuidweg 1", "Zaanstad", "sheep_farms") == ""
+
+
+# Where the old scans found a keyword inside a longer word or name
+@pytest.mark.parametrize("record_type, country_code, address, city, old, new", [
+    ("sheep_farms", "NL", "Dorpsweg 110, 9401 WX Assen, Nederland", "Assen", "Gelderland", "Drenthe"),
+    ("solar_parks", "UK", "Farm Lane, County Londonderry", "", "England", "Northern Ireland"),
+    ("solar_parks", "FR", "Route de Tours, Indre-et-Loire", "", "Auvergne-Rhône-Alpes", "Centre-Val de Loire"),
+    ("solar_parks", "FR", "Chemin des Oliviers, Alpes-Maritimes", "", "Auvergne-Rhône-Alpes",
+     "Provence-Alpes-Côte d'Azur"),
+    ("solar_parks", "FR", "Route de Nantes, 44000 Loire-Atlantique", "", "Auvergne-Rhône-Alpes", "Pays de la Loire"),
+    ("solar_parks", "FR", "12 Rue Saint-Martin, 75003 Paris", "Paris", "Auvergne-Rhône-Alpes", "Île-de-France"),
+    ("solar_parks", "DE", "Am Hafen 3, Magdeburg, Sachsen-Anhalt", "", "Sachsen", "Sachsen-Anhalt"),
+])
+def test_whole_words_only(record_type, country_code, address, city, old, new):
+    assert benchmark_region_gazetteer.legacy_match_region(country_code, address, city, record_type) == old
+    assert region_gazetteer.match_region(country_code, address, city, record_type) == new
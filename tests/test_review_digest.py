@@ -0,0 +1,32 @@
+"""Which review texts the bounded digest keeps, and its byte budget."""
+
+import review_digest
+
+
+def _reviews(*texts):
+    return [{"text": text} for text in texts]
+
+
+def test_quantities_first_then_longest_then_earliest():
+    reviews = _reviews("Nice", "A very long review without numbers at all", "Around 40 sheep graze here",
+                       "short", "Another long review without any numbers", "12 ha", None)
+    assert review_digest.digest_reviews(reviews, k=3) == [
+        "Around 40 sheep graze here", "12 ha", "A very long review without numbers at all"]
+
+
+def test_ties_keep_the_earlier_review():
+    assert review_digest.digest_reviews(_reviews("aaaa", "bbbb", "cccc"), k=2) == ["aaaa", "bbbb"]
+
+
+def test_byte_budget():
+    reviews = _reviews("é" * 30, "x" * 50, "y" * 10)
+    # Longest in characters first: 50 + 60 bytes, and the last 10 no longer fit
+    assert review_digest.digest_reviews(reviews, k=3, byte_budget=115) == ["x" * 50, "é" * 30]
+    # A single text over the budget is clipped on a character boundary
+    assert review_digest.digest_reviews(_reviews("é" * 30), byte_budget=11) == ["é" * 5]
+
+
+def test_nothing_to_keep():
+    assert review_digest.digest_reviews(None) == []
+    assert review_digest.digest_reviews(_reviews("", None)) == []
+    assert review_digest.digest_reviews(_reviews("text"), k=0) == []
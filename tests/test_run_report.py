@@ -0,0 +1,79 @@
+"""Counts, stage timings and merging of run reports, and the JSON saved next to an output."""
+
+import json
+
+import pytest
+
+import run_report
+
+
+@pytest.mark.parametrize("output_file, path", [
+    ("out/parks.json", "out/parks.report.json"),
+    ("out/parks.json.gz", "out/parks.report.json"),
+    ("farms.ndjson", "farms.report.json"),
+])
+def test_report_path(output_file, path):
+    assert run_report.report_path(output_file) == path
+
+
+def test_outcome_rates():
+    report = run_report.RunReport("solar_parks NL")
+    for outcome in ["review"] * 3 + ["default"]:
+        report.count("hectares", outcome)
+    report.count("region", "address", 5)
+    extractors = report.as_json()["extractors"]
+    assert extractors["hectares"] == {"review": {"count": 3, "rate": 0.75}, "default": {"count": 1, "rate": 0.25}}
+    assert extractors["region"] == {"address": {"count": 5, "rate": 1.0}}
+    # Most common outcome first
+    assert list(extractors["hectares"]) == ["review", "default"]
+
+
+def test_timer_laps():
+    report = run_report.RunReport("test")
+    timer = report.timer()
+    for _ in range(3):
+        timer.lap("parse")
+        timer.lap("write")
+    timer.reset()
+    timer.lap("parse")
+    assert [report.stages[stage][2] for stage in ("parse", "write")] == [4, 3]
+    assert all(wall >= 0 and cpu >= 0 for wall, cpu, _ in report.stages.values())
+
+
+def test_merge_adds_worker_reports():
+    parent = run_report.RunReport("parent")
+    parent.items["in"] = 10
+    parent.count("classifier", "title")
+    parent.stages["parse"] = [1.0, 0.5, 10]
+    for _ in range(2):
+        worker = run_report.RunReport("worker")
+        worker.items["out"] = 4
+        worker.count("classifier", "title", 2)
+        worker.count("classifier", "category")
+        worker.stages["classify"] = [0.25, 0.25, 5]
+        # Worker reports travel as plain dicts
+        parent.merge(json.loads(json.dumps(worker.to_dict())))
+
+    assert parent.items == {"in": 10, "out": 8}
+    assert parent.extractors["classifier"] == {"title": 5, "category": 2}
+    assert parent.stages == {"parse": [1.0, 0.5, 10], "classify": [0.5, 0.5, 10]}
+
+
+def test_save(tmp_path):
+    report = run_report.RunReport("sheep_farms BE")
+    report.items["in"] = 2
+    report.count("breed", "default", 2)
+    report.stages["parse"] = [0.0123, 0.01, 2]
+    report.summary = {"count": 2}
+    output_file = str(tmp_path / "farms.json")
+    path = report.save(output_file)
+    assert path == run_report.report_path(output_file)
+
+    with open(path, 'r', encoding='utf-8') as f:
+        saved = json.load(f)
+    assert saved["name"] == "sheep_farms BE"
+    assert saved["items"] == {"in": 2}
+    assert saved["stages"] == {"parse": {"wall_seconds": 0.012, "cpu_seconds": 0.01, "laps": 2}}
+    assert saved["extractors"] == {"breed": {"default": {"count": 2, "rate": 1.0}}}
+    assert saved["summary"] == {"count": 2}
+    assert saved["elapsed_seconds"] >= 0
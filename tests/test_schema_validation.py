@@ -0,0 +1,84 @@
+"""Compiled schema validators: the records they reject and why, and the quarantine of an ingestion run."""
+
+import json
+
+import pytest
+
+import ingest_engine
+import schema_validation
+
+GOOD_PARK = {"id": "a1", "name": "Zonnepark", "country": "Netherlands", "location": "Weg 1", "region": "",
+             "total_hectares": 12.5, "coordinates": {"latitude": 52.0, "longitude": 5.0}, "place_id": None}
+
+
+def test_valid_record_has_no_errors():
+    assert schema_validation.SOLAR_PARKS.errors(GOOD_PARK) == []
+    assert schema_validation.SHEEP_FARMS.errors(dict(GOOD_PARK, total_hectares=None, flock_size=40)) == []
+
+
+@pytest.mark.parametrize("change, reason", [
+    ({"name": "  "}, "name is empty"),
+    ({"name": None}, "name is missing"),
+    ({"country": 3}, "country is int, expected str"),
+    ({"total_hectares": -1}, "total_hectares is -1, below 0"),
+    ({"total_hectares": True}, "total_hectares is bool, expected number"),
+    ({"coordinates": {"latitude": 95.0, "longitude": 5.0}}, "coordinates.latitude is 95.0, outside -90 to 90"),
+    ({"coordinates": {"latitude": 52.0}}, "coordinates.longitude is missing"),
+])
+def test_rejects_bad_records(change, reason):
+    assert schema_validation.SOLAR_PARKS.errors(dict(GOOD_PARK, **change)) == [reason]
+
+
+def test_parent_of_the_wrong_type():
+    assert schema_validation.SOLAR_PARKS.errors(dict(GOOD_PARK, coordinates=[])) == [
+        "coordinates is list, expected object",
+        "coordinates.latitude is missing",
+        "coordinates.longitude is missing",
+    ]
+
+
+def test_list_elements_and_nested_objects():
+    item = {"title": "Schapenhouderij", "categories": ["Farm", 7],
+            "reviews": [{"text": "Mooi"}, {"text": None}, "geen object"], "location": {"lat": 52.0, "lng": 200}}
+    assert schema_validation.RAW_ITEMS.errors(item) == [
+        "categories[1] is int, expected str",
+        "location.lng is 200, outside -180 to 180",
+        "reviews[2] is str, expected object",
+    ]
+    assert schema_validation.RAW_ITEMS.errors("not an item") == ["record is str, expected object"]
+
+
+def test_flock_size_must_be_a_positive_int():
+    farm = dict(GOOD_PARK, flock_size=0)
+    assert schema_validation.SHEEP_FARMS.errors(farm) == ["flock_size is 0, below 1"]
+    assert schema_validation.SHEEP_FARMS.errors(dict(farm, flock_size=12.0)) == ["flock_size is float, expected int"]
+
+
+def test_validate_batch():
+    records = [GOOD_PARK, dict(GOOD_PARK, name=""), GOOD_PARK, dict(GOOD_PARK, total_hectares="big")]
+    assert schema_validation.SOLAR_PARKS.validate_batch(records) == [
+        (1, ["name is empty"]), (3, ["total_hectares is str, expected number"])]
+
+
+def test_ingestion_quarantines_bad_items(tmp_path):
+    source = str(tmp_path / "items.json")
+    output = str(tmp_path / "parks.json")
+    with open(source, 'w', encoding='utf-8') as f:
+        json.dump([
+            {"title": "Zonnepark Noord", "placeId": "p1", "location": {"lat": 52.0, "lng": 5.0}},
+            {"title": "Zonnepark Zuid", "placeId": "p2", "location": {"lat": "52", "lng": 5.0}},
+            {"title": "Zonnepark Oost", "placeId": "p3", "reviews": "geen lijst"},
+        ], f)
+    summary = ingest_engine.process_countries([("NL", source, output)])[output]
+    assert (summary["count"], summary["quarantined"]) == (1, 2)
+
+    with open(schema_validation.quarantine_path(output), encoding='utf-8') as f:
+        rows = [json.loads(line) for line in f]
+    assert [(row["index"], row["reasons"]) for row in rows] == [
+        (1, ["location.lat is str, expected number"]), (2, ["reviews is str, expected list"])]
+
+    # A clean rerun removes the stale quarantine file
+    with open(source, 'w', encoding='utf-8') as f:
+        json.dump([{"title": "Zonnepark Noord", "placeId": "p1"}], f)
+    assert ingest_engine.process_countries([("NL", source, output)])[output]["quarantined"] == 0
+    assert not (tmp_path / "parks.quarantine.jsonl").exists()
@@ -0,0 +1,83 @@
+"""Round trip of the columnar snapshot and its staleness against the combined files."""
+
+import json
+import math
+import os
+
+import pytest
+
+import snapshot
+
+SOLAR_PARKS = [
+    {"id": "sp-1", "name": "Zonnepark Één", "location": "Dijkweg 1, Emmen", "country": "Netherlands",
+     "region": "Drenthe", "total_hectares": 12.5, "coordinates": {"latitude": 52.78, "longitude": 6.9},
+     "place_id": "p1"},
+    {"id": "sp-2", "name": "Solarpark Süd", "location": "", "country": "Luxembourg", "region": "",
+     "total_hectares": None, "coordinates": {"latitude": None, "longitude": None}, "place_id": None},
+]
+SHEEP_FARMS = [
+    {"id": "sf-1", "name": "Schapenhouderij De Wei", "location": "Weg 2", "country": "Belgium",
+     "region": "Flanders", "flock_size": 120, "coordinates": {"latitude": 51.0, "longitude": 3.7},
+     "place_id": "p2"},
+]
+
+
+def _write(path, records):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(records, f, ensure_ascii=False)
+    return str(path)
+
+
+@pytest.fixture
+def sources(tmp_path):
+    return (_write(tmp_path / "solar.json", SOLAR_PARKS), _write(tmp_path / "sheep.json", SHEEP_FARMS),
+            str(tmp_path / "snapshot.bin"))
+
+
+def test_round_trip(sources):
+    solar_file, sheep_file, snapshot_file = sources
+    assert snapshot.write_snapshot(solar_file, sheep_file, snapshot_file) == {"solar_parks": 2, "sheep_farms": 1}
+
+    loaded = snapshot.load_snapshot(snapshot_file)
+    parks = loaded["solar_parks"]
+    assert parks.strings("name") == ["Zonnepark Één", "Solarpark Süd"]
+    assert parks.string("region", 0) == "Drenthe"
+    assert parks.strings("place_id") == ["p1", ""]
+    assert parks["total_hectares"][0] == 12.5 and math.isnan(parks["total_hectares"][1])
+    assert math.isnan(parks["latitude"][1])
+    # Countries outside the first five get the next codes
+    assert [loaded.countries[code] for code in parks["country"].tolist()] == ["Netherlands", "Luxembourg"]
+
+    farms = loaded["sheep_farms"]
+    assert farms["flock_size"].tolist() == [120]
+    assert farms.strings("id") == ["sf-1"]
+    assert loaded.countries[farms["country"][0]] == "Belgium"
+
+
+def test_rewrite_within_the_same_second_is_stale(sources):
+    solar_file, sheep_file, snapshot_file = sources
+    snapshot.write_snapshot(solar_file, sheep_file, snapshot_file)
+    loaded = snapshot.load_snapshot(snapshot_file)
+    assert loaded.is_current(solar_file, sheep_file)
+
+    # Same size, mtime moved by less than a second
+    mtime_ns = os.stat(solar_file).st_mtime_ns
+    second = mtime_ns - mtime_ns % 1_000_000_000
+    os.utime(solar_file, ns=(second, second + (mtime_ns - second + 1) % 1_000_000_000))
+    assert not loaded.is_current(solar_file, sheep_file)
+
+
+def test_load_or_build_rebuilds_stale_snapshots(sources):
+    solar_file, sheep_file, snapshot_file = sources
+    snapshot.load_or_build(solar_file, sheep_file, snapshot_file)
+    _write(solar_file, SOLAR_PARKS[:1])
+    rebuilt = snapshot.load_or_build(solar_file, sheep_file, snapshot_file)
+    assert len(rebuilt["solar_parks"]) == 1
+
+
+def test_string_column_too_large_for_uint32_offsets(sources, monkeypatch):
+    solar_file, sheep_file, snapshot_file = sources
+    monkeypatch.setattr(snapshot, "MAX_STRING_BYTES", 20)
+    with pytest.raises(ValueError, match="name"):
+        snapshot.write_snapshot(solar_file, sheep_file, snapshot_file)
+    assert not os.path.exists(snapshot_file)
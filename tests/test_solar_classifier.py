@@ -0,0 +1,33 @@
+"""Solar park classification rules and the per-plugin classifier cache."""
+
+import process_solar_parks
+import solar_classifier
+
+
+def test_rules():
+    classifier = solar_classifier.SolarParkClassifier(["solar", "zon"], ["park", "veld"])
+    assert classifier.classify("Zonnepark De Kwekerij", []).rule == "title"
+    assert classifier.classify("Energie BV", ["Solar energy company"]).rule == "category"
+    assert classifier.classify("Zonnestudio", ["Bakery"]) == solar_classifier.Classification(
+        False, "title has solar 'zon' but no park keyword", "no_park_keyword")
+    assert classifier.classify("Bakkerij Jansen", None).rule == "no_solar_keyword"
+
+
+def test_classify_batch_matches_classify():
+    classifier = solar_classifier.classifier_for(process_solar_parks.PLUGIN)
+    titles = ["Zonnepark Noord", "Zonnestudio", "Café"]
+    categories = [[], ["Solar energy"], None]
+    assert classifier.classify_batch(titles, categories) == [
+        classifier.classify(title, cats) for title, cats in zip(titles, categories)]
+
+
+def test_cache_follows_the_keywords():
+    plugin = process_solar_parks.PLUGIN
+    assert solar_classifier.classifier_for(plugin) is solar_classifier.classifier_for(dict(plugin))
+    assert solar_classifier.classifier_for(plugin).classify("Zonnepark Noord", []).accepted
+
+    # Same country code, other keywords
+    edited = dict(plugin, park_keywords=["akker"])
+    assert solar_classifier.classifier_for(edited) is not solar_classifier.classifier_for(plugin)
+    assert not solar_classifier.classifier_for(edited).classify("Zonnepark Noord", []).accepted
+    assert solar_classifier.classifier_for(edited).classify("Zonneakker Noord", []).accepted
@@ -0,0 +1,62 @@
+"""Grid index candidates against a full scan, near the poles and across the antimeridian too."""
+
+import random
+
+import pytest
+
+import integrate_directory
+import spatial_index
+
+
+def _within(points, latitude, longitude, radius):
+    return {position for position, point in enumerate(points)
+            if point is not None and integrate_directory.calculate_distance(latitude, longitude, *point) <= radius}
+
+
+@pytest.mark.parametrize("south, north, west, east", [
+    (50.0, 54.0, 3.0, 8.0),      # the Benelux
+    (85.0, 90.0, -180.0, 180.0),  # around the North Pole
+    (-20.0, 20.0, 175.0, 185.0),  # across the antimeridian
+])
+@pytest.mark.parametrize("cell_km", [5, 50, 500])
+def test_candidates_cover_every_point_within_the_radius(south, north, west, east, cell_km):
+    rng = random.Random(f"{south}-{cell_km}")
+
+    def point():
+        longitude = rng.uniform(west, east)
+        return rng.uniform(south, north), longitude - 360 if longitude > 180 else longitude
+
+    points = [point() for _ in range(400)] + [None]
+    index = spatial_index.GridIndex(points, cell_km)
+    for radius in (1, 20, 150):
+        for _ in range(30):
+            latitude, longitude = point()
+            candidates = index.candidates(latitude, longitude, radius)
+            assert len(candidates) == len(set(candidates))
+            assert _within(points, latitude, longitude, radius) <= set(candidates)
+
+
+def test_point_exactly_at_the_radius():
+    points = [(52.0, 5.0), (52.0, 5.5)]
+    radius = integrate_directory.calculate_distance(*points[0], *points[1])
+    index = spatial_index.GridIndex(points, 1)
+    assert set(index.candidates(*points[0], radius)) == {0, 1}
+
+
+def test_cells_are_visited_once_around_the_globe():
+    # A cell wider than half the globe must not be listed twice
+    index = spatial_index.GridIndex([(0.0, 179.9), (0.0, -179.9)], 15000)
+    assert sorted(index.candidates(0.0, 0.0, 19000)) == [0, 1]
+
+
+def test_add_and_remove():
+    index = spatial_index.GridIndex([], 10)
+    index.add("a", (52.1, 5.1))
+    index.add("b", (52.1001, 5.1001))
+    index.add("c", None)
+    assert sorted(index.candidates(52.1, 5.1, 1)) == ["a", "b"]
+    index.remove("a", (52.1, 5.1))
+    index.remove("c", None)
+    assert index.candidates(52.1, 5.1, 1) == ["b"]
+    index.remove("b", (52.1001, 5.1001))
+    assert index.cells == {}
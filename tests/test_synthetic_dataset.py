@@ -0,0 +1,70 @@
+"""Synthetic Apify datasets and the ingest benchmark that runs the pipelines on them."""
+
+import pytest
+
+import benchmark_ingest
+import ingest_engine
+import postal_codes
+import schema_validation
+import synthetic_dataset
+
+
+@pytest.mark.parametrize("kind", synthetic_dataset.KINDS)
+@pytest.mark.parametrize("country_code", list(synthetic_dataset.COUNTRY_PROFILES))
+def test_items_look_like_the_apify_export(kind, country_code):
+    items = list(synthetic_dataset.generate_items(kind, country_code, 300))
+    assert len(items) == 300
+    assert all(not schema_validation.RAW_ITEMS.errors(item) for item in items)
+    # The odd item is found twice
+    assert len({item["placeId"] for item in items}) < 300
+    # Every postcode the resolver knows maps to a region
+    if country_code in ("NL", "UK", "BE"):
+        assert all(postal_codes.region_from_address(country_code, item["address"]) for item in items)
+
+
+def test_deterministic_per_seed():
+    first = list(synthetic_dataset.generate_items("solar_parks", "FR", 100, seed=1))
+    assert list(synthetic_dataset.generate_items("solar_parks", "FR", 100, seed=1)) == first
+    assert list(synthetic_dataset.generate_items("solar_parks", "FR", 100, seed=2)) != first
+    assert list(synthetic_dataset.generate_items("sheep_farms", "FR", 100, seed=1)) != first
+
+
+def test_scrape_noise_is_dropped(tmp_path):
+    source = str(tmp_path / "raw.json")
+    assert synthetic_dataset.write_dataset(source, "solar_parks", "DE", 400, seed=3) == 400
+    assert list(ingest_engine.iter_records(source)) == list(
+        synthetic_dataset.generate_items("solar_parks", "DE", 400, seed=3))
+
+    output = str(tmp_path / "parks.json")
+    count = ingest_engine.process_countries([("DE", source, output)])[output]["count"]
+    # About KEEP_RATE of the items are parks
+    assert 0.55 * 400 < count < 0.85 * 400
+
+
+def test_dataset_path():
+    assert synthetic_dataset.dataset_path("/data", "sheep_farms", "UK", "10k") == (
+        "/data/synthetic_sheep_farms_uk_10k.json")
+
+
+def test_benchmark_run(tmp_path):
+    source = synthetic_dataset.dataset_path(str(tmp_path), "sheep_farms", "BE", "tiny")
+    synthetic_dataset.write_dataset(source, "sheep_farms", "BE", 200)
+    result = benchmark_ingest.measure("sheep_farms", "BE", source, 1)
+    assert result["items"] == 200
+    assert 0 < result["records"] <= 200
+    assert result["items_per_second"] > 0 and result["peak_rss_mb"] > 0
+    assert benchmark_ingest.pipelines(["BE"]) == [("process_solar_parks_belgium", "solar_parks", "BE"),
+                                                  ("process_sheep_farms", "sheep_farms", "BE")]
+
+
+def test_benchmark_regressions():
+    baseline = {"a": {"items_per_second": 1000, "peak_rss_mb": 100},
+                "b": {"items_per_second": 1000, "peak_rss_mb": 100}}
+    results = {"a": {"items_per_second": 950, "peak_rss_mb": 105},
+               "b": {"items_per_second": 800, "peak_rss_mb": 150},
+               "new": {"items_per_second": 1, "peak_rss_mb": 1000}}
+    assert benchmark_ingest.compare(results, baseline) == [
+        "b: 800 items/s, was 1,000", "b: peak RSS 150 MB, was 100 MB"]
+    assert benchmark_ingest.compare(results, baseline, tolerance=0.01) == [
+        "a: 950 items/s, was 1,000", "a: peak RSS 105 MB, was 100 MB",
+        "b: 800 items/s, was 1,000", "b: peak RSS 150 MB, was 100 MB"]
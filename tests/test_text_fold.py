@@ -0,0 +1,37 @@
+"""Unicode folding shared by the text extractors."""
+
+import pytest
+
+import text_fold
+
+
+@pytest.mark.parametrize("text, folded", [
+    ("  Rhône\tALPES ", "rhone alpes"),
+    ("Île-de-France", "ile-de-france"),
+    ("Dessau-Roßlau", "dessau-rosslau"),
+    ("Fryslân", "fryslan"),
+    ("Liège", "liege"),
+    ("ＭＷｐ", "mwp"),
+    ("plain ascii", "plain ascii"),
+    (None, ""),
+    ("", ""),
+])
+def test_fold(text, folded):
+    assert text_fold.fold(text) == folded
+
+
+def test_long_texts_fold_the_same():
+    text = "Schäferei an der Mühle. " * 40
+    assert len(text) > text_fold.SHORT_TEXT_LENGTH
+    assert text_fold.fold(text) == " ".join(["schaferei an der muhle."] * 40)
+
+
+def test_fold_keywords_drops_folded_duplicates_in_order():
+    assert text_fold.fold_keywords(["Rhône", "rhone", "Isère", "isere", "ain"]) == ["rhone", "isere", "ain"]
+
+
+def test_repeated_texts_hit_the_cache():
+    before = text_fold.cache_info()[0].hits
+    for _ in range(3):
+        text_fold.fold("Hauptstraße 5, München")
+    assert text_fold.cache_info()[0].hits >= before + 2
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Unicode folding for the Ombaa text extractors.
+fold() casefolds, strips accents (NFKD, then drops the combining marks) and
+collapses whitespace, so "  Rhône\tALPES " and "rhone alpes" compare equal and
+keyword tables only need the folded spelling of each keyword. Results are
+memoised: addresses, cities and categories repeat heavily and live in a large
+LRU cache, while long texts (review digests) go through a small one that only
+lets the extractors of one item share the work.
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+
+# Texts up to this many characters use the large cache
+SHORT_TEXT_LENGTH = 256
+
+# Entries per cache; short texts are at most SHORT_TEXT_LENGTH characters each
+SHORT_CACHE_SIZE = 65536
+LONG_CACHE_SIZE = 16
+
+# Combining marks left behind by NFKD (accents, umlauts, cedillas, ...)
+_COMBINING = re.compile("[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]+")
+
+
+def _fold(text):
+    if text.isascii():
+        return " ".join(text.lower().split())
+    text = _COMBINING.sub("", unicodedata.normalize('NFKD', text.casefold()))
+    return " ".join(text.split())
+
+
+_fold_short = lru_cache(maxsize=SHORT_CACHE_SIZE)(_fold)
+_fold_long = lru_cache(maxsize=LONG_CACHE_SIZE)(_fold)
+
+
+def fold(text):
+    """Casefolded, accent-free text with single spaces; "" for None."""
+    if not text:
+        return ""
+    if len(text) <= SHORT_TEXT_LENGTH:
+        return _fold_short(text)
+    return _fold_long(text)
+
+
+def fold_keywords(keywords):
+    """Folded keywords without the duplicates folding creates, in their original order."""
+    return list(dict.fromkeys(fold(keyword) for keyword in keywords))
+
+
+def cache_info():
+    """(short, long) cache statistics, for benchmarks and run reports."""
+    return _fold_short.cache_info(), _fold_long.cache_info()